@@ -20,6 +20,8 @@ from dataclasses import dataclass
 from pypylon import pylon
 # import type Any
 from typing import Any
+# spans of the pick-and-place timeline
+from ctu_crs.tracing import traced
 
 
 # ==========================================================================
@@ -282,6 +284,7 @@ class BaslerCamera:
             res.Release()
         return image
 
+    @traced("grab_image", "camera")
     def grab_image(self, time_out: int = 0) -> NDArray[Shape["*, *, 3"], Any]:
         """
         The method is enccapsulation of the method get_image. This method
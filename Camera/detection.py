@@ -1,6 +1,7 @@
 import os
 import numpy as np
 import cv2
+from ctu_crs.tracing import traced
 
 # https://medium.com/@ed.twomey1/using-charuco-boards-in-opencv-237d8bc9e40d
 
@@ -16,6 +17,7 @@ PATH_TO_YOUR_IMAGES = '/home/lindodan/PycharmProjects/Semestralka/ROB_SEM/Camera
 # ------------------------------
 
 
+@traced("detect_pose", "detection")
 def detect_pose(image, camera_matrix, dist_coeffs):
     # Undistort the image
     undistorted_image = cv2.undistort(image, camera_matrix, dist_coeffs)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Startup time of offline use: import of the package, construction of the robots and
+pickling of their kinematic models. Every import is measured in a fresh interpreter.
+Run as 'python benchmarks/startup.py [repetitions]'."""
+
+import json
+import subprocess
+import sys
+
+MEASURE = """
+import json, pickle, sys, time
+t0 = time.perf_counter()
+import ctu_crs
+t1 = time.perf_counter()
+ctu_crs.CRS93(tty_dev=None)
+t2 = time.perf_counter()
+for _ in range(10):
+    ctu_crs.CRS97(tty_dev=None)
+t3 = time.perf_counter()
+data = pickle.dumps(ctu_crs.CRS93(tty_dev=None).kinematic_model())
+t4 = time.perf_counter()
+pickle.loads(data)
+t5 = time.perf_counter()
+print(json.dumps(dict(
+    import_ms=(t1 - t0) * 1e3,
+    first_construction_ms=(t2 - t1) * 1e3,
+    construction_ms=(t3 - t2) * 1e2,
+    unpickle_ms=(t5 - t4) * 1e3,
+    pickle_bytes=len(data),
+    serial_imported="ctu_mars_control_unit" in sys.modules,
+)))
+"""
+
+
+def main(repetitions: int = 5):
+    runs = []
+    for _ in range(repetitions):
+        out = subprocess.run(
+            [sys.executable, "-c", MEASURE], capture_output=True, check=True, text=True
+        )
+        runs.append(json.loads(out.stdout))
+    for key in runs[0]:
+        values = [r[key] for r in runs]
+        if isinstance(values[0], float):
+            print(f"{key:>24}: min {min(values):8.2f}  max {max(values):8.2f}")
+        else:
+            print(f"{key:>24}: {values[0]}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
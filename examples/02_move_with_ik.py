@@ -17,10 +17,8 @@ print(current_pose)
 print(current_pose[:3, 3])
 current_pose[:3, 3] -= np.array([0.0, 0.2, 0.4])
 print(current_pose)
-ik_sols = robot.ik(current_pose)
-print(ik_sols)
-assert len(ik_sols) > 0
-closest_solution = min(ik_sols, key=lambda q: np.linalg.norm(q - q0))
+closest_solution = robot.ik_closest(current_pose, q0)
+assert closest_solution is not None
 print(closest_solution)
 robot.move_to_q(closest_solution)
 robot.wait_for_motion_stop()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Asyncio front-end of the robot.
+
+All serial I/O of the robot and its gripper is executed by a single dedicated worker
+thread, so the commands never interleave on the serial line while the event loop stays
+free. Waiting for the motion sleeps in the event loop until shortly before its
+predicted end (see ctu_crs.completion) and only then polls the control unit from the
+worker, so other coroutines (e.g. camera capture started by asyncio.to_thread) run
+concurrently with the motion."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class AsyncCRSRobot:
+    def __init__(self, robot):
+        """
+        :param robot: CRSRobot (CRS93/CRS97) whose calls are wrapped.
+        """
+        super().__init__()
+        self.robot = robot
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crs")
+        self.gripper = AsyncGripper(self)
+
+    async def __aenter__(self) -> AsyncCRSRobot:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def run(self, fn, *args, **kwargs):
+        """Execute @param fn in the serial worker and return its result."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def initialize(self, home: bool = True):
+        """See CRSRobot.initialize."""
+        await self.run(self.robot.initialize, home=False)
+        if home:
+            await self.run(self.robot.hard_home)
+            await self.soft_home()
+            # the record saved by initialize does not know about the homing
+            await self.run(self.robot.save_session)
+
+    async def move_to_q(self, q: ArrayLike):
+        """Send coordinated movement to @param q; returns once the command is sent,
+        await motion_done to wait for the motion to finish."""
+        await self.run(self.robot.move_to_q, q)
+
+    async def motion_done(self, timeout: float | None = None) -> bool:
+        """Wait until the robot stops moving; see CRSRobot.wait_for_motion_stop.
+        Returns False on @param timeout [s]."""
+        completion = self.robot.completion
+        delay = completion.predicted_end - completion.margin - time.monotonic()
+        if timeout is not None:
+            delay = min(delay, timeout)
+        if delay > 0:
+            await asyncio.sleep(delay)
+            if timeout is not None:
+                timeout -= delay
+        return await self.run(self.robot.wait_for_motion_stop, timeout)
+
+    async def soft_home(self):
+        """Move to the home configuration and wait for the motion to finish."""
+        await self.move_to_q(self.robot.q_home)
+        await self.motion_done()
+
+    async def get_q(self) -> np.ndarray:
+        """Get current joint configuration."""
+        return await self.run(self.robot.get_q)
+
+    async def stream_q(self, rate: float = 10.0) -> AsyncIterator[np.ndarray]:
+        """Yield current joint configuration at the fixed @param rate [Hz]. Slow
+        consumers skip samples instead of accumulating delay."""
+        loop = asyncio.get_running_loop()
+        period = 1.0 / rate
+        t_next = loop.time()
+        while True:
+            yield await self.get_q()
+            t_next += period
+            now = loop.time()
+            if t_next < now:
+                t_next = now
+            await asyncio.sleep(t_next - now)
+
+    async def close(self):
+        """Close connection to the robot and stop the worker."""
+        if self.robot._mars is not None:
+            await self.run(self.robot.close)
+        self._executor.shutdown(wait=True)
+
+
+class AsyncGripper:
+    def __init__(self, robot: AsyncCRSRobot):
+        super().__init__()
+        self._robot = robot
+        self.gripper = robot.robot.gripper
+
+    async def control_position(self, position: float):
+        """Move to absolute @param position, see Gripper.control_position. When the
+        gripper is closing, the call returns after the motion stops and the gripper
+        is released."""
+        await self._robot.run(self.gripper.command_position, position)
+        if self.gripper.is_closing(position):
+            await self.motion_done()
+            await self._robot.run(self.gripper.release)
+
+    async def control_position_relative(self, fraction: float):
+        """Move to relative position 0 = bounds[0], 1 = bounds[1]."""
+        await self.control_position(self.gripper.relative_position(fraction))
+
+    async def open(self):
+        await self.control_position(self.gripper.bounds[0])
+
+    async def close(self):
+        await self.control_position(self.gripper.bounds[1])
+
+    async def get_position(self) -> float:
+        return await self._robot.run(self.gripper.get_position)
+
+    async def motion_done(self):
+        """Wait until the position of the gripper changes by less than
+        gripper_poll_diff between polls separated by gripper_poll_time."""
+        last = float("inf")
+        while True:
+            p = await self.get_position()
+            if abs(last - p) < self.gripper.gripper_poll_diff:
+                return
+            last = p
+            await asyncio.sleep(self.gripper.gripper_poll_time)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Files with precomputed data (e.g. the reachability map) cached between processes.
+
+The files are stored in the user cache directory instead of the package directory,
+which may be read-only or shared by several users. Files are replaced atomically, so
+a process never reads a partially written file and processes that have the previous
+file memory-mapped keep reading its content."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+
+def cache_path(name: str) -> Path:
+    """Return path of the cached file @param name in $XDG_CACHE_HOME/ctu_crs
+    (~/.cache/ctu_crs by default). The directory is created by write_atomic."""
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "ctu_crs" / name
+
+
+def write_atomic(path: str | Path, write: Callable[[BinaryIO], None]):
+    """Write file @param path by calling @param write with a temporary file in the same
+    directory, which then atomically replaces @param path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
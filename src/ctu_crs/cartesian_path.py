@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Straight-line Cartesian paths streamed lazily as joint waypoints."""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.timing import (
+    speed_to_rad_per_s,
+    trapezoidal_duration,
+    trapezoidal_progress,
+)
+
+
+def rotation_to_quaternion(rot: ArrayLike) -> np.ndarray:
+    """Convert 3x3 rotation matrix to unit quaternion [w, x, y, z]."""
+    m = np.asarray(rot, dtype=float)
+    tr = np.trace(m)
+    if tr > 0:
+        s = 2 * np.sqrt(tr + 1)
+        q = [s / 4, (m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s]
+        q.append((m[1, 0] - m[0, 1]) / s)
+    else:
+        i = int(np.argmax(np.diag(m)))
+        j, k = (i + 1) % 3, (i + 2) % 3
+        s = 2 * np.sqrt(1 + m[i, i] - m[j, j] - m[k, k])
+        q = np.empty(4)
+        q[0] = (m[k, j] - m[j, k]) / s
+        q[1 + i] = s / 4
+        q[1 + j] = (m[j, i] + m[i, j]) / s
+        q[1 + k] = (m[k, i] + m[i, k]) / s
+    q = np.asarray(q)
+    return q / np.linalg.norm(q)
+
+
+def quaternion_to_rotation(q: ArrayLike) -> np.ndarray:
+    """Convert unit quaternion [w, x, y, z] to 3x3 rotation matrix."""
+    w, x, y, z = q
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def slerp(q0: ArrayLike, q1: ArrayLike, s: float) -> np.ndarray:
+    """Spherical linear interpolation between quaternions @param q0 and @param q1 for
+    @param s in [0, 1] along the shorter arc."""
+    q0, q1 = np.asarray(q0, dtype=float), np.asarray(q1, dtype=float)
+    dot = np.dot(q0, q1)
+    if dot < 0:
+        q1, dot = -q1, -dot
+    if dot > 1 - 1e-9:
+        q = q0 + s * (q1 - q0)
+        return q / np.linalg.norm(q)
+    angle = np.arccos(dot)
+    return (np.sin((1 - s) * angle) * q0 + np.sin(s * angle) * q1) / np.sin(angle)
+
+
+def linear_path(
+    robot,
+    start_pose: np.ndarray,
+    end_pose: np.ndarray,
+    speed: float,
+    acceleration: float,
+    dt: float = 0.05,
+    q_start: ArrayLike | None = None,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Lazily generate joint waypoints moving the end-effector along a straight line
+    from @param start_pose to @param end_pose, with orientation interpolated by SLERP.
+
+    Progress along the path follows trapezoidal profile with @param speed [m/s] and
+    @param acceleration [m/s^2]; for pure rotations the values are interpreted in
+    [rad/s] and [rad/s^2] of the rotation angle. Waypoints are sampled every
+    @param dt seconds and the last one is at the end pose.
+
+    IK branch of every waypoint is chosen to be the closest to the previous waypoint,
+    starting from @param q_start (or the branch closest to the home configuration).
+
+    Yields tuples (t, q) of time [s] from the start and joint configuration [rad].
+    Raises ValueError when the next waypoint cannot be reached within joint limits or
+    when it would require a joint speed above the robot maximum, which happens when
+    the path crosses a singularity."""
+    start_pose = np.asarray(start_pose, dtype=float)
+    end_pose = np.asarray(end_pose, dtype=float)
+    p0, p1 = start_pose[:3, 3], end_pose[:3, 3]
+    quat0 = rotation_to_quaternion(start_pose[:3, :3])
+    quat1 = rotation_to_quaternion(end_pose[:3, :3])
+    distance = np.linalg.norm(p1 - p0)
+    angle = 2 * np.arccos(np.clip(abs(np.dot(quat0, quat1)), -1, 1))
+    length = distance if distance > 1e-9 else angle
+    duration = float(trapezoidal_duration(length, speed, acceleration))
+    n = max(int(np.ceil(duration / dt)), 1)
+
+    max_joint_speed = speed_to_rad_per_s(robot, robot._max_speed_irc256_per_ms)
+
+    q_prev = None
+    if q_start is not None:
+        q_prev = np.asarray(q_start, dtype=float)
+        assert robot.in_limits(q_prev), "Start configuration violates joint limits."
+    t_prev = 0.0
+    for i in range(n + 1):
+        t = min(i * dt, duration)
+        s = 1.0
+        if length > 0:
+            s = float(trapezoidal_progress(t, length, speed, acceleration)) / length
+        pose = np.eye(4)
+        pose[:3, :3] = quaternion_to_rotation(slerp(quat0, quat1, s))
+        pose[:3, 3] = p0 + s * (p1 - p0)
+
+        q = robot.ik_closest(pose, q_prev if q_prev is not None else robot.q_home)
+        if q is None:
+            raise ValueError(
+                f"Path leaves the workspace or joint limits at t={t:.3f}s, "
+                f"position {pose[:3, 3]}."
+            )
+        if q_prev is not None and t > t_prev:
+            joint_speed = np.abs(q - q_prev) / (t - t_prev)
+            if np.any(joint_speed > max_joint_speed):
+                raise ValueError(
+                    f"Path requires joint speed {joint_speed} rad/s at t={t:.3f}s, "
+                    f"above the maximum {max_joint_speed}; it likely crosses a "
+                    "singularity or an IK branch switch."
+                )
+        yield t, q
+        q_prev, t_prev = q, t
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Capsule collision model of the CRS robot checked in batches of configurations.
+
+Links are modelled by capsules (segments with a radius) computed from the DH frames:
+base column, upper arm, forearm, wrist, gripper body and fingers. The environment
+consists of the table plane and oriented boxes (e.g. plates); the boxes are checked
+against spheres sampled along the capsules such that the spheres cover the capsules,
+i.e. the check is conservative."""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+LINK_NAMES = ("base", "upper_arm", "forearm", "wrist", "gripper", "fingers")
+
+DEFAULT_RADII = dict(
+    base=0.08, upper_arm=0.06, forearm=0.05, wrist=0.045, gripper=0.04, fingers=0.015
+)
+
+# pairs of links (indices to LINK_NAMES) checked for self-collision; neighbouring
+# links are always in contact at their joints and are skipped
+DEFAULT_SELF_COLLISION_PAIRS = ((0, 2), (0, 3), (0, 4), (0, 5), (1, 3), (1, 4), (1, 5))
+
+# outer dimensions [m] of the plates from Drawings/
+PLATE_SIZE = (0.24, 0.18, 0.01)
+
+
+def segment_distance(
+    p1: np.ndarray, q1: np.ndarray, p2: np.ndarray, q2: np.ndarray
+) -> np.ndarray:
+    """Distance between segments [p1, q1] and [p2, q2] given by arrays of shape
+    (..., 3); segments must have nonzero length. Broadcasts over leading axes."""
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.sum(d1 * d1, axis=-1)
+    e = np.sum(d2 * d2, axis=-1)
+    b = np.sum(d1 * d2, axis=-1)
+    c = np.sum(d1 * r, axis=-1)
+    f = np.sum(d2 * r, axis=-1)
+    denom = a * e - b * b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s = np.where(denom > 1e-12, np.clip((b * f - c * e) / denom, 0, 1), 0.0)
+    t = (b * s + f) / e
+    s = np.where(
+        t < 0, np.clip(-c / a, 0, 1), np.where(t > 1, np.clip((b - c) / a, 0, 1), s)
+    )
+    t = np.clip(t, 0, 1)
+    diff = p1 + d1 * s[..., np.newaxis] - p2 - d2 * t[..., np.newaxis]
+    return np.linalg.norm(diff, axis=-1)
+
+
+def interpolate_edges(
+    q_from: ArrayLike, q_to: ArrayLike, resolution: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sample M straight joint space edges between (M, 6) configurations @param q_from
+    and @param q_to such that no joint moves more than @param resolution [rad] between
+    consecutive samples. Returns (K, 6) samples including both end points and (K,)
+    index of the edge of each sample."""
+    q_from, q_to = np.atleast_2d(q_from), np.atleast_2d(q_to)
+    steps = np.ceil(np.max(np.abs(q_to - q_from), axis=-1) / resolution).astype(int)
+    steps = np.maximum(steps, 1)
+    edge = np.repeat(np.arange(len(steps)), steps + 1)
+    offsets = np.cumsum(steps + 1) - (steps + 1)
+    s = (np.arange(len(edge)) - offsets[edge]) / steps[edge]
+    samples = q_from[edge] + s[:, np.newaxis] * (q_to[edge] - q_from[edge])
+    return samples, edge
+
+
+class CollisionModel:
+    """Collision model of the robot links against the table, boxes and itself."""
+
+    def __init__(
+        self,
+        robot,
+        radii: dict[str, float] | None = None,
+        self_collision_pairs=DEFAULT_SELF_COLLISION_PAIRS,
+    ):
+        """
+        :param robot: CRSRobot providing kinematics and link dimensions.
+        :param radii: Radii [m] of the link capsules overriding DEFAULT_RADII.
+        :param self_collision_pairs: Pairs of link indices checked for self-collision.
+        """
+        super().__init__()
+        self._robot = robot
+        r = dict(DEFAULT_RADII)
+        r.update(radii or {})
+        self.radii = np.array([r[n] for n in LINK_NAMES])
+        self.self_collision_pairs = np.array(self_collision_pairs, dtype=int)
+        self.table_height: float | None = None
+        self._boxes_pose_inv = np.empty((0, 4, 4))
+        self._boxes_half_size = np.empty((0, 3))
+        self.box_names: list[str] = []
+
+        # spheres covering the capsules, the base column is not checked against the
+        # environment as it is fixed to the table
+        lengths = np.array(
+            [
+                robot.link_lengths[0],
+                robot.dh_a[1],
+                robot.link_lengths[2],
+                robot.link_lengths[3],
+                robot.gripper_length,
+                robot.finger_length,
+            ]
+        )
+        link, fraction, radius = [], [], []
+        for i in range(1, len(LINK_NAMES)):
+            n = max(int(np.ceil(lengths[i] / self.radii[i])), 1)
+            link.append(np.full(n + 1, i))
+            fraction.append(np.linspace(0, 1, n + 1))
+            radius.append(np.full(n + 1, self.radii[i] + lengths[i] / n / 2))
+        self._sphere_link = np.concatenate(link)
+        self._sphere_fraction = np.concatenate(fraction)[:, np.newaxis]
+        self._sphere_radius = np.concatenate(radius)
+
+    def add_table(self, height: float = 0.0):
+        """Register table as a half space below @param height [m] in the base frame."""
+        self.table_height = height
+
+    def add_box(
+        self, size: ArrayLike, pose: np.ndarray | None = None, name: str | None = None
+    ):
+        """Register box obstacle of full @param size [m] centered at SE3 @param pose
+        w.r.t. base of the robot (identity if not given)."""
+        pose = np.eye(4) if pose is None else np.asarray(pose, dtype=float)
+        inv = np.eye(4)
+        inv[:3, :3] = pose[:3, :3].T
+        inv[:3, 3] = -pose[:3, :3].T @ pose[:3, 3]
+        self._boxes_pose_inv = np.concatenate([self._boxes_pose_inv, inv[np.newaxis]])
+        half = np.asarray(size, dtype=float)[np.newaxis] / 2
+        self._boxes_half_size = np.concatenate([self._boxes_half_size, half])
+        self.box_names.append(name if name is not None else f"box{len(self.box_names)}")
+
+    def add_plate(self, pose: np.ndarray, size: ArrayLike = PLATE_SIZE, name=None):
+        """Register plate lying on the table with the center of its bottom face at SE3
+        @param pose w.r.t. base of the robot."""
+        center = np.asarray(pose, dtype=float).copy()
+        center[:3, 3] += center[:3, 2] * size[2] / 2
+        self.add_box(size, center, name=name)
+
+    def static_model(self) -> CollisionModel:
+        """Return copy of the model with the table but without the boxes, i.e. the
+        part of the environment that does not change between tasks."""
+        model = CollisionModel.__new__(CollisionModel)
+        model.__dict__.update(self.__dict__)
+        model._boxes_pose_inv = np.empty((0, 4, 4))
+        model._boxes_half_size = np.empty((0, 3))
+        model.box_names = []
+        return model
+
+    def clear(self):
+        """Remove all registered obstacles."""
+        self.table_height = None
+        self._boxes_pose_inv = np.empty((0, 4, 4))
+        self._boxes_half_size = np.empty((0, 3))
+        self.box_names = []
+
+    def fingerprint(self) -> bytes:
+        """Bytes identifying the link geometry and all registered obstacles."""
+        table = [np.nan if self.table_height is None else self.table_height]
+        return b"".join(
+            np.asarray(a, dtype=float).tobytes()
+            for a in (
+                self.radii,
+                self.self_collision_pairs,
+                table,
+                self._boxes_pose_inv,
+                self._boxes_half_size,
+            )
+        )
+
+    def link_segments(self, q: ArrayLike) -> np.ndarray:
+        """Compute end points of the link capsules for N configurations @param q of
+        shape (N, 6). Returns (N, 6, 2, 3) array, the links are ordered as LINK_NAMES.
+        """
+        r = self._robot
+        frames = r.fk_frames_batch(np.atleast_2d(q))
+        o = frames[:, :, :3, 3]
+        z_tool = frames[:, -1, :3, 2]
+        wrist = o[:, 5]
+        flange = wrist + r.link_lengths[3] * z_tool
+        fingers = flange + r.gripper_length * z_tool
+        starts = np.stack([o[:, 0], o[:, 1], o[:, 3], wrist, flange, fingers], axis=1)
+        ends = np.stack([o[:, 1], o[:, 2], o[:, 4], flange, fingers, o[:, 6]], axis=1)
+        return np.stack([starts, ends], axis=2)
+
+    def self_collision(self, segments: np.ndarray) -> np.ndarray:
+        """Return (N,) mask of self-colliding configurations given their link
+        @param segments computed by link_segments."""
+        a, b = self.self_collision_pairs.T
+        d = segment_distance(
+            segments[:, a, 0], segments[:, a, 1], segments[:, b, 0], segments[:, b, 1]
+        )
+        return np.any(d < self.radii[a] + self.radii[b], axis=-1)
+
+    def environment_collision(self, segments: np.ndarray) -> np.ndarray:
+        """Return (N,) mask of configurations colliding with the table or boxes given
+        their link @param segments computed by link_segments."""
+        collision = np.zeros(segments.shape[0], dtype=bool)
+        if self.table_height is not None:
+            z = np.min(segments[:, 1:, :, 2], axis=-1) - self.radii[1:]
+            collision |= np.any(z < self.table_height, axis=-1)
+        if len(self._boxes_half_size) > 0:
+            seg = segments[:, self._sphere_link]
+            points = seg[:, :, 0] + self._sphere_fraction * (
+                seg[:, :, 1] - seg[:, :, 0]
+            )
+            # transform points to the frames of all boxes by a single product
+            rot = self._boxes_pose_inv[:, :3, :3].transpose(2, 0, 1).reshape(3, -1)
+            local = (points @ rot).reshape(points.shape[:2] + (-1, 3))
+            local += self._boxes_pose_inv[:, :3, 3]
+            outside = np.maximum(np.abs(local) - self._boxes_half_size, 0)
+            d = np.linalg.norm(outside, axis=-1)
+            collision |= np.any(d < self._sphere_radius[:, np.newaxis], axis=(1, 2))
+        return collision
+
+    def in_collision(self, q: ArrayLike) -> np.ndarray:
+        """Return (N,) mask of colliding configurations @param q of shape (N, 6)."""
+        segments = self.link_segments(q)
+        return self.self_collision(segments) | self.environment_collision(segments)
+
+    def edges_in_collision(
+        self, q_from: ArrayLike, q_to: ArrayLike, resolution: float = 0.02
+    ) -> np.ndarray:
+        """Check M straight joint space edges between (M, 6) configurations
+        @param q_from and @param q_to sampled with @param resolution [rad]. Returns
+        (M,) mask of edges with at least one colliding sample."""
+        samples, edge = interpolate_edges(q_from, q_to, resolution)
+        collision = np.zeros(np.atleast_2d(q_from).shape[0], dtype=bool)
+        collision[edge[self.in_collision(samples)]] = True
+        return collision
+
+    def path_in_collision(self, path: ArrayLike, resolution: float = 0.02) -> bool:
+        """Return whether the joint space path given by (N, 6) waypoints collides
+        anywhere, the straight segments are sampled with @param resolution [rad]."""
+        path = np.atleast_2d(path)
+        if len(path) == 1:
+            return bool(self.in_collision(path)[0])
+        return bool(np.any(self.edges_in_collision(path[:-1], path[1:], resolution)))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Batching of MARS commands into a single serial write.
+
+With echo disabled, the control unit replies only to queries and to failed commands
+(FAIL!). A checked batch is therefore terminated by a STAMP command and the reply is
+read until the matching STAMP= line; a FAIL! before it means that one of the commands
+failed. The failing command is found by re-sending halves of the batch, hence only
+idempotent commands (e.g. register writes) should be checked."""
+
+from __future__ import annotations
+
+import time
+
+from ctu_crs.mars_proxy import mars_lock
+from ctu_crs.register_shadow import RegisterShadow
+from ctu_crs.response_parser import FAIL, VALUE, CommandError, ResponseParser
+
+
+class CommandBatch:
+    def __init__(
+        self, mars, timeout: float = 5.0, registers: RegisterShadow | None = None
+    ):
+        """
+        :param mars: Connection to the control unit.
+        :param timeout: Maximum time [s] to wait for the reply of a checked batch.
+        :param registers: Shadow of the registers; writes of values that are already
+          set are dropped and the shadow is updated as the commands are added.
+        """
+        super().__init__()
+        self._mars = mars
+        self.timeout = timeout
+        self.registers = registers
+        self.commands: list[str] = []
+        self._stamp = int(time.time() % 0x7FFF)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __enter__(self) -> CommandBatch:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def add(self, cmd: str):
+        """Append command @param cmd, the line terminator is added if missing. The
+        command is dropped if it writes a register with its current value."""
+        cmd = cmd.strip("\n")
+        if self.registers is not None and not self.registers.record(cmd):
+            return
+        self.commands.append(cmd + "\n")
+
+    def flush(self, check: bool = True):
+        """Send all commands in a single write and clear the batch. If @param check is
+        set, wait for the control unit to process them and raise CommandError with
+        the first failing command."""
+        commands, self.commands = self.commands, []
+        if len(commands) == 0:
+            return
+        if not check:
+            self._mars.send_cmd("".join(commands))
+            return
+        if self._send_checked(commands):
+            return
+        if self.registers is not None:
+            for cmd in commands:
+                self.registers.forget(cmd)
+        raise CommandError(self._find_failing(commands).strip())
+
+    def _send_checked(self, commands: list[str]) -> bool:
+        """Send @param commands followed by STAMP in one write and read the replies
+        up to the stamp. Returns False if any of the commands failed."""
+        self._stamp = (self._stamp + 1) & 0x7FFF
+        stamp = str(self._stamp)
+        parser = ResponseParser()
+        failed = False
+        deadline = time.monotonic() + self.timeout
+        with mars_lock(self._mars):
+            self._mars.send_cmd("".join(commands) + f"STAMP:{stamp}\n")
+            while True:
+                event = parser.read_until(
+                    self._mars,
+                    lambda e: e.kind == VALUE
+                    and e.name == "STAMP"
+                    and e.value == stamp,
+                    timeout=max(deadline - time.monotonic(), 0.0),
+                )
+                if event is None:
+                    raise TimeoutError("Control unit did not acknowledge the batch.")
+                if event.kind != FAIL:
+                    return not failed
+                failed = True
+
+    def _find_failing(self, commands: list[str]) -> str:
+        """Bisect @param commands, that are known to contain a failing command, by
+        re-sending their halves."""
+        while len(commands) > 1:
+            half = commands[: len(commands) // 2]
+            commands = commands[len(half) :] if self._send_checked(half) else half
+        return commands[0]
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Detection of the end of coordinated movements.
+
+The end of every commanded movement is predicted from the commanded distance and the
+speed and acceleration registers (the same synchronized trapezoidal profile as in
+ctu_crs.timing). Waiting sleeps until shortly before the predicted end without any
+communication and then polls the state of the control unit, halving the remaining
+time until the prediction and backing off exponentially once it has passed, so the
+prediction errors cost only a few queries."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.instrumentation import stats_of
+from ctu_crs.timing import trapezoidal_duration
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class CompletionRecord(NamedTuple):
+    """Result of waiting for a motion; times are monotonic [s]."""
+
+    predicted_end: float
+    detected: float
+    last_moving: float | None
+    polls: int
+    # time when the first of the awaited movements was sent
+    commanded: float | None = None
+
+    @property
+    def latency(self) -> float:
+        """Upper bound of the time between the end of the motion and its detection:
+        the end is assumed to be after the predicted end and after the last poll that
+        observed the robot in motion."""
+        start = self.predicted_end
+        if self.last_moving is not None:
+            start = max(start, self.last_moving)
+        return max(self.detected - start, 0.0)
+
+
+class MotionCompletion:
+    def __init__(
+        self,
+        robot,
+        margin: float = 0.03,
+        min_poll: float = 0.005,
+        max_poll: float = 0.1,
+        backoff: float = 2.0,
+        history: int = 1000,
+        time_scale: float = 1.0,
+    ):
+        """
+        :param robot: CRSRobot whose movements are tracked.
+        :param margin: Time [s] before the predicted end when polling starts.
+        :param min_poll: Initial polling period [s] after the predicted end.
+        :param max_poll: Maximal polling period [s].
+        :param backoff: Growth factor of the polling period.
+        :param history: Number of the most recent completion records kept.
+        :param time_scale: Ratio of the time of the control unit to the wall clock
+          time, e.g. the speedup of the simulated control unit.
+        """
+        super().__init__()
+        self._robot = robot
+        self.margin = margin
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.time_scale = time_scale
+        self.records: deque[CompletionRecord] = deque(maxlen=history)
+        self._target_irc: np.ndarray | None = None
+        self._predicted_end = 0.0
+        self._commanded: float | None = None
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def predicted_end(self) -> float:
+        """Predicted monotonic time [s] of the end of all commanded movements."""
+        return self._predicted_end
+
+    def reset(self):
+        """Forget the commanded target, e.g. after homing or stopping the motors."""
+        with self._lock:
+            self._target_irc = None
+            self._predicted_end = 0.0
+            self._commanded = None
+
+    def seed(self, irc: ArrayLike):
+        """Set the start of the next movement to @param irc if it is unknown; the
+        robot must be stopped."""
+        with self._lock:
+            if self._target_irc is None:
+                self._target_irc = np.asarray(irc, dtype=float)
+
+    def _limits_irc(self) -> tuple[np.ndarray, np.ndarray]:
+        """Speed [IRC/s] and acceleration [IRC/s^2] of the axes from the registers
+        last written to the control unit, defaults if unknown."""
+        r = self._robot
+        speed = np.array(r._default_speed_irc256_per_ms, dtype=float)
+        acc = np.array(r._default_acceleration_irc_per_ms, dtype=float)
+        for i, axis in enumerate(r._motors_ids):
+            v = r.registers.get(f"REGMS{axis}")
+            a = r.registers.get(f"REGACC{axis}")
+            speed[i] = speed[i] if v is None else float(v)
+            acc[i] = acc[i] if a is None else float(a)
+        return speed / 256 * 1e3, acc / 256 * 1e6
+
+    def duration(
+        self, irc_from: ArrayLike, irc_to: ArrayLike, min_time: float | None = None
+    ) -> float:
+        """Predict duration [s] of the coordinated movement between IRC positions."""
+        d = np.abs(np.asarray(irc_to, dtype=float) - np.asarray(irc_from, dtype=float))
+        moving = d > 0
+        t = 0.0
+        if np.any(moving):
+            v, a = self._limits_irc()
+            vs = np.min(v[moving] / d[moving])
+            acc_s = np.min(a[moving] / d[moving])
+            t = float(trapezoidal_duration(1.0, vs, acc_s))
+        return max(t, min_time or 0.0) / self.time_scale
+
+    def expect(self, irc: ArrayLike, min_time: float | None = None) -> float:
+        """Register coordinated movement to @param irc that was just sent. Movements
+        are queued by the control unit, so it starts when the previous one ends.
+        Returns the predicted monotonic time of its end."""
+        irc = np.asarray(irc, dtype=float)
+        with self._lock:
+            if self._commanded is None:
+                self._commanded = time.monotonic()
+            # the start of the first movement after reset is unknown, so its end is
+            # not predicted and waiting polls from the beginning
+            start = max(time.monotonic(), self._predicted_end)
+            if self._target_irc is not None:
+                start += self.duration(self._target_irc, irc, min_time)
+            self._predicted_end = start
+            self._target_irc = irc
+            return self._predicted_end
+
+    def wait(self, timeout: float | None = None) -> CompletionRecord | None:
+        """Wait until the robot stops. Returns record of the detection or None on
+        @param timeout [s]."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        predicted = self._predicted_end
+        wake = predicted - self.margin
+        if deadline is not None:
+            wake = min(wake, deadline)
+        delay = wake - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        polls = 0
+        last_moving = None
+        period = self.min_poll
+        while True:
+            moving = self._robot.in_motion()
+            polls += 1
+            now = time.monotonic()
+            if not moving:
+                break
+            last_moving = now
+            if deadline is not None and now >= deadline:
+                return None
+            remaining = predicted - now
+            if remaining > self.min_poll:
+                sleep = remaining / 2
+            else:
+                sleep = period
+                period = min(period * self.backoff, self.max_poll)
+            if deadline is not None:
+                sleep = min(sleep, deadline - now)
+            time.sleep(sleep)
+        with self._lock:
+            commanded, self._commanded = self._commanded, None
+        record = CompletionRecord(predicted, now, last_moving, polls, commanded)
+        self.records.append(record)
+        stats = stats_of(self._robot._mars)
+        if stats is not None:
+            stats.record_polls("wait_for_motion_stop", polls)
+            if commanded is not None:
+                stats.record_move(now - commanded)
+        return record
+
+    def future(self) -> Future:
+        """Return future resolved with the CompletionRecord when the robot stops. The
+        waiting runs in a background thread."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="crs-completion"
+            )
+        return self._executor.submit(self.wait)
+
+    def add_done_callback(self, callback: Callable[[CompletionRecord], None]) -> Future:
+        """Call @param callback with the CompletionRecord from a background thread
+        when the robot stops."""
+        future = self.future()
+        future.add_done_callback(lambda f: callback(f.result()))
+        return future
+
+    def latency_stats(self) -> dict[str, float]:
+        """Return statistics of the detection latency [s] and number of polls of
+        the recorded completions."""
+        if not self.records:
+            return dict(count=0)
+        latency = np.array([r.latency for r in self.records])
+        polls = np.array([r.polls for r in self.records])
+        return dict(
+            count=len(latency),
+            latency_mean=float(latency.mean()),
+            latency_max=float(latency.max()),
+            polls_mean=float(polls.mean()),
+        )
+
+    def shutdown(self):
+        """Stop the background thread used by futures."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Control of several robots from one process.
+
+Every robot has its own worker thread that executes all calls of the robot, so the
+serial traffic of one robot never waits for the other one (each robot has its own
+control unit and lock). Calls return futures; the robots are synchronized by waiting
+for the futures, by barriers in the programs executed by run, or by synchronized
+starts of movements."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+from numpy.typing import ArrayLike
+
+# marker of a barrier in the programs executed by RobotCoordinator.run
+SYNC = object()
+
+
+def gather(futures: dict[str, Future], timeout: float | None = None) -> dict:
+    """Wait for all @param futures and return their results by name. The exception of
+    the first failing future is raised after all of them finished."""
+    results, error = {}, None
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout)
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return results
+
+
+class RobotCoordinator:
+    def __init__(self, robots: dict):
+        """
+        :param robots: Robots (e.g. CRS93 and CRS97) by name.
+        """
+        super().__init__()
+        self.robots = dict(robots)
+        self._workers = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"crs-{name}")
+            for name in self.robots
+        }
+
+    def __enter__(self) -> RobotCoordinator:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Finish the queued calls and stop the workers; robots stay connected."""
+        for worker in self._workers.values():
+            worker.shutdown(wait=True)
+
+    def _names(self, names: Iterable[str] | None) -> list[str]:
+        return list(self.robots) if names is None else list(names)
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> Future:
+        """Call @param fn(robot, *args, **kwargs) in the worker of robot @param name.
+        Calls of one robot are executed in the order of submission."""
+        robot = self.robots[name]
+        return self._workers[name].submit(fn, robot, *args, **kwargs)
+
+    def map(
+        self, fn: Callable, names: Iterable[str] | None = None, *args, **kwargs
+    ) -> dict[str, Future]:
+        """Submit @param fn to all robots in @param names (all robots if None)."""
+        return {n: self.submit(n, fn, *args, **kwargs) for n in self._names(names)}
+
+    def initialize(self, names: Iterable[str] | None = None, **kwargs):
+        """Initialize the robots in parallel; see CRSRobot.initialize."""
+        gather(self.map(lambda r: r.initialize(**kwargs), names))
+
+    def move_to_q(
+        self, targets: dict[str, ArrayLike], synchronized: bool = False
+    ) -> dict[str, Future]:
+        """Send coordinated movements to joint configurations @param targets by robot
+        name. If @param synchronized is set, the commands are sent once all workers
+        are ready, i.e. after the previous calls of all robots finished, so the
+        movements start together. Returns futures of sending the commands."""
+        barrier = threading.Barrier(len(targets)) if synchronized else None
+
+        def move(robot, q):
+            if barrier is not None:
+                barrier.wait()
+            robot.move_to_q(q)
+
+        return {name: self.submit(name, move, q) for name, q in targets.items()}
+
+    def wait_for_motion_stop(
+        self, names: Iterable[str] | None = None, timeout: float | None = None
+    ) -> bool:
+        """Wait until all robots in @param names stop. Returns False if any of them
+        did not stop within @param timeout [s]."""
+        results = gather(self.map(lambda r: r.wait_for_motion_stop(timeout), names))
+        return all(results.values())
+
+    def move_and_wait(
+        self, targets: dict[str, ArrayLike], synchronized: bool = False
+    ) -> bool:
+        """Move robots to @param targets and wait until all of them stop."""
+        self.move_to_q(targets, synchronized)
+        return self.wait_for_motion_stop(targets.keys())
+
+    def barrier(self, names: Iterable[str] | None = None):
+        """Wait until all previously submitted calls of the robots finished."""
+        gather(self.map(lambda r: None, names))
+
+    def run(self, programs: dict[str, Iterable]) -> dict[str, list]:
+        """Execute programs of the robots in parallel and return results of their
+        steps. A program is a sequence of functions called with the robot, e.g.
+        lambda r: r.move_to_q(q), and SYNC markers; at every SYNC the robot waits
+        until all programs reach it. All programs must contain the same number of
+        markers. If a program fails, the others fail at their next SYNC."""
+        barrier = threading.Barrier(len(programs))
+
+        def execute(robot, steps):
+            results = []
+            try:
+                for step in steps:
+                    if step is SYNC:
+                        barrier.wait()
+                    else:
+                        results.append(step(robot))
+            except BaseException:
+                # programs waiting at a SYNC that this program will never reach fail
+                barrier.abort()
+                raise
+            return results
+
+        return gather(
+            {name: self.submit(name, execute, p) for name, p in programs.items()}
+        )
@@ -4,16 +4,13 @@
 # Created on: 2024-10-30
 #     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
 #
-from pathlib import Path
-
-import yaml
-
+from ctu_crs.cache import cache_path
 from ctu_crs.crs_robot import CRSRobot
+from ctu_crs.kinematic_model import load_params
 
 
 class CRS93(CRSRobot):
     def __init__(self, tty_dev: str | None = "/dev/mars", baudrate: int = 19200):
-        yaml_path = Path(__file__).parent / "params_crs93.yaml"
-        with open(yaml_path, "r") as f:
-            crs_params = yaml.safe_load(f)
-        super().__init__(tty_dev, baudrate, **crs_params)
+        super().__init__(tty_dev, baudrate, **load_params("crs93"))
+        self.reachability_map_path = cache_path("reachability_crs93.npy")
+        self.roadmap_path = cache_path("roadmap_crs93.npz")
@@ -6,68 +6,62 @@
 #
 
 from __future__ import annotations
+import copy
+from typing import TYPE_CHECKING, Iterable
+
 import numpy as np
-from numpy import allclose
 from numpy.typing import ArrayLike
-from ctu_mars_control_unit import MarsControlUnit
 
+from ctu_crs.command_batch import CommandBatch
+from ctu_crs.completion import MotionCompletion
 from ctu_crs.gripper import Gripper
-
-
-class CRSRobot:
+from ctu_crs.kinematic_model import KinematicModel
+from ctu_crs.mars_proxy import LockedMars
+from ctu_crs.register_shadow import RegisterShadow
+from ctu_crs.response_parser import check_ready, current_q_irc, wait_ready
+from ctu_crs.tracing import traced
+
+# optional features are imported by the methods that use them
+if TYPE_CHECKING:
+    from ctu_crs.collision import CollisionModel
+    from ctu_crs.instrumentation import MarsStats
+    from ctu_crs.motion_queue import MotionQueue
+    from ctu_crs.planner import RoadmapPlanner
+    from ctu_crs.servo import CartesianServo
+    from ctu_crs.telemetry import JointStateSampler
+
+
+class CRSRobot(KinematicModel):
     def __init__(
         self, tty_dev: str | None = "/dev/mars", baudrate: int = 19200, **crs_kwargs
     ):
-        super().__init__()
-        self._mars = (
-            MarsControlUnit(tty_dev=tty_dev, baudrate=baudrate)
-            if tty_dev is not None
-            else None
-        )
-
-        self.link_lengths = np.array([0.3052, 0.3048, 0.3302, 0.0762])
-        self.gripper_length = 0.108712
-        self.finger_length = 0.0254
-
-        # conversion IRC to radians
-        irc = np.array([1000, 1000, 1000, 500, 500, 500])  # IRC per rotation of motor.
-        gearing = np.array([100, 100, 100, 101, 100, 101])
-        direction = np.array([1, 1, -1, -1, -1, -1])
-        self._deg_to_irc = (
-            irc * direction * gearing * 4 / 360
-        )  # degtoirc=1 degree in IRC
+        super().__init__(**crs_kwargs)
+        # all calls to the control unit are serialized by the lock of the proxy,
+        # which allows to query the robot from background threads (e.g. telemetry);
+        # the serial stack is imported only when connecting to the control unit
+        self._mars = None
+        time_scale = 1.0
+        if tty_dev is not None:
+            from ctu_crs.sim import SimulatedMarsControlUnit, is_sim_tty
+
+            if is_sim_tty(tty_dev):
+                mars = SimulatedMarsControlUnit(tty_dev=tty_dev, baudrate=baudrate)
+                time_scale = mars.speedup
+            else:
+                from ctu_mars_control_unit import MarsControlUnit
+
+                mars = MarsControlUnit(tty_dev=tty_dev, baudrate=baudrate)
+            self._mars = LockedMars(mars)
 
-        self._motors_ids = "ABCDEF"
-
-        self._hh_rad = np.array([0, 0, 0, 0, 0, 0])
-        self._hh_irc = np.array(crs_kwargs["hh_irc"], dtype=int)
         self._hh_sequence = []
         if "hh_sequence" in crs_kwargs.keys():
             self._hh_sequence = crs_kwargs["hh_sequence"]
 
-        lower_bound_irc = crs_kwargs["lower_bound_irc"]
-        upper_bound_irc = crs_kwargs["upper_bound_irc"]
-        self.q_min = self._irc_to_joint_values(lower_bound_irc)
-        self.q_max = self._irc_to_joint_values(upper_bound_irc)
-        self.q_home = np.deg2rad([0, 0, -45, 0, -45, 0])
-
-        self._default_speed_irc256_per_ms = np.array(
-            crs_kwargs["default_speed_irc256_per_ms"], dtype=int
+        # registers last written to the control unit, shared with the gripper
+        self.registers = RegisterShadow()
+        self.gripper = Gripper(
+            self._mars, registers=self.registers, **crs_kwargs["gripper"]
         )
-        self._min_speed_irc256_per_ms = np.rint(self._default_speed_irc256_per_ms / 5)
-        self._max_speed_irc256_per_ms = np.rint(self._default_speed_irc256_per_ms * 2)
-
-        self._default_acceleration_irc_per_ms = np.array(
-            crs_kwargs["default_acceleration_irc_per_ms"], dtype=int
-        )
-        self._min_acceleration_irc_per_ms = np.rint(
-            self._default_acceleration_irc_per_ms / 5
-        )
-        self._max_acceleration_irc_per_ms = np.rint(
-            self._default_acceleration_irc_per_ms * 2
-        )
-
-        self.gripper = Gripper(self._mars, **crs_kwargs["gripper"])
 
         self._REGME = [32000, 32000, 32000, 32000, 32000, 32000]
         self._REGP = [10, 12, 70, 35, 45, 100]
@@ -77,35 +71,89 @@ class CRSRobot:
         self._IDLEREL = 1200
         self._timeout = 200
 
-        # DH notation
+        # optional collision model, move_to_q refuses colliding targets if set
+        self.collision_model: CollisionModel | None = None
+
+        # roadmap of the planner, loaded/built on the first query
+        self.roadmap_path = None
+        self._planner: RoadmapPlanner | None = None
+
+        # background joint state sampler, see start_telemetry
+        self.telemetry: JointStateSampler | None = None
+
+        # latency statistics of the communication, see enable_instrumentation
+        self.instrumentation: MarsStats | None = None
 
-        self.dh_offset = np.deg2rad(np.array([0.0, -270.0, -90.0, 0.0, 0.0, 0.0]))
-        self.dh_d = [
-            self.link_lengths[0],
-            0,
-            0,
-            self.link_lengths[2],
-            0,
-            self.link_lengths[3] + self.gripper_length + self.finger_length,
-        ]
-        self.dh_a = [0, self.link_lengths[1], 0, 0, 0, 0]
-        self.dh_alpha = np.deg2rad(np.array([90.0, 0.0, 270.0, 90.0, 270.0, 0]))
+        # predicts the end of coordinated movements, see wait_for_motion_stop
+        self.completion = MotionCompletion(self, time_scale=time_scale)
 
         self._initialized = False
+        self._homed = False
+
+        # record of the state of the control unit for warm start, see initialize
+        self.session_path = None
+
+    def __getstate__(self):
+        raise TypeError("Robot cannot be pickled, use kinematic_model() instead.")
+
+    def kinematic_model(self) -> KinematicModel:
+        """Return copy of the kinematic model of the robot without the connection to
+        the control unit, e.g. to be sent to worker processes."""
+        model = KinematicModel.__new__(KinematicModel)
+        model.__setstate__(copy.deepcopy(KinematicModel.__getstate__(self)))
+        return model
 
     def release(self):
         """Release errors and reset control unit."""
         self._mars.send_cmd("RELEASE:\n")
+        self.registers.invalidate()
+        self.completion.reset()
 
     def reset_motors(self):
         """Reset motors of robot."""
         self._mars.send_cmd("PURGE:\n")
+        self.registers.invalidate()
+        self.completion.reset()
 
     def close(self):
-        """Close connection to the robot."""
+        """Close connection to the robot. The session record is saved if
+        session_path is set."""
+        self.stop_telemetry()
+        self.completion.shutdown()
+        if self.instrumentation is not None:
+            self.instrumentation.stop_dump()
+        if self._initialized:
+            self.save_session()
         self._mars.close_connection()
 
-    def initialize(self, home: bool = True):
+    def save_session(self):
+        """Save the state of the control unit to session_path for warm start."""
+        if self.session_path is not None:
+            from ctu_crs.session import SessionRecord
+
+            SessionRecord.capture(self, self._homed).save(self.session_path)
+
+    def _warm_start(self) -> bool:
+        """Reuse the state of the control unit stored in session_path if the unit
+        still matches it. Returns False if full initialization is needed."""
+        from ctu_crs.session import SessionRecord
+
+        record = SessionRecord.load(self.session_path)
+        if record is None or not record.matches(self):
+            return False
+        self.registers.restore(record.registers)
+        self.completion.reset()
+        self.completion.seed(record.q_irc)
+        self._mars.setup_coordmv(self._motors_ids)
+        if f"REGCFG{self.gripper._axis}" in record.registers:
+            self.gripper._initialized = True
+        else:
+            self.gripper.initialize()
+        self._homed = True
+        self._initialized = True
+        return True
+
+    def initialize(self, home: bool = True, warm_start: bool = False):
         """Initialize communication with robot and set all necessary parameters.
         This command will perform following settings:
          - synchronize communication with mars control unit
@@ -113,27 +161,38 @@ class CRSRobot:
          - set PID control parameters, maximum speed and acceleration
          - set value for IDLE release
          - perform hard home and soft home, if @param home is True
+        If @param warm_start is set and the control unit is still in the state saved
+        in session_path by the previous process (see ctu_crs.session), the reset,
+        register uploads and homing are skipped.
         """
         self._mars.sync_cmd_fifo()
+        if warm_start and self._warm_start():
+            return
+        self._homed = False
         self._mars.send_cmd("PURGE:\n")
+        self.registers.invalidate()
+        self.completion.reset()
         self._mars.send_cmd("STOP:\n")
-        assert self._mars.check_ready()
-        self._mars.wait_ready()
+        assert check_ready(self._mars)
+        wait_ready(self._mars)
 
+        # all registers are written in a single round trip
+        batch = CommandBatch(self._mars, registers=self.registers)
         fields = ["REGME", "REGCFG", "REGP", "REGI", "REGD"]
         for f in fields:
             field_values = getattr(self, f"_{f}")
             assert field_values is not None
             assert len(field_values) == len(self._motors_ids)
             for motor_id, value in zip(self._motors_ids, field_values):
-                self._mars.send_cmd(f"{f}{motor_id}:{value}\n")
+                batch.add(f"{f}{motor_id}:{value}")
 
-        self.set_speed(self._default_speed_irc256_per_ms)
-        self.set_acceleration(self._default_acceleration_irc_per_ms)
+        self.set_speed(self._default_speed_irc256_per_ms, batch=batch)
+        self.set_acceleration(self._default_acceleration_irc_per_ms, batch=batch)
 
-        self._mars.send_cmd(f"IDLEREL:{self._IDLEREL}\n")
-        self.gripper.initialize()
-        self._mars.send_cmd("SPDTB:0,300\n")
+        batch.add(f"IDLEREL:{self._IDLEREL}")
+        self.gripper.initialize(batch=batch)
+        batch.add("SPDTB:0,300")
+        batch.flush(check=True)
 
         self._mars.setup_coordmv(self._motors_ids)
         if home:
@@ -141,27 +200,22 @@ class CRSRobot:
             self.soft_home()
 
         self._initialized = True
+        self.save_session()
 
-    def _joint_values_to_irc(self, joint_values: ArrayLike) -> np.ndarray:
-        """Convert joint values [rad] to IRC."""
-        j = np.asarray(joint_values)
-        assert j.shape == (len(self._motors_ids),), "Incorrect number of joints."
-        irc = (
-            np.rad2deg((joint_values + self._hh_rad)) * self._deg_to_irc + self._hh_irc
-        )
-        return np.rint(irc)
-
-    def _irc_to_joint_values(self, irc: ArrayLike) -> np.ndarray:
-        """Convert IRC to joint values [rad]."""
-        irc = np.asarray(irc)
-        assert irc.shape == (len(self._motors_ids),), "Incorrect number of joints."
-        return np.deg2rad((irc - self._hh_irc) / self._deg_to_irc) + self._hh_rad
-
-    def set_speed(self, speed_irc256_ms: ArrayLike):
-        """Set speed for each motor in IRC*256/msec."""
+    def set_speed(self, speed_irc256_ms: ArrayLike, batch: CommandBatch | None = None):
+        """Set speed for each motor in IRC*256/msec. The registers are sent in a single
+        write, or appended to @param batch if given; registers that already have the
+        requested value are not sent."""
         assert len(speed_irc256_ms) == len(self._motors_ids)
+        b = (
+            batch
+            if batch is not None
+            else CommandBatch(self._mars, registers=self.registers)
+        )
         for axis, speed in zip(self._motors_ids, speed_irc256_ms):
-            self._mars.send_cmd(f"REGMS{axis}:{np.rint(speed)}\n")
+            b.add(f"REGMS{axis}:{np.rint(speed)}")
+        if batch is None:
+            b.flush(check=False)
 
     def set_speed_relative(self, fraction: float):
         """Set speed for each motor in fraction (0-1) of maximum speed."""
@@ -171,11 +225,22 @@ class CRSRobot:
         )
         self.set_speed(s)
 
-    def set_acceleration(self, acceleration_irc_ms: ArrayLike):
-        """Set acceleration for each motor in IRC/msec."""
+    def set_acceleration(
+        self, acceleration_irc_ms: ArrayLike, batch: CommandBatch | None = None
+    ):
+        """Set acceleration for each motor in IRC/msec. The registers are sent in a
+        single write, or appended to @param batch if given; registers that already have
+        the requested value are not sent."""
         assert len(acceleration_irc_ms) == len(self._motors_ids)
+        b = (
+            batch
+            if batch is not None
+            else CommandBatch(self._mars, registers=self.registers)
+        )
         for axis, acceleration in zip(self._motors_ids, acceleration_irc_ms):
-            self._mars.send_cmd(f"REGACC{axis}:{np.rint(acceleration)}\n")
+            b.add(f"REGACC{axis}:{np.rint(acceleration)}")
+        if batch is None:
+            b.flush(check=False)
 
     def set_acceleration_relative(self, fraction: float):
         """Set acceleration for each motor in fraction (0-1) of maximum acceleration."""
@@ -188,221 +253,179 @@ class CRSRobot:
     def hard_home(self):
         """Perform hard home of the robot s.t. prismatic joint is homed first followed
         by joint A, B, and D. The speed is reset to default value before homing."""
-        self.set_speed(self._default_speed_irc256_per_ms)
-        self.set_acceleration(self._default_acceleration_irc_per_ms)
+        batch = CommandBatch(self._mars, registers=self.registers)
+        self.set_speed(self._default_speed_irc256_per_ms, batch=batch)
+        self.set_acceleration(self._default_acceleration_irc_per_ms, batch=batch)
+        batch.flush(check=False)
         if len(self._hh_sequence) > 0:
             for blk in self._hh_sequence:
                 for a in blk:
-                    self._mars.send_cmd("HH" + a + ":\n")
-                self._mars.wait_ready()
+                    batch.add("HH" + a + ":")
+                batch.flush(check=False)
+                wait_ready(self._mars)
+            self.completion.reset()
+            self._homed = True
         else:
             raise ValueError("The hard home sequence is not defined for this robot.")
 
     def soft_home(self):
         """Move robot to the home position using coordinated movement."""
-        self._mars.coordmv(self._joint_values_to_irc(self.q_home))
+        self._coordmv(self._joint_values_to_irc(self.q_home))
         self.wait_for_motion_stop()
 
+    @traced("move_to_q", "robot")
     def move_to_q(self, q: ArrayLike):
         """Move robot to the given joint configuration [rad] using coordinated movement.
-        Initialization has be called before to set up coordinate movements."""
+        A list of configurations, e.g. from plan_to_q, is traversed waypoint by
+        waypoint. Initialization has be called before to set up coordinate movements."""
+        assert self._initialized, "You need to initialize the robot before moving it."
+        waypoints = np.atleast_2d(np.asarray(q, dtype=float))
+        assert self.in_limits(waypoints), "Joint limits violated."
+        if self.collision_model is not None:
+            assert not np.any(
+                self.collision_model.in_collision(waypoints)
+            ), "Target in collision."
+        for waypoint in waypoints:
+            self._coordmv(self._joint_values_to_irc(waypoint))
+
+    def move_along(self, waypoints: Iterable[tuple[float, ArrayLike]]):
+        """Stream timed joint waypoints (t [s], q [rad]) to the control unit as they
+        are produced, e.g. by ctu_crs.cartesian_path.linear_path. Each waypoint is
+        reached no sooner than at its time relative to the previous waypoint; the
+        first one is reached as fast as possible."""
         assert self._initialized, "You need to initialize the robot before moving it."
-        assert self.in_limits(q), "Joint limits violated."
-        self._mars.coordmv(self._joint_values_to_irc(q))
+        t_prev = None
+        for t, q in waypoints:
+            assert self.in_limits(q), "Joint limits violated."
+            min_time = None if t_prev is None or t <= t_prev else t - t_prev
+            self._coordmv(self._joint_values_to_irc(q), min_time=min_time)
+            t_prev = t
 
     def get_q(self) -> np.ndarray:
         """Get current joint configuration."""
         return self._irc_to_joint_values(
-            self._mars.get_current_q_irc()[: len(self._motors_ids)]
+            current_q_irc(self._mars)[: len(self._motors_ids)]
         )
 
     def in_motion(self) -> bool:
         """Return whether the robot is in motion."""
-        return not self._mars.check_ready()
-
-    def wait_for_motion_stop(self):
-        """Wait until the robot stops moving."""
-        self._mars.wait_ready()
-
-    def in_limits(self, q: ArrayLike) -> bool:
-        """Return whether the given joint configuration is in joint limits."""
-        return np.all(q >= self.q_min) and np.all(q <= self.q_max)
-
-    @staticmethod
-    def dh_to_se3(d: float, theta: float, a: float, alpha: float) -> np.ndarray:
-        """Compute SE3 matrix from DH parameters."""
-        tz = np.eye(4)
-        tz[2, 3] = d
-        rz = np.eye(4)
-        rz[:2, :2] = np.array(
-            [[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]]
-        )
-        tx = np.eye(4)
-        tx[0, 3] = a
-        rx = np.eye(4)
-        rx[1:3, 1:3] = np.array(
-            [[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]]
-        )
-        return tz @ rz @ tx @ rx
-
-    def fk_flange_pos(self, q: ArrayLike) -> np.ndarray:
-        """Compute forward kinematics for the given joint configuration @param q.
-        Returns 3D position of the flange w.r.t. base of the robot."""
-        return (self.fk(q) @ np.array([0, 0, -self.dh_d[-1], 1]))[:3]
-
-    def fk(self, q: ArrayLike) -> np.ndarray:
-        """Compute forward kinematics for the given joint configuration @param q.
-        Returns 4x4 homogeneous transformation matrix (SE3) of the end-effector w.r.t.
-        base of the robot."""
-        pose = np.eye(4)
-        for d, a, alpha, theta, qi in zip(
-            self.dh_d, self.dh_a, self.dh_alpha, self.dh_offset, q
+        return not check_ready(self._mars)
+
+    def _coordmv(self, q_irc: np.ndarray, min_time: float | None = None) -> float:
+        """Send coordinated movement to @param q_irc. Returns its predicted end."""
+        self._mars.coordmv(q_irc, min_time=min_time)
+        return self.completion.expect(q_irc, min_time)
+
+    @traced("wait_for_motion_stop", "robot")
+    def wait_for_motion_stop(self, timeout: float | None = None) -> bool:
+        """Wait until the robot stops moving. The control unit is not queried until
+        shortly before the predicted end of the commanded movements, see
+        MotionCompletion. Returns False on @param timeout [s]."""
+        return self.completion.wait(timeout) is not None
+
+    def motion_done(self):
+        """Return future resolved when the robot stops moving."""
+        return self.completion.future()
+
+    def start_telemetry(
+        self, rate: float = 10.0, capacity: int = 4096, log_path=None, **kwargs
+    ) -> JointStateSampler:
+        """Start sampling joint configurations in background; see JointStateSampler
+        for the arguments. The samples are accessible via the telemetry attribute."""
+        assert self._initialized, "You need to initialize the robot first."
+        from ctu_crs.telemetry import JointStateSampler
+
+        self.stop_telemetry()
+        self.telemetry = JointStateSampler(self, rate, capacity, log_path, **kwargs)
+        self.telemetry.start()
+        return self.telemetry
+
+    def stop_telemetry(self):
+        """Stop background sampling, the collected samples remain accessible."""
+        if self.telemetry is not None:
+            self.telemetry.stop()
+
+    def enable_instrumentation(
+        self, dump_interval: float | None = None, dump_path=None, **kwargs
+    ) -> MarsStats:
+        """Start recording latency of the calls of the control unit, see MarsStats.
+        If @param dump_interval [s] is given, snapshots are periodically appended to
+        @param dump_path as JSON lines. Other arguments are passed to MarsStats."""
+        self.disable_instrumentation()
+        from ctu_crs.instrumentation import MarsStats
+
+        self.instrumentation = MarsStats(**kwargs)
+        self.instrumentation.attach(self._mars)
+        if dump_interval is not None:
+            self.instrumentation.start_dump(dump_interval, dump_path)
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """Stop recording; the collected statistics remain accessible."""
+        if self.instrumentation is not None:
+            self.instrumentation.stop_dump()
+            self.instrumentation.detach(self._mars)
+
+    def stats(self) -> dict:
+        """Return snapshot of the instrumentation (empty if never enabled)."""
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.snapshot()
+
+    def cartesian_servo(self, rate: float = 10.0, **kwargs) -> CartesianServo:
+        """Create servo that streams joint increments for Cartesian twist commands at
+        @param rate [Hz]; see CartesianServo for the other arguments."""
+        from ctu_crs.servo import CartesianServo
+
+        return CartesianServo(self, rate=rate, **kwargs)
+
+    def motion_queue(self, lookahead: int = 4, **kwargs) -> MotionQueue:
+        """Create queue that streams joint or Cartesian targets to the control unit,
+        resolving IK @param lookahead targets ahead; see MotionQueue."""
+        assert self._initialized, "You need to initialize the robot first."
+        from ctu_crs.motion_queue import MotionQueue
+
+        return MotionQueue(self, lookahead=lookahead, **kwargs)
+
+    def enable_collision_model(
+        self, table_height: float | None = 0.0, **kwargs
+    ) -> CollisionModel:
+        """Create collision model used to validate targets of move_to_q. The table is
+        registered at @param table_height [m] unless it is None; obstacles can be
+        added to the returned model. See CollisionModel for the other arguments."""
+        from ctu_crs.collision import CollisionModel
+
+        self.collision_model = CollisionModel(self, **kwargs)
+        if table_height is not None:
+            self.collision_model.add_table(table_height)
+        return self.collision_model
+
+    def roadmap_planner(self, **kwargs) -> RoadmapPlanner:
+        """Return roadmap planner using the current collision model. The roadmap is
+        built against the static part of the model (table, self-collisions) and it is
+        loaded from (or saved to) roadmap_path; see Roadmap.build for the arguments."""
+        from ctu_crs.planner import Roadmap, RoadmapPlanner
+
+        assert self.collision_model is not None, "Enable collision model first."
+        static = self.collision_model.static_model()
+        planner = self._planner
+        if (
+            planner is None
+            or not planner.roadmap.is_compatible(self)
+            or planner.roadmap.collision_fingerprint != static.fingerprint()
         ):
-            pose = pose @ self.dh_to_se3(d, qi + theta, a, alpha)
-        return pose
-
-    def _ik_flange_pos(
-        self, flange_pos: np.ndarray, singularity_theta1=0
-    ) -> list[np.ndarray]:
-        """Solve IK for position of the flange. This implementation supports only the
-        robot configurations that are above the ground."""
-        d = self.dh_d
-        a = self.dh_a
-        b = flange_pos[2] - d[0]
-
-        if allclose(flange_pos[:2], 0):  # last link pointing up
-            max_b = d[3] + a[1]
-            if allclose(b, max_b):  # full length
-                return [np.array([singularity_theta1, 0, 0])]
-            if b > d[0]:
-                arg1 = (a[1] ** 2 + b**2 - d[3] ** 2) / (2 * a[1] * b)
-                arg2 = (a[1] ** 2 + d[3] ** 2 - b**2) / (2 * a[1] * d[3])
-                if np.abs(arg1) > 1.0 or np.abs(arg2) > 1.0:
-                    return []
-                th2 = -np.arccos(arg1)
-                th3 = np.pi - np.arccos(arg2)
-                return [
-                    np.array([singularity_theta1, th2, th3]),
-                    np.array([singularity_theta1, -th2, -th3]),
-                ]
-            return []
-
-        c = np.sqrt(b**2 + flange_pos[0] ** 2 + flange_pos[1] ** 2)
-        if allclose(c, d[3] + a[1]):  # full length
-            tmp = -np.pi / 2 + np.arcsin(b / c)
-            return [
-                np.array([np.arctan2(flange_pos[1], flange_pos[0]), tmp, 0]),
-                np.array([np.arctan2(-flange_pos[1], -flange_pos[0]), -tmp, 0]),
-            ]
-        if c >= d[3] + a[1]:
-            return []
-
-        theta2_base = (
-            np.pi / 2
-            - np.arcsin(b / c)
-            + np.arccos((a[1] ** 2 + c**2 - d[3] ** 2) / (2 * a[1] * c))
-        )
-        th2_term1 = np.atan2(np.sin(theta2_base), np.cos(theta2_base))
-
-        theta1_pos = np.arctan2(flange_pos[1], flange_pos[0])
-        theta1_neg = np.arctan2(-flange_pos[1], -flange_pos[0])
-        theta3_term1 = np.pi - np.arccos(
-            (a[1] ** 2 + d[3] ** 2 - c**2) / (2 * a[1] * d[3])
-        )
-
-        th2_term2 = (
-            -np.pi / 2
-            + np.arcsin(b / c)
-            + np.arccos((a[1] ** 2 + c**2 - d[3] ** 2) / (2 * a[1] * c))
-        )
-
-        return [
-            np.array([theta1_pos, -th2_term1, theta3_term1]),
-            np.array([theta1_neg, th2_term1, -theta3_term1]),
-            np.array([theta1_pos, th2_term2, -theta3_term1]),
-            np.array([theta1_neg, -th2_term2, theta3_term1]),
-        ]
-
-    def ik(self, pose: np.ndarray) -> list[np.ndarray]:
-        """Compute inverse kinematics for the given pose. Returns array of joint
-        configurations [rad] which can achieve the given pose."""
-
-        # X=A01*A12*A23 * [0 0 0 1]' because A34*A45*A57==R34*R45*R56 is pure rotation
-        flange_pos = pose @ np.array([0, 0, -self.dh_d[5], 1])
-        sols_q_03 = self._ik_flange_pos(flange_pos)
-
-        singularity_theta4 = 0
-
-        sols = []
-        for q_03 in sols_q_03:
-            rot_03 = self.fk(q_03)[:3, :3]
-            rot_36 = rot_03.T @ pose[:3, :3]
-
-            # Euler Z - Y Z for joints 4, 5, 6
-            P = rot_36
-            if np.isclose(P[2][2], 1):  # np.cos(theta5) == 1
-                sols.append(
-                    np.concatenate(
-                        [
-                            q_03,
-                            [
-                                singularity_theta4,
-                                0,
-                                np.arctan2(P[1][0], P[0][0]) - singularity_theta4,
-                            ],
-                        ]
-                    )
-                )
-            elif np.isclose(P[2][2], -1):  # np.cos(theta5) == -1
-                sols.append(
-                    np.concatenate(
-                        [
-                            q_03,
-                            [
-                                singularity_theta4,
-                                np.pi,
-                                np.arctan2(P[1][0], -P[0][0]) + singularity_theta4,
-                            ],
-                        ]
-                    )
-                )
-            else:  # non - degenerate
-                theta5 = np.arccos(P[2][2])
-                sols.append(
-                    np.concatenate(
-                        [
-                            q_03,
-                            [
-                                np.arctan2(
-                                    P[1][2] * np.sign(np.sin(theta5)),
-                                    P[0][2] * np.sign(np.sin(theta5)),
-                                ),
-                                -theta5,
-                                np.arctan2(
-                                    P[2][1] * np.sign(np.sin(theta5)),
-                                    -P[2][0] * np.sign(np.sin(theta5)),
-                                ),
-                            ],
-                        ]
-                    )
-                )
-                sols.append(
-                    np.concatenate(
-                        [
-                            q_03,
-                            [
-                                np.arctan2(
-                                    P[1][2] * np.sign(np.sin(-theta5)),
-                                    P[0][2] * np.sign(np.sin(-theta5)),
-                                ),
-                                theta5,
-                                np.arctan2(
-                                    P[2][1] * np.sign(np.sin(-theta5)),
-                                    -P[2][0] * np.sign(np.sin(-theta5)),
-                                ),
-                            ],
-                        ]
-                    )
-                )
-        np.random.shuffle(sols)
-        return sols
+            roadmap = Roadmap.load_or_build(self, static, self.roadmap_path, **kwargs)
+            planner = RoadmapPlanner(self, roadmap, self.collision_model)
+            self._planner = planner
+        planner.collision_model = self.collision_model
+        return planner
+
+    def plan_to_q(
+        self, q_goal: ArrayLike, q_start: ArrayLike | None = None
+    ) -> list[np.ndarray] | None:
+        """Plan collision free joint space path from @param q_start (current
+        configuration if not given) to @param q_goal. Returns list of waypoints for
+        move_to_q or None if the goal cannot be reached."""
+        if q_start is None:
+            q_start = self.get_q()
+        return self.roadmap_planner().plan(q_start, q_goal)
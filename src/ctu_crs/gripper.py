@@ -4,16 +4,37 @@
 # Created on: 2023-11-7
 #     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
 #
+from __future__ import annotations
+
+import threading
 import time
+from typing import TYPE_CHECKING
 
 import numpy as np
-from ctu_mars_control_unit import MarsControlUnit
+
+from ctu_crs.command_batch import CommandBatch
+from ctu_crs.instrumentation import stats_of
+from ctu_crs.mars_proxy import mars_lock
+from ctu_crs.register_shadow import RegisterShadow
+from ctu_crs.response_parser import CommandError, query, wait_ready
+from ctu_crs.tracing import traced
+
+if TYPE_CHECKING:
+    from ctu_mars_control_unit import MarsControlUnit
 
 
 class Gripper:
-    def __init__(self, mars: MarsControlUnit | None = None, bounds=None, axis=None):
+    def __init__(
+        self,
+        mars: MarsControlUnit | None = None,
+        bounds=None,
+        axis=None,
+        registers: RegisterShadow | None = None,
+    ):
         super().__init__()
         self._mars = mars
+        # registers last written to the control unit, shared with the robot
+        self.registers = registers if registers is not None else RegisterShadow()
 
         # Constants for controlling the gripper
         self._axis = axis  # mars8 axis for gripper
@@ -45,83 +66,197 @@ class Gripper:
 
         self.gripper_poll_time = 0.2
         self.gripper_poll_diff = 50
+        # minimal period of position queries of non-blocking actions
+        self.gripper_poll_interval = 0.05
+        # non-blocking action is stalled after this many polls without motion
+        self.gripper_still_polls = 3
 
         # Gripper range
         self.bounds = bounds
 
         self._initialized = False
 
-    def initialize(self):
+    def initialize(self, batch: CommandBatch | None = None):
+        """Initialize the gripper controller by setting the parameters. The commands
+        are appended to @param batch if given, otherwise they are sent and checked in
+        a single round trip."""
         assert self._mars is not None
-        """Initialize the gripper controller by setting the parameters."""
+        b = (
+            batch
+            if batch is not None
+            else CommandBatch(self._mars, registers=self.registers)
+        )
         # Set analog mode of controller
-        self._mars.send_cmd(f"ANAXSETUP{self._axis}:{self._ADC},{self._current}\n")
+        b.add(f"ANAXSETUP{self._axis}:{self._ADC},{self._current}")
         # Maximal current limit (0 - 255)
-        self._mars.send_cmd(f"REGS1{self._axis}:{self._current}\n")
+        b.add(f"REGS1{self._axis}:{self._current}")
         # Limitation constant (feedback from overcurrent)
-        self._mars.send_cmd(f"REGS2{self._axis}:{self._feedback}\n")
+        b.add(f"REGS2{self._axis}:{self._feedback}")
         # Maximal energy limits voltage on motor
-        self._mars.send_cmd(f"REGME{self._axis}:{self._REGME}\n")
+        b.add(f"REGME{self._axis}:{self._REGME}")
         # Maximal speed
-        self._mars.send_cmd(f"REGMS{self._axis}:{self._REGMS}\n")
+        b.add(f"REGMS{self._axis}:{self._REGMS}")
         # Axis configuration word
-        self._mars.send_cmd(f"REGCFG{self._axis}:{self._REGCFG}\n")
+        b.add(f"REGCFG{self._axis}:{self._REGCFG}")
         # PID parameters of controller
-        self._mars.send_cmd(f"REGP{self._axis}:{self._REGP}\n")
-        self._mars.send_cmd(f"REGI{self._axis}:{self._REGI}\n")
-        self._mars.send_cmd(f"REGD{self._axis}:{self._REGD}\n")
+        b.add(f"REGP{self._axis}:{self._REGP}")
+        b.add(f"REGI{self._axis}:{self._REGI}")
+        b.add(f"REGD{self._axis}:{self._REGD}")
+        if batch is None:
+            b.flush(check=True)
         self._initialized = True
 
+    def relative_position(self, fraction: float) -> int:
+        """Return absolute position for relative one, 0 = bounds[0], 1 = bounds[1]."""
+        return int(self.bounds[0] + (self.bounds[1] - self.bounds[0]) * fraction)
+
     def control_position_relative(self, fraction: float):
         """Control the gripper by relative position 0 = bounds[0], 1 = bounds[1]"""
         assert self._initialized, "Gripper controller must be initialized first."
         # Set position on gripper
-        target = int(self.bounds[0] + (self.bounds[1] - self.bounds[0]) * fraction)
-        self.control_position(target)
+        self.control_position(self.relative_position(fraction))
 
+    @traced("gripper.control_position", "gripper")
     def control_position(self, position: float):
         """Control the gripper by absolute position."""
-        assert self._initialized, "Gripper controller must be initialized first."
-        self.release()
-        self._mars.send_cmd(f"G{self._axis}:{position}\n")
-        if np.isclose(position, self.bounds[1]):
+        self.command_position(position)
+        if self.is_closing(position):
             if not self.wait_for_motion_stop():
                 print("Cannot wait for motion stop, assuming it is done.")
             self.release()
 
+    def control_position_async(self, position: float) -> GripperAction:
+        """Send the gripper to absolute @param position and return handle of the
+        motion without waiting; see GripperAction."""
+        action = GripperAction(self, position)
+        action.start()
+        return action
+
+    def command_position(self, position: float):
+        """Send the gripper to absolute @param position without waiting."""
+        assert self._initialized, "Gripper controller must be initialized first."
+        self.release()
+        self._mars.send_cmd(f"G{self._axis}:{position}\n")
+
+    def is_closing(self, position: float) -> bool:
+        """Return whether @param position closes the gripper; the gripper is then
+        released after the motion stops to limit the grasping force."""
+        return bool(np.isclose(position, self.bounds[1]))
+
+    def get_position(self) -> float:
+        """Return current position of the gripper."""
+        assert self._initialized, "Gripper controller must be initialized first."
+        return float(query(self._mars, f"AP{self._axis}"))
+
     def release(self):
         """Release the gripper and reset the control unit."""
         assert self._initialized, "Gripper controller must be initialized first."
         self._mars.send_cmd(f"RELEASE{self._axis}:\n")
+        self.registers.invalidate(self._axis)
 
     def wait_for_motion_stop(self):
         """Wait until the gripper stops moving."""
         assert self._initialized, "Gripper controller must be initialized first."
-        self._mars.send_cmd(f"\nR{self._axis}:\n")
-        buf = "\n"
-        while True:
-            resp = self._mars.read_response()
-            if resp is None:
-                return False
-            buf += resp
-            if buf.find("\nFAIL!") >= 0:
+        # the reply of R<axis> must not be consumed by a query of another thread
+        with mars_lock(self._mars):
+            if not wait_ready(self._mars, self._axis):
                 return False
-            if buf.find(f"R{self._axis}!") >= 0:
-                break
-
-        # R! found
-        last = float("inf")
-        while True:
-            self._mars.send_cmd(f"AP{self._axis}?\n")
-            response = self._mars.read_response()
-            if response.find("\nFAIL!") >= 0:
-                return False
-            ifs = response.find(f"AP{self._axis}=")
-            if ifs >= 0:
-                ifl = response.find("\r\n")
-                p = float(response[ifs + 4 : ifl])
+            # R! found, wait until the position settles
+            last = float("inf")
+            polls = 0
+            while True:
+                try:
+                    p = self.get_position()
+                except CommandError:
+                    return False
+                polls += 1
                 if abs(last - p) < self.gripper_poll_diff:
                     break
                 last = p
+        stats = stats_of(self._mars)
+        if stats is not None:
+            stats.record_polls("gripper_wait_for_motion_stop", polls)
         time.sleep(self.gripper_poll_time)
         return True
+
+
+class GripperAction:
+    """Handle of a gripper motion that does not block the caller. The motion is
+    finished when the gripper reaches the target or stops moving, e.g. on a grasped
+    object; the closing gripper is then released as in Gripper.control_position.
+    The gripper is stopped if it stays within gripper_poll_diff of the same position
+    for gripper_still_polls polls and at least gripper_poll_time, so a slowly moving
+    gripper is not mistaken for a stalled one.
+    Every poll queries the position at most once per gripper_poll_interval, so it
+    can be interleaved with the arm commands on the shared serial line."""
+
+    def __init__(self, gripper: Gripper, position: float):
+        """
+        :param gripper: Initialized gripper.
+        :param position: Target absolute position.
+        """
+        super().__init__()
+        self._gripper = gripper
+        self.target = position
+        self.position: float | None = None
+        self.started: float | None = None
+        self._last_poll = 0.0
+        # position and time when the gripper was last seen moving, see poll
+        self._still_position: float | None = None
+        self._still_since = 0.0
+        self._still_polls = 0
+        self._done = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Send the command to the gripper."""
+        assert self.started is None, "Gripper action was already started."
+        self._gripper.command_position(self.target)
+        self.started = time.monotonic()
+
+    def poll(self) -> bool:
+        """Update the state of the motion if the poll interval elapsed. Returns
+        whether the motion is finished."""
+        g = self._gripper
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._done
+                or self.started is None
+                or now - self._last_poll < g.gripper_poll_interval
+            ):
+                return self._done
+            p = g.get_position()
+            reached = abs(p - self.target) < g.gripper_poll_diff
+            if (
+                self._still_position is None
+                or abs(p - self._still_position) >= g.gripper_poll_diff
+            ):
+                self._still_position, self._still_since = p, now
+                self._still_polls = 0
+            else:
+                self._still_polls += 1
+            stalled = (
+                self._still_polls >= g.gripper_still_polls
+                and now - self._still_since >= g.gripper_poll_time
+            )
+            self.position, self._last_poll = p, now
+            if reached or stalled:
+                if g.is_closing(self.target):
+                    g.release()
+                self._done = True
+            return self._done
+
+    def done(self) -> bool:
+        """Return whether the motion is finished."""
+        return self.poll()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the motion is finished. Returns False on @param timeout [s]."""
+        assert self.started is not None, "Gripper action was not started."
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.poll():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(self._gripper.gripper_poll_interval / 2)
+        return True
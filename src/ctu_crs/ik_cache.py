@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class IKCache:
+    """Bounded LRU cache of IK solutions keyed by a pose quantized to @param tolerance.
+    All entries are dropped when the fingerprint of kinematic parameters changes."""
+
+    def __init__(self, maxsize: int = 1024, tolerance: float = 1e-6):
+        super().__init__()
+        assert maxsize > 0, "Cache size must be positive."
+        assert tolerance > 0, "Tolerance must be positive."
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, list[np.ndarray]] = OrderedDict()
+        self._fingerprint: bytes | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, pose: np.ndarray) -> bytes:
+        """Quantize the upper 3x4 part of the @param pose into a hashable key."""
+        q = np.rint(np.asarray(pose, dtype=float)[:3] / self.tolerance)
+        return q.astype(np.int64).tobytes()
+
+    def _check_fingerprint(self, fingerprint: bytes):
+        if fingerprint != self._fingerprint:
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, pose: np.ndarray, fingerprint: bytes) -> list[np.ndarray] | None:
+        """Return cached solutions for @param pose or None if not cached."""
+        self._check_fingerprint(fingerprint)
+        key = self.key(pose)
+        sols = self._entries.get(key)
+        if sols is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return sols
+
+    def put(self, pose: np.ndarray, fingerprint: bytes, sols: list[np.ndarray]):
+        """Store solutions for @param pose, evicting the least recently used entry if
+        the cache is full."""
+        self._check_fingerprint(fingerprint)
+        key = self.key(pose)
+        self._entries[key] = [np.array(s) for s in sols]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict:
+        """Return hits, misses, current and maximum size of the cache."""
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
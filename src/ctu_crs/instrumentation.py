@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Optional latency instrumentation of the communication with the control unit.
+
+When MarsStats is attached to the LockedMars proxy of the robot, it records the
+duration of every method call of the control unit (send_cmd per command mnemonic,
+coordmv, read_response, ...), of the waits and queries of ctu_crs.response_parser
+(wait_ready, check_ready, get_current_q_irc, queries by name), the bytes written to
+and read from the serial line, the number of polls per wait and the time from sending
+a movement to the detection of its end. Without attached stats the only cost is a
+check of the stats attribute of the proxy.
+
+Values are accumulated in log-linear histograms (as in HdrHistogram): every power of
+two is split into equally wide sub-buckets, so the relative error of the reported
+percentiles is bounded for all magnitudes and memory does not grow with the number of
+samples."""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+
+class LogHistogram:
+    def __init__(self, resolution: float = 1e-6, sub_bucket_bits: int = 7):
+        """
+        :param resolution: Smallest distinguishable value, e.g. 1us for durations [s].
+        :param sub_bucket_bits: Every power of two is split into 2^bits sub-buckets,
+          the relative error of the values is below 2^(1-bits).
+        """
+        super().__init__()
+        self.resolution = resolution
+        self._bits = sub_bucket_bits
+        self._sub = 1 << sub_bucket_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def _index(self, value: float) -> int:
+        m = max(int(value / self.resolution), 0)
+        if m < self._sub:
+            return m
+        e = m.bit_length() - self._bits
+        return e * self._sub + (m >> e)
+
+    def _value(self, index: int) -> float:
+        """Middle of the bucket @param index."""
+        e, m = divmod(index, self._sub)
+        if e == 0:
+            return m * self.resolution
+        return ((m << e) + (1 << (e - 1))) * self.resolution
+
+    def record(self, value: float, n: int = 1):
+        """Record @param value @param n times."""
+        i = self._index(value)
+        self.counts[i] = self.counts.get(i, 0) + n
+        self.count += n
+        self.total += value * n
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: LogHistogram):
+        """Add the values of histogram @param other with the same layout."""
+        assert (self.resolution, self._bits) == (other.resolution, other._bits)
+        for i, n in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Value below which @param p percent of the recorded values lie."""
+        if not self.count:
+            return 0.0
+        rank = max(p / 100 * self.count, 1)
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(max(self._value(i), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        if not self.count:
+            return dict(count=0)
+        return dict(
+            count=self.count,
+            mean=self.mean,
+            min=self.min,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+            p999=self.percentile(99.9),
+            max=self.max,
+        )
+
+
+def command_name(cmd: str) -> str:
+    """Mnemonic of command @param cmd sent to the control unit, e.g. 'REGMSA' for
+    'REGMSA:500' or 'ST?' for a query of ST."""
+    cmd = cmd.strip()
+    for i, c in enumerate(cmd):
+        if c in ":=\n":
+            return cmd[:i]
+        if c == "?":
+            return cmd[: i + 1]
+    return cmd
+
+
+class _CountingConnection:
+    """Proxy of the serial connection of the control unit that counts the bytes on
+    the wire."""
+
+    def __init__(self, connection, stats: MarsStats):
+        super().__init__()
+        self._connection = connection
+        self._stats = stats
+
+    def write(self, data) -> int:
+        self._stats.bytes_written += len(data)
+        return self._connection.write(data)
+
+    def read(self, size: int = 1):
+        data = self._connection.read(size)
+        if data:
+            self._stats.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+
+class MarsStats:
+    def __init__(self, resolution: float = 1e-6, sub_bucket_bits: int = 7):
+        """
+        :param resolution: Resolution [s] of the latency histograms.
+        :param sub_bucket_bits: Precision of the histograms, see LogHistogram.
+        """
+        super().__init__()
+        self._histogram = functools.partial(LogHistogram, resolution, sub_bucket_bits)
+        self.latency: dict[str, LogHistogram] = {}
+        self.polls: dict[str, LogHistogram] = {}
+        self.move_to_stop = self._histogram()
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._dump_stop = threading.Event()
+        self._dump_thread: threading.Thread | None = None
+
+    def record(self, name: str, duration: float):
+        """Record @param duration [s] of a call of type @param name."""
+        with self._lock:
+            h = self.latency.get(name)
+            if h is None:
+                h = self.latency[name] = self._histogram()
+            h.record(duration)
+
+    def record_polls(self, name: str, polls: int):
+        """Record number of queries needed by one wait of type @param name."""
+        with self._lock:
+            h = self.polls.get(name)
+            if h is None:
+                h = self.polls[name] = LogHistogram(1.0)
+            h.record(polls)
+
+    def record_move(self, duration: float):
+        """Record time [s] from sending a movement to detecting its end."""
+        with self._lock:
+            self.move_to_stop.record(duration)
+
+    def call(self, name: str, fn: Callable, *args, **kwargs):
+        """Call @param fn and record its duration under @param name."""
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def snapshot(self) -> dict:
+        """Return summaries of all histograms (durations in [s]) and counters."""
+        with self._lock:
+            return dict(
+                time=time.time(),
+                uptime=time.monotonic() - self.started,
+                bytes_written=self.bytes_written,
+                bytes_read=self.bytes_read,
+                latency={k: h.summary() for k, h in sorted(self.latency.items())},
+                polls={k: h.summary() for k, h in sorted(self.polls.items())},
+                move_to_stop=self.move_to_stop.summary(),
+            )
+
+    def attach(self, mars):
+        """Start recording calls of LockedMars @param mars and its serial traffic."""
+        with mars.lock:
+            target = mars.target
+            connection = getattr(target, "_connection", None)
+            if connection is not None and not isinstance(
+                connection, _CountingConnection
+            ):
+                target._connection = _CountingConnection(connection, self)
+            mars.stats = self
+
+    def detach(self, mars):
+        """Stop recording calls of @param mars."""
+        with mars.lock:
+            mars.stats = None
+            target = mars.target
+            connection = getattr(target, "_connection", None)
+            if isinstance(connection, _CountingConnection):
+                target._connection = connection._connection
+
+    def start_dump(
+        self,
+        interval: float,
+        path: str | Path | None = None,
+        callback: Callable[[dict], None] | None = None,
+    ):
+        """Every @param interval [s] append the snapshot as a JSON line to @param
+        path and/or pass it to @param callback from a background thread."""
+        self.stop_dump()
+
+        def dump():
+            while not self._dump_stop.wait(interval):
+                snapshot = self.snapshot()
+                if path is not None:
+                    with open(path, "a") as f:
+                        f.write(json.dumps(snapshot) + "\n")
+                if callback is not None:
+                    callback(snapshot)
+
+        self._dump_stop.clear()
+        self._dump_thread = threading.Thread(target=dump, name="crs-stats", daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self):
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_thread = None
+
+
+def stats_of(mars) -> MarsStats | None:
+    """Return stats attached to @param mars or None."""
+    return getattr(mars, "stats", None)
+
+
+def instrumented(name: str):
+    """Decorator of functions communicating with the control unit passed as the first
+    argument; duration of the calls is recorded under @param name if stats are
+    attached to it."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(mars, *args, **kwargs):
+            stats = getattr(mars, "stats", None)
+            if stats is None:
+                return fn(mars, *args, **kwargs)
+            return stats.call(name, fn, mars, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
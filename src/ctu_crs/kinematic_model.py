@@ -0,0 +1,656 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Kinematic model of the CRS robots, independent of the connection to the control
+unit."""
+
+from __future__ import annotations
+
+import copy
+import functools
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy import allclose
+from numpy.typing import ArrayLike
+
+from ctu_crs.timing import speed_to_rad_per_s
+from ctu_crs.tracing import traced
+
+if TYPE_CHECKING:
+    from ctu_crs.ik_cache import IKCache
+    from ctu_crs.kinematics_kernel import KinematicsKernel
+    from ctu_crs.reachability import ReachabilityMap
+
+
+@functools.lru_cache(maxsize=None)
+def _read_params(name: str) -> dict:
+    import yaml
+
+    with open(Path(__file__).parent / f"params_{name}.yaml", "r") as f:
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_params(name: str) -> dict:
+    """Return parameters of the robot @param name (e.g. 'crs93') from the YAML file
+    distributed with the package. The file is parsed only once per process."""
+    return copy.deepcopy(_read_params(name))
+
+
+class KinematicModel:
+    """Kinematics, joint limits and IRC conversions of the robot. The model holds no
+    connection to the control unit and it is cheap to pickle, e.g. for worker
+    processes; the reachability map and the IK cache are not pickled."""
+
+    # attributes that are not pickled, they are reloaded or recomputed on demand
+    _TRANSIENT = ("_reachability_map", "ik_cache")
+
+    def __init__(self, **crs_kwargs):
+        super().__init__()
+        self.link_lengths = np.array([0.3052, 0.3048, 0.3302, 0.0762])
+        self.gripper_length = 0.108712
+        self.finger_length = 0.0254
+
+        # conversion IRC to radians
+        irc = np.array([1000, 1000, 1000, 500, 500, 500])  # IRC per rotation of motor.
+        gearing = np.array([100, 100, 100, 101, 100, 101])
+        direction = np.array([1, 1, -1, -1, -1, -1])
+        self._deg_to_irc = (
+            irc * direction * gearing * 4 / 360
+        )  # degtoirc=1 degree in IRC
+
+        self._motors_ids = "ABCDEF"
+
+        self._hh_rad = np.array([0, 0, 0, 0, 0, 0])
+        self._hh_irc = np.array(crs_kwargs["hh_irc"], dtype=int)
+
+        lower_bound_irc = crs_kwargs["lower_bound_irc"]
+        upper_bound_irc = crs_kwargs["upper_bound_irc"]
+        self.q_min = self._irc_to_joint_values(lower_bound_irc)
+        self.q_max = self._irc_to_joint_values(upper_bound_irc)
+        self.q_home = np.deg2rad([0, 0, -45, 0, -45, 0])
+
+        self._default_speed_irc256_per_ms = np.array(
+            crs_kwargs["default_speed_irc256_per_ms"], dtype=int
+        )
+        self._min_speed_irc256_per_ms = np.rint(self._default_speed_irc256_per_ms / 5)
+        self._max_speed_irc256_per_ms = np.rint(self._default_speed_irc256_per_ms * 2)
+
+        self._default_acceleration_irc_per_ms = np.array(
+            crs_kwargs["default_acceleration_irc_per_ms"], dtype=int
+        )
+        self._min_acceleration_irc_per_ms = np.rint(
+            self._default_acceleration_irc_per_ms / 5
+        )
+        self._max_acceleration_irc_per_ms = np.rint(
+            self._default_acceleration_irc_per_ms * 2
+        )
+
+        # DH notation
+
+        self.dh_offset = np.deg2rad(np.array([0.0, -270.0, -90.0, 0.0, 0.0, 0.0]))
+        self.dh_d = [
+            self.link_lengths[0],
+            0,
+            0,
+            self.link_lengths[2],
+            0,
+            self.link_lengths[3] + self.gripper_length + self.finger_length,
+        ]
+        self.dh_a = [0, self.link_lengths[1], 0, 0, 0, 0]
+        self.dh_alpha = np.deg2rad(np.array([90.0, 0.0, 270.0, 90.0, 270.0, 0]))
+
+        # precomputed reachability map, loaded/built on the first query
+        self.reachability_map_path = None
+        self._reachability_map: ReachabilityMap | None = None
+
+        # if True, ik returns solutions in the order given by the solver instead of
+        # shuffling them with the global np.random generator
+        self.ik_deterministic = False
+        self.ik_cache: IKCache | None = None
+
+        # attributes of the model, subclasses add the hardware state
+        self._model_attributes = frozenset(self.__dict__) | {"_model_attributes"}
+
+    def __getstate__(self) -> dict:
+        state = {k: v for k, v in self.__dict__.items() if k in self._model_attributes}
+        state.update(dict.fromkeys(self._TRANSIENT))
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+    def _joint_values_to_irc(self, joint_values: ArrayLike) -> np.ndarray:
+        """Convert joint values [rad] to IRC."""
+        j = np.asarray(joint_values)
+        assert j.shape == (len(self._motors_ids),), "Incorrect number of joints."
+        irc = (
+            np.rad2deg((joint_values + self._hh_rad)) * self._deg_to_irc + self._hh_irc
+        )
+        return np.rint(irc)
+
+    def _irc_to_joint_values(self, irc: ArrayLike) -> np.ndarray:
+        """Convert IRC to joint values [rad]."""
+        irc = np.asarray(irc)
+        assert irc.shape == (len(self._motors_ids),), "Incorrect number of joints."
+        return np.deg2rad((irc - self._hh_irc) / self._deg_to_irc) + self._hh_rad
+
+    def in_limits(self, q: ArrayLike) -> bool:
+        """Return whether the given joint configuration is in joint limits."""
+        return np.all(q >= self.q_min) and np.all(q <= self.q_max)
+
+    def in_limits_batch(self, q: ArrayLike) -> np.ndarray:
+        """Return boolean mask of joint configurations @param q of shape (..., 6) that
+        are in joint limits."""
+        q = np.asarray(q)
+        return np.all(q >= self.q_min, axis=-1) & np.all(q <= self.q_max, axis=-1)
+
+    def motion_time(self, q_from: ArrayLike, q_to: ArrayLike) -> np.ndarray:
+        """Approximate duration [s] of the motion between configurations @param q_from
+        and @param q_to of shape (..., 6) with the default speed, i.e. the time of the
+        slowest joint. Acceleration is neglected. Broadcasts over leading axes."""
+        speed = speed_to_rad_per_s(self, self._default_speed_irc256_per_ms)
+        dq = np.abs(np.asarray(q_to) - np.asarray(q_from))
+        return np.max(dq / speed, axis=-1)
+
+    def _motion_cost(self, q_from: np.ndarray, q_to: np.ndarray) -> np.ndarray:
+        """Motion time with a small sum-of-joints term that breaks ties between
+        solutions that differ only in the joints that are not the slowest."""
+        speed = speed_to_rad_per_s(self, self._default_speed_irc256_per_ms)
+        t = np.abs(q_to - q_from) / speed
+        return np.max(t, axis=-1) + 1e-3 * np.sum(t, axis=-1)
+
+    def _wrapped_solutions(
+        self, sols: np.ndarray, mask: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Extend IK solutions of shape (..., K, 6) by their variants shifted by +-2pi
+        in joints whose limits exceed [-pi, pi]. Returns (..., K * M, 6) solutions and
+        the corresponding mask."""
+        wrap = np.flatnonzero((self.q_min < -np.pi) | (self.q_max > np.pi))
+        offsets = np.zeros((3 ** len(wrap), sols.shape[-1]))
+        if len(wrap) > 0:
+            grid = np.meshgrid(*[[0, -2 * np.pi, 2 * np.pi]] * len(wrap))
+            offsets[:, wrap] = np.stack([g.ravel() for g in grid], axis=-1)
+        sols = sols[..., np.newaxis, :] + offsets
+        mask = np.repeat(mask[..., np.newaxis], len(offsets), axis=-1)
+        shape = sols.shape[:-3] + (-1,)
+        return sols.reshape(shape + (sols.shape[-1],)), mask.reshape(shape)
+
+    def ik_closest(
+        self, pose: np.ndarray, q_ref: ArrayLike, limits: bool = True
+    ) -> np.ndarray | None:
+        """Return IK solution for the given @param pose that is the fastest to reach
+        from @param q_ref (see motion_time), considering only solutions within joint
+        limits if @param limits is True. Joints with range over 2pi are unwrapped to
+        the closest value. Returns None if there is no such solution."""
+        sols = np.empty((8, len(self._motors_ids)))
+        mask = np.empty(8, dtype=bool)
+        self.kinematics_kernel().ik_into(sols, mask, np.asarray(pose, dtype=float))
+        sols, mask = self._wrapped_solutions(sols, mask)
+        if limits:
+            mask &= self.in_limits_batch(sols)
+        if not np.any(mask):
+            return None
+        cost = np.where(mask, self._motion_cost(np.asarray(q_ref), sols), np.inf)
+        return sols[np.argmin(cost)]
+
+    def ik_closest_path(
+        self, poses: ArrayLike, q_ref: ArrayLike, limits: bool = True
+    ) -> np.ndarray | None:
+        """Select IK solutions for the sequence of (N, 4, 4) @param poses starting from
+        @param q_ref s.t. the sum of motion times between consecutive configurations
+        is minimal. Returns (N, 6) array or None if some pose has no solution."""
+        sols, mask = self._wrapped_solutions(*self.ik_batch(poses))
+        if limits:
+            mask &= self.in_limits_batch(sols)
+        if not np.all(np.any(mask, axis=1)):
+            return None
+        cost = np.where(mask[0], self._motion_cost(np.asarray(q_ref), sols[0]), np.inf)
+        parents = np.zeros(mask.shape, dtype=int)
+        for i in range(1, len(sols)):
+            step = self._motion_cost(sols[i - 1, :, np.newaxis], sols[i, np.newaxis])
+            total = cost[:, np.newaxis] + step
+            parents[i] = np.argmin(total, axis=0)
+            cost = np.where(mask[i], np.min(total, axis=0), np.inf)
+        path = np.empty((len(sols), sols.shape[-1]))
+        j = np.argmin(cost)
+        for i in range(len(sols) - 1, -1, -1):
+            path[i] = sols[i, j]
+            j = parents[i, j]
+        return path
+
+    def reachability_map(self) -> ReachabilityMap:
+        """Return reachability map of the robot. The map is loaded from (or built and
+        saved to) reachability_map_path and incrementally updated whenever the joint
+        limits q_min/q_max have changed since the last query."""
+        if self._reachability_map is None:
+            from ctu_crs.reachability import ReachabilityMap
+
+            self._reachability_map = ReachabilityMap.load_or_build(
+                self, self.reachability_map_path
+            )
+        elif not self._reachability_map.limits_equal(self):
+            self._reachability_map.update(self)
+            self._reachability_map.try_save(self.reachability_map_path)
+        return self._reachability_map
+
+    def reachable(self, points: ArrayLike, min_count: int = 1) -> np.ndarray:
+        """Return (N,) boolean mask of (N, 3) @param points that can be reached by the
+        tool within joint limits, without solving IK. See ReachabilityMap for the
+        resolution and the tool orientations considered."""
+        return self.reachability_map().reachable(points, min_count=min_count)
+
+    @staticmethod
+    def dh_to_se3(d: float, theta: float, a: float, alpha: float) -> np.ndarray:
+        """Compute SE3 matrix from DH parameters."""
+        tz = np.eye(4)
+        tz[2, 3] = d
+        rz = np.eye(4)
+        rz[:2, :2] = np.array(
+            [[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]]
+        )
+        tx = np.eye(4)
+        tx[0, 3] = a
+        rx = np.eye(4)
+        rx[1:3, 1:3] = np.array(
+            [[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]]
+        )
+        return tz @ rz @ tx @ rx
+
+    def fk_flange_pos(self, q: ArrayLike) -> np.ndarray:
+        """Compute forward kinematics for the given joint configuration @param q.
+        Returns 3D position of the flange w.r.t. base of the robot."""
+        return (self.fk(q) @ np.array([0, 0, -self.dh_d[-1], 1]))[:3]
+
+    def fk(self, q: ArrayLike) -> np.ndarray:
+        """Compute forward kinematics for the given joint configuration @param q.
+        Returns 4x4 homogeneous transformation matrix (SE3) of the end-effector w.r.t.
+        base of the robot."""
+        pose = np.eye(4)
+        for d, a, alpha, theta, qi in zip(
+            self.dh_d, self.dh_a, self.dh_alpha, self.dh_offset, q
+        ):
+            pose = pose @ self.dh_to_se3(d, qi + theta, a, alpha)
+        return pose
+
+    def kinematics_kernel(self) -> KinematicsKernel:
+        """Return closed-form FK/IK kernel generated from DH parameters of the robot.
+        The kernel writes into preallocated buffers and is intended for tight loops,
+        see KinematicsKernel.fk_into and KinematicsKernel.ik_into."""
+        from ctu_crs.kinematics_kernel import KinematicsKernel
+
+        return KinematicsKernel.for_robot(self)
+
+    def _dh_to_se3_batch(self, q: np.ndarray) -> np.ndarray:
+        """Compute SE3 matrices of all links for joint values @param q of shape (N, k)
+        with k <= 6. Returns array of shape (N, k, 4, 4); entries are computed
+        elementwise so that they match the result of dh_to_se3 exactly."""
+        n, k = q.shape
+        theta = q + self.dh_offset[:k]
+        alpha = self.dh_alpha[:k]
+        ct, st = np.cos(theta), np.sin(theta)
+        ca, sa = np.cos(alpha), np.sin(alpha)
+        links = np.zeros((n, k, 4, 4))
+        links[..., 0, 0] = ct
+        links[..., 0, 1] = -st * ca
+        links[..., 0, 2] = -st * -sa
+        links[..., 0, 3] = ct * self.dh_a[:k]
+        links[..., 1, 0] = st
+        links[..., 1, 1] = ct * ca
+        links[..., 1, 2] = ct * -sa
+        links[..., 1, 3] = st * self.dh_a[:k]
+        links[..., 2, 1] = sa
+        links[..., 2, 2] = ca
+        links[..., 2, 3] = self.dh_d[:k]
+        links[..., 3, 3] = 1.0
+        return links
+
+    def fk_batch(self, q: ArrayLike) -> np.ndarray:
+        """Compute forward kinematics for N joint configurations @param q of shape
+        (N, 6). Returns (N, 4, 4) array of SE3 matrices of the end-effector w.r.t. base
+        of the robot; each of them is identical to the result of fk."""
+        return self.fk_frames_batch(q)[:, -1]
+
+    def fk_frames_batch(self, q: ArrayLike) -> np.ndarray:
+        """Compute poses of all DH frames for N joint configurations @param q of shape
+        (N, 6). Returns (N, 7, 4, 4) array, where [:, 0] is the base frame and [:, i]
+        is the frame after i-th joint."""
+        q = np.asarray(q, dtype=float)
+        assert q.ndim == 2 and q.shape[1] <= len(self._motors_ids), "Incorrect shape."
+        links = self._dh_to_se3_batch(q)
+        frames = np.empty((q.shape[0], q.shape[1] + 1, 4, 4))
+        frames[:, 0] = np.eye(4)
+        for i in range(q.shape[1]):
+            frames[:, i + 1] = frames[:, i] @ links[:, i]
+        return frames
+
+    def jacobian_batch(self, q: ArrayLike) -> np.ndarray:
+        """Compute geometric Jacobian for N joint configurations @param q of shape
+        (N, 6). Returns (N, 6, 6) array mapping joint velocities to the linear and
+        angular velocity of the end-effector expressed in the base frame."""
+        frames = self.fk_frames_batch(q)
+        z = frames[:, :-1, :3, 2]
+        p = frames[:, :-1, :3, 3]
+        p_ee = frames[:, -1:, :3, 3]
+        jac = np.empty((frames.shape[0], 6, frames.shape[1] - 1))
+        jac[:, :3] = np.swapaxes(np.cross(z, p_ee - p), 1, 2)
+        jac[:, 3:] = np.swapaxes(z, 1, 2)
+        return jac
+
+    def jacobian(self, q: ArrayLike) -> np.ndarray:
+        """Compute 6x6 geometric Jacobian for joint configuration @param q. The first
+        three rows correspond to the linear velocity of the end-effector and the last
+        three rows to the angular velocity, both w.r.t. base of the robot."""
+        return self.jacobian_batch(np.asarray(q, dtype=float)[np.newaxis])[0]
+
+    def fk_flange_pos_batch(self, q: ArrayLike) -> np.ndarray:
+        """Compute position of the flange for N joint configurations @param q of shape
+        (N, 6). Returns (N, 3) array of positions w.r.t. base of the robot."""
+        return (self.fk_batch(q) @ np.array([0, 0, -self.dh_d[-1], 1]))[:, :3]
+
+    def _ik_flange_pos(
+        self, flange_pos: np.ndarray, singularity_theta1=0
+    ) -> list[np.ndarray]:
+        """Solve IK for position of the flange. This implementation supports only the
+        robot configurations that are above the ground."""
+        d = self.dh_d
+        a = self.dh_a
+        b = flange_pos[2] - d[0]
+
+        if allclose(flange_pos[:2], 0):  # last link pointing up
+            max_b = d[3] + a[1]
+            if allclose(b, max_b):  # full length
+                return [np.array([singularity_theta1, 0, 0])]
+            if b > d[0]:
+                arg1 = (a[1] ** 2 + b**2 - d[3] ** 2) / (2 * a[1] * b)
+                arg2 = (a[1] ** 2 + d[3] ** 2 - b**2) / (2 * a[1] * d[3])
+                if np.abs(arg1) > 1.0 or np.abs(arg2) > 1.0:
+                    return []
+                th2 = -np.arccos(arg1)
+                th3 = np.pi - np.arccos(arg2)
+                return [
+                    np.array([singularity_theta1, th2, th3]),
+                    np.array([singularity_theta1, -th2, -th3]),
+                ]
+            return []
+
+        c = np.sqrt(b**2 + flange_pos[0] ** 2 + flange_pos[1] ** 2)
+        if allclose(c, d[3] + a[1]):  # full length
+            tmp = -np.pi / 2 + np.arcsin(b / c)
+            return [
+                np.array([np.arctan2(flange_pos[1], flange_pos[0]), tmp, 0]),
+                np.array([np.arctan2(-flange_pos[1], -flange_pos[0]), -tmp, 0]),
+            ]
+        if c >= d[3] + a[1]:
+            return []
+
+        theta2_base = (
+            np.pi / 2
+            - np.arcsin(b / c)
+            + np.arccos((a[1] ** 2 + c**2 - d[3] ** 2) / (2 * a[1] * c))
+        )
+        th2_term1 = np.atan2(np.sin(theta2_base), np.cos(theta2_base))
+
+        theta1_pos = np.arctan2(flange_pos[1], flange_pos[0])
+        theta1_neg = np.arctan2(-flange_pos[1], -flange_pos[0])
+        theta3_term1 = np.pi - np.arccos(
+            (a[1] ** 2 + d[3] ** 2 - c**2) / (2 * a[1] * d[3])
+        )
+
+        th2_term2 = (
+            -np.pi / 2
+            + np.arcsin(b / c)
+            + np.arccos((a[1] ** 2 + c**2 - d[3] ** 2) / (2 * a[1] * c))
+        )
+
+        return [
+            np.array([theta1_pos, -th2_term1, theta3_term1]),
+            np.array([theta1_neg, th2_term1, -theta3_term1]),
+            np.array([theta1_pos, th2_term2, -theta3_term1]),
+            np.array([theta1_neg, -th2_term2, theta3_term1]),
+        ]
+
+    def _ik_flange_pos_batch(
+        self, flange_pos: np.ndarray, singularity_theta1=0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Solve IK for N positions of the flange given as (N, 3) array. Returns
+        (N, 4, 3) array of solutions and (N, 4) validity mask; the branches are the
+        same as in _ik_flange_pos, with valid solutions stored first."""
+        d = self.dh_d
+        a = self.dh_a
+        x, y = flange_pos[:, 0], flange_pos[:, 1]
+        b = flange_pos[:, 2] - d[0]
+        n = flange_pos.shape[0]
+        max_c = d[3] + a[1]
+        sols = np.zeros((n, 4, 3))
+        mask = np.zeros((n, 4), dtype=bool)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # last link pointing up
+            on_axis = np.all(np.isclose(flange_pos[:, :2], 0), axis=1)
+            on_axis_full = on_axis & np.isclose(b, max_c)
+            arg1 = (a[1] ** 2 + b**2 - d[3] ** 2) / (2 * a[1] * b)
+            arg2 = (a[1] ** 2 + d[3] ** 2 - b**2) / (2 * a[1] * d[3])
+            on_axis_bent = (
+                on_axis
+                & ~on_axis_full
+                & (b > d[0])
+                & (np.abs(arg1) <= 1.0)
+                & (np.abs(arg2) <= 1.0)
+            )
+            th2 = -np.arccos(arg1)
+            th3 = np.pi - np.arccos(arg2)
+
+            # general position
+            c = np.sqrt(b**2 + x**2 + y**2)
+            full = ~on_axis & np.isclose(c, max_c)
+            general = ~on_axis & ~full & (c < max_c)
+            theta1_pos = np.arctan2(y, x)
+            theta1_neg = np.arctan2(-y, -x)
+            tmp = -np.pi / 2 + np.arcsin(b / c)
+            acos_c = np.arccos((a[1] ** 2 + c**2 - d[3] ** 2) / (2 * a[1] * c))
+            theta2_base = np.pi / 2 - np.arcsin(b / c) + acos_c
+            th2_term1 = np.atan2(np.sin(theta2_base), np.cos(theta2_base))
+            th2_term2 = -np.pi / 2 + np.arcsin(b / c) + acos_c
+            theta3_term1 = np.pi - np.arccos(
+                (a[1] ** 2 + d[3] ** 2 - c**2) / (2 * a[1] * d[3])
+            )
+
+        sols[on_axis_full, 0] = [singularity_theta1, 0, 0]
+        mask[on_axis_full, 0] = True
+
+        m = on_axis_bent
+        sols[m, 0] = np.stack([np.full(m.sum(), singularity_theta1), th2[m], th3[m]], 1)
+        sols[m, 1] = np.stack(
+            [np.full(m.sum(), singularity_theta1), -th2[m], -th3[m]], 1
+        )
+        mask[m, :2] = True
+
+        m = full
+        sols[m, 0] = np.stack([theta1_pos[m], tmp[m], np.zeros(m.sum())], 1)
+        sols[m, 1] = np.stack([theta1_neg[m], -tmp[m], np.zeros(m.sum())], 1)
+        mask[m, :2] = True
+
+        m = general
+        t1p, t1n, t3 = theta1_pos[m], theta1_neg[m], theta3_term1[m]
+        sols[m, 0] = np.stack([t1p, -th2_term1[m], t3], 1)
+        sols[m, 1] = np.stack([t1n, th2_term1[m], -t3], 1)
+        sols[m, 2] = np.stack([t1p, th2_term2[m], -t3], 1)
+        sols[m, 3] = np.stack([t1n, -th2_term2[m], t3], 1)
+        mask[m] = True
+
+        mask &= np.all(np.isfinite(sols), axis=2)
+        sols[~mask] = 0
+        return sols, mask
+
+    def ik_batch(self, poses: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Compute inverse kinematics for N poses given as (N, 4, 4) array. Returns
+        (N, 8, 6) array of joint configurations [rad] and (N, 8) boolean mask marking
+        which of them are valid solutions. Solution 2k and 2k+1 share the first three
+        joints; the order of solutions is deterministic."""
+        poses = np.asarray(poses, dtype=float)
+        assert poses.ndim == 3 and poses.shape[1:] == (4, 4), "Incorrect shape."
+        n = poses.shape[0]
+        flange_pos = poses @ np.array([0, 0, -self.dh_d[5], 1])
+        sols_q_03, mask_03 = self._ik_flange_pos_batch(flange_pos[:, :3])
+
+        singularity_theta4 = 0
+
+        rot_03 = self.fk_batch(sols_q_03.reshape(-1, 3))[:, :3, :3].reshape(n, 4, 3, 3)
+        P = np.swapaxes(rot_03, -1, -2) @ poses[:, None, :3, :3]
+        up = np.isclose(P[..., 2, 2], 1)  # np.cos(theta5) == 1
+        down = np.isclose(P[..., 2, 2], -1)  # np.cos(theta5) == -1
+        regular = ~up & ~down
+
+        with np.errstate(invalid="ignore"):
+            theta5 = np.arccos(P[..., 2, 2])
+        sign_pos = np.sign(np.sin(theta5))
+        sign_neg = np.sign(np.sin(-theta5))
+
+        sols = np.zeros((n, 4, 2, 6))
+        sols[..., :3] = sols_q_03[:, :, None, :]
+        sols[..., 0, 3] = np.where(
+            regular,
+            np.arctan2(P[..., 1, 2] * sign_pos, P[..., 0, 2] * sign_pos),
+            singularity_theta4,
+        )
+        sols[..., 0, 4] = np.where(regular, -theta5, np.where(up, 0, np.pi))
+        sols[..., 0, 5] = np.where(
+            regular,
+            np.arctan2(P[..., 2, 1] * sign_pos, -P[..., 2, 0] * sign_pos),
+            np.where(
+                up,
+                np.arctan2(P[..., 1, 0], P[..., 0, 0]) - singularity_theta4,
+                np.arctan2(P[..., 1, 0], -P[..., 0, 0]) + singularity_theta4,
+            ),
+        )
+        sols[..., 1, 3] = np.arctan2(P[..., 1, 2] * sign_neg, P[..., 0, 2] * sign_neg)
+        sols[..., 1, 4] = theta5
+        sols[..., 1, 5] = np.arctan2(P[..., 2, 1] * sign_neg, -P[..., 2, 0] * sign_neg)
+
+        mask = np.stack([mask_03, mask_03 & regular], axis=-1)
+        mask &= np.all(np.isfinite(sols), axis=-1)
+        sols[~mask] = 0
+        return sols.reshape(n, 8, 6), mask.reshape(n, 8)
+
+    def enable_ik_cache(self, maxsize: int = 1024, tolerance: float = 1e-6):
+        """Cache results of ik in LRU cache of size @param maxsize. Poses that differ by
+        less than @param tolerance (elementwise) share the cache entry."""
+        from ctu_crs.ik_cache import IKCache
+
+        self.ik_cache = IKCache(maxsize=maxsize, tolerance=tolerance)
+
+    def disable_ik_cache(self):
+        """Disable caching of ik results."""
+        self.ik_cache = None
+
+    def _kinematics_fingerprint(self) -> bytes:
+        """Bytes identifying the kinematic parameters; used to invalidate caches."""
+        return np.concatenate(
+            [self.dh_d, self.dh_a, self.dh_alpha, self.dh_offset], dtype=float
+        ).tobytes()
+
+    @traced("ik", "kinematics")
+    def ik(self, pose: np.ndarray) -> list[np.ndarray]:
+        """Compute inverse kinematics for the given pose. Returns array of joint
+        configurations [rad] which can achieve the given pose. The solutions are
+        shuffled unless ik_deterministic is set; results are cached if enabled by
+        enable_ik_cache."""
+        if self.ik_cache is None:
+            sols = self._ik(pose)
+        else:
+            fingerprint = self._kinematics_fingerprint()
+            sols = self.ik_cache.get(pose, fingerprint)
+            if sols is None:
+                sols = self._ik(pose)
+                self.ik_cache.put(pose, fingerprint, sols)
+            sols = [s.copy() for s in sols]
+        if not self.ik_deterministic:
+            np.random.shuffle(sols)
+        return sols
+
+    def _ik(self, pose: np.ndarray) -> list[np.ndarray]:
+        """Compute inverse kinematics for the given pose in deterministic order."""
+
+        # X=A01*A12*A23 * [0 0 0 1]' because A34*A45*A57==R34*R45*R56 is pure rotation
+        flange_pos = pose @ np.array([0, 0, -self.dh_d[5], 1])
+        sols_q_03 = self._ik_flange_pos(flange_pos)
+
+        singularity_theta4 = 0
+
+        sols = []
+        for q_03 in sols_q_03:
+            rot_03 = self.fk(q_03)[:3, :3]
+            rot_36 = rot_03.T @ pose[:3, :3]
+
+            # Euler Z - Y Z for joints 4, 5, 6
+            P = rot_36
+            if np.isclose(P[2][2], 1):  # np.cos(theta5) == 1
+                sols.append(
+                    np.concatenate(
+                        [
+                            q_03,
+                            [
+                                singularity_theta4,
+                                0,
+                                np.arctan2(P[1][0], P[0][0]) - singularity_theta4,
+                            ],
+                        ]
+                    )
+                )
+            elif np.isclose(P[2][2], -1):  # np.cos(theta5) == -1
+                sols.append(
+                    np.concatenate(
+                        [
+                            q_03,
+                            [
+                                singularity_theta4,
+                                np.pi,
+                                np.arctan2(P[1][0], -P[0][0]) + singularity_theta4,
+                            ],
+                        ]
+                    )
+                )
+            else:  # non - degenerate
+                theta5 = np.arccos(P[2][2])
+                sols.append(
+                    np.concatenate(
+                        [
+                            q_03,
+                            [
+                                np.arctan2(
+                                    P[1][2] * np.sign(np.sin(theta5)),
+                                    P[0][2] * np.sign(np.sin(theta5)),
+                                ),
+                                -theta5,
+                                np.arctan2(
+                                    P[2][1] * np.sign(np.sin(theta5)),
+                                    -P[2][0] * np.sign(np.sin(theta5)),
+                                ),
+                            ],
+                        ]
+                    )
+                )
+                sols.append(
+                    np.concatenate(
+                        [
+                            q_03,
+                            [
+                                np.arctan2(
+                                    P[1][2] * np.sign(np.sin(-theta5)),
+                                    P[0][2] * np.sign(np.sin(-theta5)),
+                                ),
+                                theta5,
+                                np.arctan2(
+                                    P[2][1] * np.sign(np.sin(-theta5)),
+                                    -P[2][0] * np.sign(np.sin(-theta5)),
+                                ),
+                            ],
+                        ]
+                    )
+                )
+        return sols
@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Closed-form forward and inverse kinematics generated from DH parameters.
+
+The kernel expands the product of DH link transformations symbolically, folds all
+constant terms (cosines/sines of alpha, offsets that are multiples of 90 degrees, zero
+link lengths) and compiles the result into a plain Python function operating on
+floats. Results are written into caller supplied buffers, so that no numpy arrays are
+allocated per call."""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# constants closer than this to 0 or +-1 are treated as exact
+_SNAP_TOL = 1e-12
+
+
+def _snap(v: float) -> float:
+    for c in (0.0, 1.0, -1.0):
+        if abs(v - c) < _SNAP_TOL:
+            return c
+    return float(v)
+
+
+def _is_const(x) -> bool:
+    return isinstance(x, float)
+
+
+def _paren(x: str) -> str:
+    return f"({x})" if " " in x else x
+
+
+def _neg(x):
+    if _is_const(x):
+        return -x if x != 0 else 0.0
+    if x.startswith("-") and " " not in x:
+        return x[1:]
+    return f"-{_paren(x)}"
+
+
+def _mul(x, y):
+    if _is_const(x) and _is_const(y):
+        return x * y
+    if _is_const(y):
+        x, y = y, x
+    if _is_const(x):
+        if x == 0:
+            return 0.0
+        if x == 1:
+            return y
+        if x == -1:
+            return _neg(y)
+        return f"{x!r} * {_paren(y)}"
+    return f"{_paren(x)} * {_paren(y)}"
+
+
+def _add(*terms):
+    const = sum(t for t in terms if _is_const(t))
+    exprs = [t for t in terms if not _is_const(t)]
+    if const != 0:
+        exprs.append(repr(const))
+    if len(exprs) == 0:
+        return 0.0
+    out = exprs[0]
+    for t in exprs[1:]:
+        out += f" - {t[1:]}" if t.startswith("-") else f" + {t}"
+    return out
+
+
+def _joint_cos_sin(i: int, offset: float) -> tuple[str, str, list[str]]:
+    """Return expressions for cos and sin of (q_i + offset) and lines computing them.
+    Offsets that are multiples of 90 degrees are folded into the expressions."""
+    lines = [f"    cq{i} = cos(q{i})", f"    sq{i} = sin(q{i})"]
+    k = offset / (np.pi / 2)
+    if abs(k - round(k)) < _SNAP_TOL:
+        c, s = [
+            (f"cq{i}", f"sq{i}"),
+            (f"-sq{i}", f"cq{i}"),
+            (f"-cq{i}", f"-sq{i}"),
+            (f"sq{i}", f"-cq{i}"),
+        ][int(round(k)) % 4]
+        return c, s, lines
+    lines = [
+        f"    cq{i} = cos(q{i} + {float(offset)!r})",
+        f"    sq{i} = sin(q{i} + {float(offset)!r})",
+    ]
+    return f"cq{i}", f"sq{i}", lines
+
+
+def _link_matrix(c: str, s: str, d: float, a: float, alpha: float) -> list[list]:
+    """Symbolic 3x4 upper part of the DH transformation tz @ rz @ tx @ rx."""
+    ca, sa = _snap(np.cos(alpha)), _snap(np.sin(alpha))
+    d, a = _snap(d), _snap(a)
+    return [
+        [c, _mul(_neg(s), ca), _mul(s, sa), _mul(c, a)],
+        [s, _mul(c, ca), _mul(_neg(c), sa), _mul(s, a)],
+        [0.0, sa, ca, d],
+    ]
+
+
+def _generate_source(dh_d, dh_a, dh_alpha, dh_offset) -> str:
+    """Generate source code of functions fk_into(out, q) and rot03(q0, q1, q2)."""
+    n = len(dh_d)
+    counter = [0]
+
+    def chain(num_links: int, lines: list[str]) -> list[list]:
+        pose = None
+        for i in range(num_links):
+            c, s, cs_lines = _joint_cos_sin(i, dh_offset[i])
+            lines.extend(cs_lines)
+            link = _link_matrix(c, s, dh_d[i], dh_a[i], dh_alpha[i])
+            if pose is None:
+                pose = link
+                continue
+            new_pose = [[None] * 4 for _ in range(3)]
+            for r in range(3):
+                for col in range(4):
+                    terms = [_mul(pose[r][k], link[k][col]) for k in range(3)]
+                    if col == 3:
+                        terms.append(pose[r][3])
+                    expr = _add(*terms)
+                    if not _is_const(expr) and not expr.isidentifier():
+                        name = f"t{counter[0]}"
+                        counter[0] += 1
+                        lines.append(f"    {name} = {expr}")
+                        expr = name
+                    new_pose[r][col] = expr
+            pose = new_pose
+        return pose
+
+    args = ", ".join(f"q{i}" for i in range(n))
+    fk_lines = ["def fk_into(out, q):", f"    {args}, = q"]
+    pose = chain(n, fk_lines)
+    for r, row in enumerate(pose + [[0.0, 0.0, 0.0, 1.0]]):
+        fk_lines.extend(f"    out[{r}, {c}] = {v}" for c, v in enumerate(row))
+    fk_lines.append("    return out")
+
+    rot_lines = ["def rot03(q0, q1, q2):"]
+    rot = chain(3, rot_lines)
+    values = [rot[r][c] for r in range(3) for c in range(3)]
+    rot_lines.append(f"    return ({', '.join(str(v) for v in values)})")
+    return "\n".join(fk_lines + [""] + rot_lines) + "\n"
+
+
+def _write_row(out: np.ndarray, i: int, values: tuple) -> None:
+    """Write @param values into row @param i of @param out element by element, which
+    avoids a temporary array created by the row assignment."""
+    for j, v in enumerate(values):
+        out[i, j] = v
+
+
+def _isclose(a: float, b: float) -> bool:
+    """Scalar equivalent of np.isclose with default tolerances."""
+    return abs(a - b) <= 1e-8 + 1e-5 * abs(b)
+
+
+class KinematicsKernel:
+    """Closed-form FK/IK of a CRS robot compiled from its DH parameters. Use
+    KinematicsKernel.for_robot to obtain a kernel shared by all robots of the model."""
+
+    def __init__(self, dh_d, dh_a, dh_alpha, dh_offset):
+        super().__init__()
+        self.dh_d = tuple(float(v) for v in dh_d)
+        self.dh_a = tuple(float(v) for v in dh_a)
+        self.dh_alpha = tuple(float(v) for v in dh_alpha)
+        self.dh_offset = tuple(float(v) for v in dh_offset)
+        assert len(self.dh_d) == 6, "Kernel supports only six joint robots."
+
+        self.source = _generate_source(
+            self.dh_d, self.dh_a, self.dh_alpha, self.dh_offset
+        )
+        namespace = {"cos": math.cos, "sin": math.sin}
+        exec(compile(self.source, "<ctu_crs kinematics kernel>", "exec"), namespace)
+        self._fk_into = namespace["fk_into"]
+        self._rot03 = namespace["rot03"]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _for_parameters(dh_d, dh_a, dh_alpha, dh_offset) -> KinematicsKernel:
+        return KinematicsKernel(dh_d, dh_a, dh_alpha, dh_offset)
+
+    @staticmethod
+    def for_robot(robot) -> KinematicsKernel:
+        """Return kernel for the DH parameters of the given @param robot. Kernels are
+        cached, i.e. the code generation runs once per robot model."""
+        return KinematicsKernel._for_parameters(
+            tuple(float(v) for v in robot.dh_d),
+            tuple(float(v) for v in robot.dh_a),
+            tuple(float(v) for v in robot.dh_alpha),
+            tuple(float(v) for v in robot.dh_offset),
+        )
+
+    def fk_into(self, out: np.ndarray, q) -> np.ndarray:
+        """Compute forward kinematics for joint configuration @param q and write the
+        4x4 SE3 matrix into preallocated @param out. Returns @param out."""
+        return self._fk_into(out, q)
+
+    def ik_into(self, out: np.ndarray, mask: np.ndarray, pose: np.ndarray) -> int:
+        """Compute inverse kinematics for 4x4 @param pose. Solutions are written into
+        preallocated (8, 6) array @param out and their validity into boolean (8,)
+        array @param mask using the same layout as CRSRobot.ik_batch. Returns the
+        number of valid solutions."""
+        d, a = self.dh_d, self.dh_a
+        (
+            (r00, r01, r02, px),
+            (r10, r11, r12, py),
+            (r20, r21, r22, pz),
+            _,
+        ) = pose.tolist()
+        x = px - d[5] * r02
+        y = py - d[5] * r12
+        b = pz - d[5] * r22 - d[0]
+        a1, d3 = a[1], d[3]
+        max_c = d3 + a1
+
+        out.fill(0.0)
+        mask.fill(False)
+
+        # solutions for the first three joints, same branches as _ik_flange_pos
+        arm = []
+        if _isclose(x, 0) and _isclose(y, 0):  # last link pointing up
+            if _isclose(b, max_c):
+                arm.append((0, (0.0, 0.0, 0.0)))
+            elif b > d[0]:
+                arg1 = (a1**2 + b**2 - d3**2) / (2 * a1 * b)
+                arg2 = (a1**2 + d3**2 - b**2) / (2 * a1 * d3)
+                if abs(arg1) <= 1.0 and abs(arg2) <= 1.0:
+                    th2 = -math.acos(arg1)
+                    th3 = math.pi - math.acos(arg2)
+                    arm.append((0, (0.0, th2, th3)))
+                    arm.append((1, (0.0, -th2, -th3)))
+        else:
+            c = math.sqrt(b**2 + x**2 + y**2)
+            t1p, t1n = math.atan2(y, x), math.atan2(-y, -x)
+            if _isclose(c, max_c):
+                tmp = -math.pi / 2 + math.asin(b / c)
+                arm.append((0, (t1p, tmp, 0.0)))
+                arm.append((1, (t1n, -tmp, 0.0)))
+            elif c < max_c:
+                arg_c = (a1**2 + c**2 - d3**2) / (2 * a1 * c)
+                arg_3 = (a1**2 + d3**2 - c**2) / (2 * a1 * d3)
+                if abs(arg_c) <= 1.0 and abs(arg_3) <= 1.0:
+                    acos_c = math.acos(arg_c)
+                    asin_b = math.asin(b / c)
+                    base = math.pi / 2 - asin_b + acos_c
+                    th2_1 = math.atan2(math.sin(base), math.cos(base))
+                    th2_2 = -math.pi / 2 + asin_b + acos_c
+                    th3 = math.pi - math.acos(arg_3)
+                    arm.append((0, (t1p, -th2_1, th3)))
+                    arm.append((1, (t1n, th2_1, -th3)))
+                    arm.append((2, (t1p, th2_2, -th3)))
+                    arm.append((3, (t1n, -th2_2, th3)))
+
+        count = 0
+        for k, (q0, q1, q2) in arm:
+            o00, o01, o02, o10, o11, o12, o20, o21, o22 = self._rot03(q0, q1, q2)
+            # P = rot_03.T @ rot
+            p00 = o00 * r00 + o10 * r10 + o20 * r20
+            p02 = o00 * r02 + o10 * r12 + o20 * r22
+            p10 = o01 * r00 + o11 * r10 + o21 * r20
+            p12 = o01 * r02 + o11 * r12 + o21 * r22
+            p20 = o02 * r00 + o12 * r10 + o22 * r20
+            p21 = o02 * r01 + o12 * r11 + o22 * r21
+            p22 = o02 * r02 + o12 * r12 + o22 * r22
+            if _isclose(p22, 1):
+                _write_row(out, 2 * k, (q0, q1, q2, 0.0, 0.0, math.atan2(p10, p00)))
+                mask[2 * k] = True
+                count += 1
+            elif _isclose(p22, -1):
+                _write_row(
+                    out, 2 * k, (q0, q1, q2, 0.0, math.pi, math.atan2(p10, -p00))
+                )
+                mask[2 * k] = True
+                count += 1
+            else:
+                theta5 = math.acos(max(-1.0, min(1.0, p22)))
+                t4, t6 = math.atan2(p12, p02), math.atan2(p21, -p20)
+                _write_row(out, 2 * k, (q0, q1, q2, t4, -theta5, t6))
+                t4, t6 = math.atan2(-p12, -p02), math.atan2(-p21, p20)
+                _write_row(out, 2 * k + 1, (q0, q1, q2, t4, theta5, t6))
+                mask[2 * k] = True
+                mask[2 * k + 1] = True
+                count += 2
+        return count
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Thread safe access to the MARS control unit."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import threading
+
+from ctu_crs.instrumentation import command_name
+
+
+class LockedMars:
+    """Proxy of MarsControlUnit that executes every method call under a reentrant
+    lock, so that e.g. a query of a background thread cannot interleave with a query
+    of the main thread on the serial line. Sequences of calls that must not be
+    interleaved (a command followed by reading its reply) are to be wrapped in
+    'with proxy.lock:'."""
+
+    def __init__(self, mars):
+        super().__init__()
+        self._target = mars
+        self.lock = threading.RLock()
+        # MarsStats recording the calls if set, see MarsStats.attach
+        self.stats = None
+
+    @property
+    def target(self):
+        """The wrapped control unit."""
+        return self._target
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def locked(*args, **kwargs):
+            with self.lock:
+                stats = self.stats
+                if stats is None:
+                    return attr(*args, **kwargs)
+                key = name
+                if name == "send_cmd" and args:
+                    key = f"send_cmd {command_name(args[0])}"
+                return stats.call(key, attr, *args, **kwargs)
+
+        return locked
+
+
+def mars_lock(mars):
+    """Return the lock of @param mars if it is LockedMars or a no-op context."""
+    lock = getattr(mars, "lock", None)
+    return lock if lock is not None else contextlib.nullcontext()
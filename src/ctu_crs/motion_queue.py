@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Queue of motion targets streamed to the coordinated movement queue of the control
+unit by a background worker.
+
+The worker resolves joint configurations (IK of Cartesian targets, the IK branch is
+the closest one to the previous target) a few targets ahead while the robot moves and
+sends the next coordinated movement as soon as the queue of the control unit accepts
+it. Targets with blend=True are passed through without waiting for the robot to stop;
+after a target with blend=False the worker waits until the robot stops before sending
+the next one. Gripper actions in the queue start when the arm is predicted to reach
+the preceding target, while the worker keeps sending the next arm targets.
+
+The worker does not poll the control unit while the robot moves: it sleeps until the
+predicted end of the movements (see ctu_crs.completion) and only then queries the
+state, backing off exponentially while the prediction is late. The number of sent
+movements that are predicted to be still queued by the control unit is limited by
+max_queued."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.gripper import GripperAction
+from ctu_crs.response_parser import check_ready
+
+
+@dataclass
+class MotionTarget:
+    """Target of the motion queue; pose is resolved into q by the look-ahead. Target
+    with gripper action does not move the arm."""
+
+    q: np.ndarray | None = None
+    pose: np.ndarray | None = None
+    blend: bool = False
+    min_time: float | None = None
+    gripper: GripperAction | None = None
+    # q was resolved and checked against the limits and collisions
+    validated: bool = False
+
+
+class MotionQueue:
+    def __init__(self, robot, lookahead: int = 4, max_queued: int = 8):
+        """
+        :param robot: Initialized CRSRobot.
+        :param lookahead: Number of targets resolved ahead of the one being sent.
+        :param max_queued: Maximal number of sent movements that are predicted to
+          be unfinished; it must not exceed the coordinated movement queue of the
+          control unit.
+        """
+        super().__init__()
+        self._robot = robot
+        self.lookahead = lookahead
+        self.max_queued = max_queued
+        self._pending: deque[MotionTarget] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._error: Exception | None = None
+        self._q_ref: np.ndarray | None = None
+        self._stop_required = False
+        # predicted end of the last sent movement and scheduled gripper actions
+        self._arrival = 0.0
+        self._actions: list[tuple[float, GripperAction]] = []
+        # predicted ends of the sent movements that may be still queued
+        self._queued: deque[float] = deque()
+        self.sent = 0
+        self._thread = threading.Thread(
+            target=self._run, name="crs-motion", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> MotionQueue:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.wait()
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of targets not sent to the control unit yet."""
+        return len(self._pending)
+
+    def _put(self, target: MotionTarget):
+        with self._cond:
+            assert not self._closed, "Motion queue is closed."
+            self._raise_error()
+            self._pending.append(target)
+            self._cond.notify_all()
+
+    def move_to_q(
+        self, q: ArrayLike, blend: bool = False, min_time: float | None = None
+    ):
+        """Append joint space target @param q [rad]. If @param blend is set, the robot
+        does not stop at the target unless it is the last one. The motion to the
+        target takes at least @param min_time [s] if given."""
+        self._put(
+            MotionTarget(q=np.asarray(q, dtype=float), blend=blend, min_time=min_time)
+        )
+
+    def move_to_pose(
+        self, pose: np.ndarray, blend: bool = False, min_time: float | None = None
+    ):
+        """Append Cartesian target @param pose (4x4 SE3 of the end-effector); IK
+        solution closest to the previous target is used. See move_to_q."""
+        pose = np.asarray(pose, dtype=float)
+        self._put(MotionTarget(pose=pose, blend=blend, min_time=min_time))
+
+    def gripper(self, position: float) -> GripperAction:
+        """Append gripper command to absolute @param position, e.g. to open the
+        gripper on the approach. It starts when the arm reaches the previous target
+        without stopping the arm. Returns handle of the gripper action."""
+        action = GripperAction(self._robot.gripper, position)
+        self._put(MotionTarget(gripper=action))
+        return action
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until all targets were sent, the robot stopped and the gripper
+        actions finished. Raises exception
+        of the worker, e.g. if IK of a target does not exist. Returns False on
+        timeout."""
+        with self._cond:
+            done = self._cond.wait_for(
+                lambda: self._error is not None
+                or (not self._pending and not self._busy),
+                timeout,
+            )
+            self._raise_error()
+        return done
+
+    def close(self):
+        """Stop the worker; targets that were not sent are dropped."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _resolve(self, target: MotionTarget, q_ref: np.ndarray) -> np.ndarray:
+        """Compute and validate joint configuration of @param target."""
+        r = self._robot
+        if target.gripper is not None:
+            return q_ref
+        if target.validated:
+            return target.q
+        if target.q is None:
+            target.q = r.ik_closest(target.pose, q_ref)
+            if target.q is None:
+                raise ValueError(f"No IK solution within limits for\n{target.pose}")
+        assert r.in_limits(target.q), "Joint limits violated."
+        if r.collision_model is not None:
+            assert not r.collision_model.in_collision(target.q)[
+                0
+            ], "Target in collision."
+        target.validated = True
+        return target.q
+
+    def _lookahead(self):
+        """Resolve configurations of the next few pending targets."""
+        q_ref = self._q_ref
+        for target in list(self._pending)[: self.lookahead + 1]:
+            q_ref = self._resolve(target, q_ref)
+
+    def _service_actions(self) -> float:
+        """Start gripper actions that are due and poll the running ones. Returns the
+        monotonic time when the actions need to be served next."""
+        now = time.monotonic()
+        wake = float("inf")
+        for item in list(self._actions):
+            start, action = item
+            if action.started is None and now >= start:
+                action.start()
+            if action.started is None:
+                wake = min(wake, start)
+            elif action.poll():
+                self._actions.remove(item)
+            else:
+                wake = min(wake, now + self._robot.gripper.gripper_poll_interval)
+        return wake
+
+    def _wait_until(self, condition, predicted: float, interrupt=None) -> bool:
+        """Wait until @param condition holds, serving the gripper actions and
+        resolving the look-ahead in between. The condition queries the control unit,
+        so it is evaluated only from shortly before the @param predicted monotonic
+        time and then with exponential backoff, see MotionCompletion. The wait ends
+        also when @param interrupt holds, e.g. when a new target is appended.
+        Returns whether the condition holds."""
+        c = self._robot.completion
+        check = predicted - c.margin
+        period = c.min_poll
+        while True:
+            wake = self._service_actions()
+            now = time.monotonic()
+            if now >= check:
+                if condition():
+                    return True
+                check = now + period
+                period = min(period * c.backoff, c.max_poll)
+            with self._cond:
+                if self._closed or (interrupt is not None and interrupt()):
+                    return False
+                self._lookahead()
+                self._cond.wait(max(min(check, wake) - time.monotonic(), 0.0))
+
+    def _wait_for_queue(self):
+        """Wait until the control unit accepts the next movement. The state of the
+        queue is queried only if max_queued movements are predicted to be queued."""
+        r = self._robot
+        now = time.monotonic()
+        while self._queued and self._queued[0] <= now:
+            self._queued.popleft()
+        if len(self._queued) < self.max_queued:
+            return
+        self._wait_until(
+            lambda: check_ready(r._mars, for_coordmv_queue=True), self._queued[0]
+        )
+        self._queued.popleft()
+
+    def _run(self):
+        r = self._robot
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._pending)
+                if self._closed:
+                    return
+                self._busy = True
+            try:
+                if self._q_ref is None:
+                    self._q_ref = r.get_q()
+                    if not r.in_motion():
+                        r.completion.seed(r._joint_values_to_irc(self._q_ref))
+                with self._cond:
+                    self._lookahead()
+                    arm = self._pending[0].gripper is None
+                if arm and self._stop_required:
+                    self._wait_until(
+                        lambda: not r.in_motion(), r.completion.predicted_end
+                    )
+                    self._queued.clear()
+                if arm:
+                    self._wait_for_queue()
+                with self._cond:
+                    if self._closed:
+                        return
+                    target = self._pending.popleft()
+                if target.gripper is not None:
+                    self._actions.append((self._arrival, target.gripper))
+                    self._service_actions()
+                else:
+                    irc = r._joint_values_to_irc(target.q)
+                    self._arrival = r._coordmv(irc, min_time=target.min_time)
+                    self._queued.append(self._arrival)
+                    self.sent += 1
+                    self._q_ref = target.q
+                    self._stop_required = not target.blend
+                if not self._pending and self._wait_until(
+                    lambda: not self._actions and not r.in_motion(),
+                    r.completion.predicted_end,
+                    interrupt=lambda: self._pending,
+                ):
+                    self._stop_required = False
+                    self._queued.clear()
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._pending.clear()
+                    self._actions.clear()
+            with self._cond:
+                self._busy = bool(self._pending)
+                self._cond.notify_all()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Probabilistic roadmap (PRM) planner in the joint space of the robot.
+
+The roadmap is built once per robot model against the static part of the environment
+(table and self-collisions) and stored in a .npz file. Queries are answered by
+Dijkstra search on the stored graph; obstacles added later (e.g. plates) are handled
+lazily, i.e. only nodes and edges on the candidate paths are checked and the search is
+repeated without the colliding ones. Edge costs are motion times at the default speed,
+see CRSRobot.motion_time."""
+
+from __future__ import annotations
+
+import heapq
+import warnings
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.cache import write_atomic
+from ctu_crs.collision import CollisionModel
+from ctu_crs.timing import speed_to_rad_per_s
+
+_UNKNOWN, _VALID, _INVALID = 0, 1, -1
+
+
+def _robot_fingerprint(robot) -> bytes:
+    """Bytes identifying kinematics, joint limits and link dimensions of the robot."""
+    dims = [robot.gripper_length, robot.finger_length]
+    return (
+        robot._kinematics_fingerprint()
+        + np.concatenate(
+            [robot.q_min, robot.q_max, robot.link_lengths, dims], dtype=float
+        ).tobytes()
+    )
+
+
+def _time_weights(robot) -> np.ndarray:
+    """Inverse of the default joint speeds; weighted Chebyshev distance of joint
+    configurations is then the motion time used by CRSRobot.motion_time."""
+    return 1.0 / speed_to_rad_per_s(robot, robot._default_speed_irc256_per_ms)
+
+
+class Roadmap:
+    def __init__(
+        self,
+        nodes: np.ndarray,
+        edges: np.ndarray,
+        costs: np.ndarray,
+        robot_fingerprint: bytes,
+        collision_fingerprint: bytes,
+    ):
+        """
+        :param nodes: (N, 6) collision free joint configurations.
+        :param edges: (M, 2) indices of nodes connected by collision free edges.
+        :param costs: (M,) motion time of the edges.
+        :param robot_fingerprint: Identification of the robot the map was built for.
+        :param collision_fingerprint: Identification of the collision model the nodes
+          and edges were validated with.
+        """
+        super().__init__()
+        self.nodes = np.asarray(nodes, dtype=float)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.costs = np.asarray(costs, dtype=float)
+        self.robot_fingerprint = robot_fingerprint
+        self.collision_fingerprint = collision_fingerprint
+
+        # adjacency in compressed sparse row format; every edge is stored twice
+        src = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        order = np.argsort(src, kind="stable")
+        self._adj_node = np.concatenate([self.edges[:, 1], self.edges[:, 0]])[order]
+        self._adj_edge = np.tile(np.arange(len(self.edges)), 2)[order]
+        self._indptr = np.searchsorted(src[order], np.arange(len(self.nodes) + 1))
+
+    def neighbors(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return indices of nodes adjacent to @param node and of the edges to them."""
+        s = slice(self._indptr[node], self._indptr[node + 1])
+        return self._adj_node[s], self._adj_edge[s]
+
+    @classmethod
+    def build(
+        cls,
+        robot,
+        collision_model: CollisionModel,
+        n_samples: int = 1000,
+        k: int = 10,
+        resolution: float = 0.05,
+        seed: int | None = 0,
+        chunk_size: int = 512,
+    ) -> Roadmap:
+        """Sample @param n_samples collision free configurations within joint limits
+        and connect each of them to its @param k nearest neighbours (in motion time)
+        by straight edges validated with @param resolution [rad]."""
+        rng = np.random.default_rng(seed)
+        nodes = np.empty((0, len(robot.q_min)))
+        while len(nodes) < n_samples:
+            q = rng.uniform(
+                robot.q_min, robot.q_max, size=(n_samples, len(robot.q_min))
+            )
+            nodes = np.concatenate([nodes, q[~collision_model.in_collision(q)]])
+        nodes = nodes[:n_samples]
+
+        w = _time_weights(robot)
+        k = min(k, n_samples - 1)
+        pairs = []
+        for i in range(0, n_samples, chunk_size):
+            d = np.max(np.abs(nodes[i : i + chunk_size, None] - nodes) * w, axis=-1)
+            d[np.arange(len(d)), np.arange(i, i + len(d))] = np.inf
+            nn = np.argpartition(d, k - 1, axis=-1)[:, :k]
+            src = np.repeat(np.arange(i, i + len(d)), k)
+            pairs.append(np.stack([src, nn.ravel()], axis=-1))
+        edges = np.unique(np.sort(np.concatenate(pairs), axis=-1), axis=0)
+
+        free = np.ones(len(edges), dtype=bool)
+        for i in range(0, len(edges), chunk_size):
+            e = edges[i : i + chunk_size]
+            free[i : i + chunk_size] = ~collision_model.edges_in_collision(
+                nodes[e[:, 0]], nodes[e[:, 1]], resolution
+            )
+        edges = edges[free]
+        costs = np.max(np.abs(nodes[edges[:, 0]] - nodes[edges[:, 1]]) * w, axis=-1)
+        return cls(
+            nodes,
+            edges,
+            costs,
+            _robot_fingerprint(robot),
+            collision_model.fingerprint(),
+        )
+
+    def is_compatible(self, robot) -> bool:
+        """Return whether the roadmap was built for the kinematics and limits of
+        @param robot."""
+        return self.robot_fingerprint == _robot_fingerprint(robot)
+
+    def save(self, path: str | Path):
+        """Save roadmap to .npz file @param path, the file is replaced atomically."""
+        write_atomic(
+            path,
+            lambda f: np.savez(
+                f,
+                nodes=self.nodes,
+                edges=self.edges,
+                costs=self.costs,
+                robot_fingerprint=np.frombuffer(self.robot_fingerprint, np.uint8),
+                collision_fingerprint=np.frombuffer(
+                    self.collision_fingerprint, np.uint8
+                ),
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> Roadmap:
+        """Load roadmap saved by save."""
+        with np.load(path) as data:
+            return cls(
+                data["nodes"],
+                data["edges"],
+                data["costs"],
+                data["robot_fingerprint"].tobytes(),
+                data["collision_fingerprint"].tobytes(),
+            )
+
+    @classmethod
+    def load_or_build(
+        cls,
+        robot,
+        collision_model: CollisionModel,
+        path: str | Path | None = None,
+        **kwargs,
+    ) -> Roadmap:
+        """Load roadmap from @param path or build (and save) it if it does not exist
+        or was built for a different robot or collision model. See build for the
+        other arguments."""
+        if path is not None and Path(path).exists():
+            roadmap = cls.load(path)
+            if (
+                roadmap.is_compatible(robot)
+                and roadmap.collision_fingerprint == collision_model.fingerprint()
+            ):
+                return roadmap
+        roadmap = cls.build(robot, collision_model, **kwargs)
+        roadmap.try_save(path)
+        return roadmap
+
+    def try_save(self, path: str | Path | None):
+        """Save the roadmap if @param path is given; a failure to write it is reported
+        by a warning, the roadmap is then rebuilt by the next process."""
+        if path is None:
+            return
+        try:
+            self.save(path)
+        except OSError as e:
+            warnings.warn(f"Cannot save roadmap to {path}: {e}", RuntimeWarning)
+
+
+class RoadmapPlanner:
+    def __init__(
+        self,
+        robot,
+        roadmap: Roadmap,
+        collision_model: CollisionModel,
+        k: int = 10,
+        resolution: float = 0.05,
+        seed: int | None = None,
+    ):
+        """
+        :param robot: CRSRobot the roadmap was built for.
+        :param roadmap: Roadmap searched by the planner.
+        :param collision_model: Current collision model; it may contain obstacles
+          that were not present when the roadmap was built.
+        :param k: Number of nearest roadmap nodes the query configurations are
+          connected to.
+        :param resolution: Resolution [rad] of the edge collision checks.
+        :param seed: Seed of the random generator used by shortcutting.
+        """
+        super().__init__()
+        assert roadmap.is_compatible(robot), "Roadmap was built for another robot."
+        self._robot = robot
+        self.roadmap = roadmap
+        self.collision_model = collision_model
+        self.k = k
+        self.resolution = resolution
+        self._rng = np.random.default_rng(seed)
+        self._w = _time_weights(robot)
+        self._fingerprint: bytes | None = None
+        self._node_valid = np.ones(len(roadmap.nodes), dtype=bool)
+        self._edge_state = np.full(len(roadmap.edges), _VALID, dtype=np.int8)
+
+    def _sync_validity(self):
+        """Reset the lazy validity of nodes and edges if obstacles have changed."""
+        fingerprint = self.collision_model.fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        rm = self.roadmap
+        if fingerprint == rm.collision_fingerprint:
+            self._node_valid[:] = True
+            self._edge_state[:] = _VALID
+            return
+        self._node_valid = ~self.collision_model.in_collision(rm.nodes)
+        valid = self._node_valid[rm.edges].all(axis=-1)
+        self._edge_state = np.where(valid, _UNKNOWN, _INVALID).astype(np.int8)
+
+    def cost(self, q_from: ArrayLike, q_to: ArrayLike) -> np.ndarray:
+        """Motion time between configurations of shape (..., 6)."""
+        return np.max(np.abs(np.asarray(q_to) - q_from) * self._w, axis=-1)
+
+    def _connect(self, q: np.ndarray) -> dict[int, float]:
+        """Connect @param q to its nearest valid roadmap nodes. Returns mapping from
+        the node index to the cost of the collision free edges."""
+        nodes = self.roadmap.nodes
+        candidates = np.flatnonzero(self._node_valid)
+        if len(candidates) == 0:
+            return {}
+        d = self.cost(q, nodes[candidates])
+        k = min(self.k, len(candidates))
+        nn = candidates[np.argpartition(d, k - 1)[:k]]
+        q_from = np.repeat(q[np.newaxis], len(nn), axis=0)
+        collision = self.collision_model.edges_in_collision(
+            q_from, nodes[nn], self.resolution
+        )
+        return {int(n): float(self.cost(q, nodes[n])) for n in nn[~collision]}
+
+    def _search(
+        self, start: dict[int, float], goal: dict[int, float]
+    ) -> list[int] | None:
+        """Dijkstra search from the virtual start connected to the @param start nodes
+        to the virtual goal connected to the @param goal nodes. Edges known to be in
+        collision are skipped. Returns list of roadmap nodes or None."""
+        rm = self.roadmap
+        dist = dict(start)
+        parent: dict[int, int] = {n: -1 for n in start}
+        heap = [(c, n) for n, c in start.items()]
+        heapq.heapify(heap)
+        best, best_node = np.inf, None
+        done = set()
+        while heap:
+            c, u = heapq.heappop(heap)
+            if c >= best:
+                break
+            if u in done:
+                continue
+            done.add(u)
+            if u in goal and c + goal[u] < best:
+                best, best_node = c + goal[u], u
+            adj_node, adj_edge = rm.neighbors(u)
+            for v, e in zip(adj_node, adj_edge):
+                if self._edge_state[e] == _INVALID:
+                    continue
+                cv = c + rm.costs[e]
+                if cv < dist.get(v, np.inf):
+                    dist[v], parent[v] = cv, u
+                    heapq.heappush(heap, (cv, int(v)))
+        if best_node is None:
+            return None
+        path = [best_node]
+        while parent[path[-1]] >= 0:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def _validate_path(self, path: list[int]) -> bool:
+        """Check the edges of roadmap @param path whose validity is not known yet.
+        Returns whether the whole path is collision free."""
+        rm = self.roadmap
+        edges = []
+        for u, v in zip(path[:-1], path[1:]):
+            adj_node, adj_edge = rm.neighbors(u)
+            edges.append(adj_edge[adj_node == v][0])
+        edges = np.array(edges, dtype=np.int64)
+        unknown = edges[self._edge_state[edges] == _UNKNOWN]
+        if len(unknown) > 0:
+            e = rm.edges[unknown]
+            collision = self.collision_model.edges_in_collision(
+                rm.nodes[e[:, 0]], rm.nodes[e[:, 1]], self.resolution
+            )
+            self._edge_state[unknown] = np.where(collision, _INVALID, _VALID)
+        return bool(np.all(self._edge_state[edges] == _VALID))
+
+    def plan(
+        self, q_start: ArrayLike, q_goal: ArrayLike, shortcut_iterations: int = 100
+    ) -> list[np.ndarray] | None:
+        """Plan collision free path from @param q_start to @param q_goal. Returns list
+        of joint configurations starting with q_start and ending with q_goal, that can
+        be passed to CRSRobot.move_to_q, or None if no path was found."""
+        q_start = np.asarray(q_start, dtype=float)
+        q_goal = np.asarray(q_goal, dtype=float)
+        if np.any(self.collision_model.in_collision(np.stack([q_start, q_goal]))):
+            return None
+        if not self.collision_model.path_in_collision(
+            [q_start, q_goal], self.resolution
+        ):
+            return [q_start, q_goal]
+
+        self._sync_validity()
+        start, goal = self._connect(q_start), self._connect(q_goal)
+        while True:
+            nodes = self._search(start, goal)
+            if nodes is None:
+                return None
+            if self._validate_path(nodes):
+                break
+        path = [q_start] + list(self.roadmap.nodes[nodes]) + [q_goal]
+        return self.shortcut(path, shortcut_iterations)
+
+    def shortcut(
+        self, path: list[np.ndarray], iterations: int = 100
+    ) -> list[np.ndarray]:
+        """Shorten @param path by replacing its random sub-paths by straight edges if
+        they are collision free and faster."""
+        path = list(path)
+        for _ in range(iterations):
+            if len(path) < 3:
+                break
+            i, j = np.sort(self._rng.choice(len(path), size=2, replace=False))
+            if j - i < 2:
+                continue
+            sub = np.array(path[i : j + 1])
+            direct = self.cost(path[i], path[j])
+            if direct >= np.sum(self.cost(sub[:-1], sub[1:])):
+                continue
+            if not self.collision_model.path_in_collision(
+                [path[i], path[j]], self.resolution
+            ):
+                path = path[: i + 1] + path[j:]
+        return path
+
+    def path_duration(self, path: list[np.ndarray]) -> float:
+        """Motion time of @param path, i.e. sum of the motion times of its segments."""
+        path = np.asarray(path)
+        return float(np.sum(self.cost(path[:-1], path[1:])))
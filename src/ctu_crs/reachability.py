@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Precomputed voxel map of the reachable workspace of the robot.
+
+Every voxel stores the number of IK solutions within joint limits (summed over a set
+of tool orientations), the best distance [rad] of a solution to the joint limits
+saturated at score_cap, and the envelope of all IK solutions regardless of limits. The
+envelope allows to rebuild only the voxels affected by a change of joint limits.
+
+The voxel data are stored in a memory-mappable .npy file; grid parameters and the
+robot parameters the map was computed for are stored in a .npz file next to it. Both
+files are replaced atomically when the map is saved (see ctu_crs.cache)."""
+
+from __future__ import annotations
+
+import warnings
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.cache import write_atomic
+
+VOXEL_DTYPE = np.dtype(
+    [
+        ("count", np.uint16),
+        ("score", np.float32),
+        ("q_lo", np.float32, (6,)),
+        ("q_hi", np.float32, (6,)),
+    ]
+)
+
+
+def default_orientations() -> np.ndarray:
+    """Tool pointing downwards rotated about the vertical axis by 0, 90, 180 and 270
+    degrees. Returns (4, 3, 3) array of rotation matrices."""
+    rots = []
+    for yaw in np.deg2rad([0, 90, 180, 270]):
+        c, s = np.cos(yaw), np.sin(yaw)
+        rz = np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+        rots.append(rz @ np.diag([1.0, -1.0, -1.0]))
+    return np.array(rots)
+
+
+def _dh_vector(robot) -> np.ndarray:
+    return np.concatenate(
+        [robot.dh_d, robot.dh_a, robot.dh_alpha, robot.dh_offset]
+    ).astype(float)
+
+
+class ReachabilityMap:
+    def __init__(
+        self,
+        origin: ArrayLike,
+        voxel_size: float,
+        voxels: np.ndarray,
+        orientations: np.ndarray,
+        q_min: ArrayLike,
+        q_max: ArrayLike,
+        dh: np.ndarray,
+        score_cap: float = 0.5,
+    ):
+        super().__init__()
+        self.origin = np.asarray(origin, dtype=float)
+        self.voxel_size = float(voxel_size)
+        self.voxels = voxels
+        self.orientations = np.asarray(orientations, dtype=float)
+        self.q_min = np.array(q_min, dtype=float)
+        self.q_max = np.array(q_max, dtype=float)
+        self._dh = np.asarray(dh, dtype=float)
+        self.score_cap = float(score_cap)
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return self.voxels.shape
+
+    @classmethod
+    def build(
+        cls,
+        robot,
+        voxel_size: float = 0.025,
+        orientations: ArrayLike | None = None,
+        bounds: ArrayLike | None = None,
+        score_cap: float = 0.5,
+    ) -> ReachabilityMap:
+        """Build the map for the given @param robot. The workspace is given by
+        @param bounds as [[xmin, ymin, zmin], [xmax, ymax, zmax]]; by default it is the
+        part of the sphere reachable by the tool that is above the base. Distance to
+        joint limits larger than @param score_cap [rad] is not distinguished."""
+        if orientations is None:
+            orientations = default_orientations()
+        if bounds is None:
+            reach = robot.dh_a[1] + robot.dh_d[3] + robot.dh_d[5]
+            bounds = [[-reach, -reach, 0.0], [reach, reach, robot.dh_d[0] + reach]]
+        bounds = np.asarray(bounds, dtype=float)
+        shape = tuple(np.ceil((bounds[1] - bounds[0]) / voxel_size).astype(int))
+        voxels = np.zeros(shape, dtype=VOXEL_DTYPE)
+        rmap = cls(
+            bounds[0],
+            voxel_size,
+            voxels,
+            orientations,
+            robot.q_min,
+            robot.q_max,
+            _dh_vector(robot),
+            score_cap,
+        )
+        rmap._evaluate(robot, np.arange(voxels.size))
+        return rmap
+
+    def is_compatible(self, robot) -> bool:
+        """Return whether the map was computed for the kinematics of @param robot,
+        i.e. whether it can be updated incrementally."""
+        dh = _dh_vector(robot)
+        return dh.shape == self._dh.shape and np.allclose(dh, self._dh)
+
+    def limits_equal(self, robot) -> bool:
+        """Return whether the map was computed for joint limits of @param robot."""
+        return np.array_equal(self.q_min, robot.q_min) and np.array_equal(
+            self.q_max, robot.q_max
+        )
+
+    def affected_voxels(self, q_min: ArrayLike, q_max: ArrayLike) -> np.ndarray:
+        """Return flat indices of voxels whose content may change if the joint limits
+        change from the ones stored in the map to @param q_min and @param q_max."""
+        q_lo = self.voxels["q_lo"].reshape(-1, 6)
+        q_hi = self.voxels["q_hi"].reshape(-1, 6)
+        affected = np.zeros(q_lo.shape[0], dtype=bool)
+        for old, new in [(self.q_min, q_min), (self.q_max, q_max)]:
+            for j in np.flatnonzero(~np.isclose(old, new, rtol=0, atol=1e-12)):
+                lo = min(old[j], new[j]) - self.score_cap
+                hi = max(old[j], new[j]) + self.score_cap
+                affected |= (q_lo[:, j] <= hi) & (q_hi[:, j] >= lo)
+        return np.flatnonzero(affected)
+
+    def update(self, robot) -> int:
+        """Update the map to the current joint limits of @param robot by rebuilding
+        affected voxels only. Returns the number of rebuilt voxels."""
+        assert self.is_compatible(robot), "Kinematics changed, rebuild the map."
+        indices = self.affected_voxels(robot.q_min, robot.q_max)
+        self.q_min = np.array(robot.q_min, dtype=float)
+        self.q_max = np.array(robot.q_max, dtype=float)
+        if len(indices) > 0:
+            if not self.voxels.flags.writeable:
+                self.voxels = np.array(self.voxels)
+            self._evaluate(robot, indices)
+        return len(indices)
+
+    def _evaluate(self, robot, indices: np.ndarray, chunk_size: int = 20000):
+        """Compute content of voxels given by flat @param indices."""
+        flat = self.voxels.reshape(-1)
+        k = len(self.orientations)
+        for start in range(0, len(indices), chunk_size):
+            idx = indices[start : start + chunk_size]
+            centers = self.voxel_centers(idx)
+            poses = np.zeros((len(idx), k, 4, 4))
+            poses[:, :, :3, :3] = self.orientations
+            poses[:, :, :3, 3] = centers[:, np.newaxis]
+            poses[:, :, 3, 3] = 1
+            sols, mask = robot.ik_batch(poses.reshape(-1, 4, 4))
+            sols = sols.reshape(len(idx), k * 8, 6)
+            mask = mask.reshape(len(idx), k * 8)
+
+            in_limits = (
+                mask
+                & np.all(sols >= self.q_min, axis=-1)
+                & np.all(sols <= self.q_max, axis=-1)
+            )
+            dist = np.min(np.minimum(sols - self.q_min, self.q_max - sols), axis=-1)
+            dist = np.minimum(dist, self.score_cap)
+            voxels = flat[idx]
+            voxels["count"] = np.sum(in_limits, axis=1)
+            voxels["score"] = np.max(np.where(in_limits, dist, 0.0), axis=1)
+            m = mask[..., np.newaxis]
+            # envelope rounded outwards to stay conservative in float32
+            q_lo = np.min(np.where(m, sols, np.inf), axis=1).astype(np.float32)
+            q_hi = np.max(np.where(m, sols, -np.inf), axis=1).astype(np.float32)
+            voxels["q_lo"] = np.nextafter(q_lo, np.float32(-np.inf))
+            voxels["q_hi"] = np.nextafter(q_hi, np.float32(np.inf))
+            flat[idx] = voxels
+
+    def voxel_centers(self, indices: np.ndarray) -> np.ndarray:
+        """Return (N, 3) centers of voxels given by flat @param indices."""
+        ijk = np.stack(np.unravel_index(indices, self.shape), axis=-1)
+        return self.origin + (ijk + 0.5) * self.voxel_size
+
+    def voxel_indices(self, points: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Return (N, 3) integer voxel indices of @param points and (N,) mask of points
+        that are inside the map."""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        ijk = np.floor((points - self.origin) / self.voxel_size).astype(int)
+        inside = np.all((ijk >= 0) & (ijk < self.shape), axis=1)
+        return np.where(inside[:, np.newaxis], ijk, 0), inside
+
+    def query(self, points: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Return number of IK solutions in limits and distance-to-limit score for each
+        of the (N, 3) @param points. Points outside of the map have zero count."""
+        ijk, inside = self.voxel_indices(points)
+        voxels = self.voxels[ijk[:, 0], ijk[:, 1], ijk[:, 2]]
+        counts = np.where(inside, voxels["count"], 0)
+        scores = np.where(inside, voxels["score"], 0.0)
+        return counts, scores
+
+    def reachable(self, points: ArrayLike, min_count: int = 1) -> np.ndarray:
+        """Return (N,) boolean mask of @param points reachable with at least
+        @param min_count IK solutions (over all tool orientations of the map)."""
+        return self.query(points)[0] >= min_count
+
+    @staticmethod
+    def _paths(path: str | Path) -> tuple[Path, Path]:
+        path = Path(path)
+        return path.with_suffix(".npy"), path.with_suffix(".npz")
+
+    def save(self, path: str | Path):
+        """Save voxels to @param path with .npy suffix and metadata to .npz file."""
+        voxels_path, meta_path = self._paths(path)
+        write_atomic(voxels_path, lambda f: np.save(f, self.voxels))
+        write_atomic(
+            meta_path,
+            lambda f: np.savez(
+                f,
+                origin=self.origin,
+                voxel_size=self.voxel_size,
+                orientations=self.orientations,
+                q_min=self.q_min,
+                q_max=self.q_max,
+                dh=self._dh,
+                score_cap=self.score_cap,
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path, mmap_mode: str | None = "r") -> ReachabilityMap:
+        """Load map saved by save; voxels are memory-mapped by default."""
+        voxels_path, meta_path = cls._paths(path)
+        with np.load(meta_path) as meta:
+            return cls(
+                meta["origin"],
+                float(meta["voxel_size"]),
+                np.load(voxels_path, mmap_mode=mmap_mode),
+                meta["orientations"],
+                meta["q_min"],
+                meta["q_max"],
+                meta["dh"],
+                float(meta["score_cap"]),
+            )
+
+    @classmethod
+    def load_or_build(cls, robot, path: str | Path | None = None) -> ReachabilityMap:
+        """Load map from @param path, update it to the current joint limits of
+        @param robot, or build it if it does not exist or the kinematics changed. The
+        map is saved back to @param path whenever it was modified."""
+        if path is None:
+            return cls.build(robot)
+        voxels_path, meta_path = cls._paths(path)
+        rmap = None
+        if voxels_path.exists() and meta_path.exists():
+            rmap = cls.load(path)
+            if not rmap.is_compatible(robot):
+                rmap = None
+        if rmap is None:
+            rmap = cls.build(robot)
+        elif rmap.limits_equal(robot):
+            return rmap
+        else:
+            rmap.update(robot)
+        rmap.try_save(path)
+        return rmap
+
+    def try_save(self, path: str | Path | None):
+        """Save the map if @param path is given; a failure to write it is reported by
+        a warning, the map is then rebuilt by the next process."""
+        if path is None:
+            return
+        try:
+            self.save(path)
+        except OSError as e:
+            warnings.warn(
+                f"Cannot save reachability map to {path}: {e}", RuntimeWarning
+            )
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Shadow copy of the registers written to the MARS control unit."""
+
+from __future__ import annotations
+
+# axis specific registers, the axis letter is the last character of the name
+_AXIS_REGISTERS = ("REG", "ANAXSETUP")
+# registers of the whole control unit
+_GLOBAL_REGISTERS = ("IDLEREL", "SPDTB")
+
+
+def parse_register_write(cmd: str) -> tuple[str, str | None, str] | None:
+    """Split register write @param cmd, e.g. 'REGMSA:100', into the register name,
+    its axis (None for global registers) and the value. Returns None for commands that
+    are not register writes."""
+    name, sep, value = cmd.strip().partition(":")
+    if not sep or not name:
+        return None
+    if name in _GLOBAL_REGISTERS:
+        return name, None, value
+    if name.startswith(_AXIS_REGISTERS) and len(name) > 3:
+        return name, name[-1], value
+    return None
+
+
+class RegisterShadow:
+    """Values of the registers as they were last written to the control unit. The
+    values are unknown (and always written) after the control unit or the axis was
+    reset by RELEASE or PURGE."""
+
+    def __init__(self):
+        super().__init__()
+        self._values: dict[str, tuple[str | None, str]] = {}
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, name: str) -> str | None:
+        """Return the last value written to register @param name or None."""
+        entry = self._values.get(name)
+        return None if entry is None else entry[1]
+
+    def record(self, cmd: str) -> bool:
+        """Record command @param cmd that is about to be sent. Returns False if it
+        writes a register with the value it already has, i.e. it can be skipped."""
+        reg = parse_register_write(cmd)
+        if reg is None:
+            return True
+        name, axis, value = reg
+        if self.get(name) == value:
+            self.skipped += 1
+            return False
+        self._values[name] = (axis, value)
+        return True
+
+    def forget(self, cmd: str):
+        """Mark the register written by @param cmd as unknown, e.g. if the write
+        failed."""
+        reg = parse_register_write(cmd)
+        if reg is not None:
+            self._values.pop(reg[0], None)
+
+    def snapshot(self) -> dict[str, tuple[str | None, str]]:
+        """Return copy of the known register values {name: (axis, value)}."""
+        return dict(self._values)
+
+    def restore(self, values: dict[str, tuple[str | None, str]]):
+        """Replace the known register values by @param values from snapshot, e.g.
+        when reconnecting to a control unit that kept its registers."""
+        self._values = {k: (v[0], v[1]) for k, v in values.items()}
+
+    def invalidate(self, axis: str | None = None):
+        """Mark all registers of @param axis as unknown, or all registers of the
+        control unit if axis is None."""
+        if axis is None:
+            self._values.clear()
+            return
+        self._values = {k: v for k, v in self._values.items() if v[0] != axis}
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Incremental parser of the replies of the MARS control unit.
+
+Replies are lines terminated by CR LF. The parser keeps only the incomplete last line
+between reads, so every received byte is processed once. Complete lines are turned
+into typed events:
+ - ready: 'R!' or 'R<axis>!' sent when the motion ends, name is 'R' or 'R<axis>'
+ - fail: 'FAIL!' sent when a command or query is rejected
+ - value: '<name>=<value>' reply to a query '<name>?', e.g. 'APG=840'
+ - line: anything else
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from ctu_crs.instrumentation import instrumented, stats_of
+from ctu_crs.mars_proxy import mars_lock
+
+READY = "ready"
+FAIL = "fail"
+VALUE = "value"
+LINE = "line"
+
+# bits of the ST register
+ST_ERROR = 0x8
+ST_MOVING = 0x10
+ST_QUEUE_FULL = 0x80
+ST_POWER_OFF = 0x10000
+ST_MOTION_STOP = 0x20000
+
+
+class CommandError(Exception):
+    """Raised when the control unit rejects a command or a query."""
+
+    def __init__(self, command: str):
+        super().__init__(f"Control unit rejected command '{command}'.")
+        self.command = command
+
+
+class ReplyEvent(NamedTuple):
+    kind: str
+    name: str = ""
+    value: str = ""
+
+
+def parse_line(line: str) -> ReplyEvent:
+    """Classify a complete reply @param line without the terminator."""
+    if line == "FAIL!":
+        return ReplyEvent(FAIL)
+    if line.endswith("!"):
+        return ReplyEvent(READY, line[:-1])
+    name, sep, value = line.partition("=")
+    if sep:
+        return ReplyEvent(VALUE, name, value.strip())
+    return ReplyEvent(LINE, value=line)
+
+
+class ResponseParser:
+    def __init__(self):
+        super().__init__()
+        self._partial = ""
+        self._handlers: dict[str, list[Callable[[ReplyEvent], None]]] = {}
+        self.events: deque[ReplyEvent] = deque()
+
+    def subscribe(self, kind: str, handler: Callable[[ReplyEvent], None]):
+        """Call @param handler for every event of @param kind."""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def feed(self, data: str | bytes | None) -> int:
+        """Process received @param data; events of the completed lines are dispatched
+        to the handlers and appended to the events queue. Returns number of new
+        events."""
+        if not data:
+            return 0
+        if isinstance(data, bytes):
+            data = data.decode("ascii")
+        lines = (self._partial + data).replace("\r", "\n").split("\n")
+        self._partial = lines.pop()
+        n = 0
+        for line in lines:
+            if not line:
+                continue
+            event = parse_line(line)
+            for handler in self._handlers.get(event.kind, ()):
+                handler(event)
+            self.events.append(event)
+            n += 1
+        return n
+
+    def read_until(
+        self,
+        mars,
+        match: Callable[[ReplyEvent], bool],
+        timeout: float | None = None,
+    ) -> ReplyEvent | None:
+        """Read replies of @param mars until an event satisfying @param match or a
+        fail event arrives and return it. Events before it are discarded. Returns
+        None if nothing matched within @param timeout [s]."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            while self.events:
+                event = self.events.popleft()
+                if event.kind == FAIL or match(event):
+                    return event
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            self.feed(mars.read_response())
+
+
+def query(mars, name: str, timeout: float | None = None) -> str:
+    """Send query @param name to @param mars and return the value of the reply."""
+    stats = stats_of(mars)
+    if stats is None:
+        return _query(mars, name, timeout)
+    return stats.call(f"{name}?", _query, mars, name, timeout)
+
+
+def _query(mars, name: str, timeout: float | None) -> str:
+    with mars_lock(mars):
+        mars.send_cmd(f"\n{name}?\n")
+        event = ResponseParser().read_until(
+            mars, lambda e: e.kind == VALUE and e.name == name, timeout
+        )
+    if event is None:
+        raise TimeoutError(f"No reply to query '{name}'.")
+    if event.kind == FAIL:
+        raise CommandError(f"{name}?")
+    return event.value
+
+
+@instrumented("wait_ready")
+def wait_ready(mars, axis: str = "", timeout: float | None = None) -> bool:
+    """Wait until the motion of @param axis (all axes if empty) ends. Returns False
+    if the control unit reports failure or on @param timeout [s]."""
+    with mars_lock(mars):
+        mars.send_cmd(f"\nR{axis}:\n")
+        event = ResponseParser().read_until(
+            mars, lambda e: e.kind == READY and e.name == f"R{axis}", timeout
+        )
+    return event is not None and event.kind == READY
+
+
+@instrumented("check_ready")
+def check_ready(mars, for_coordmv_queue: bool = False) -> bool:
+    """Return whether the robot is not moving or, if @param for_coordmv_queue is set,
+    whether the queue of coordinated movements is not full. Raises exception if the
+    control unit reports an error."""
+    st = int(query(mars, "ST"))
+    errors = [
+        msg
+        for bit, msg in (
+            (ST_ERROR, "error"),
+            (ST_POWER_OFF, "arm power is off"),
+            (ST_MOTION_STOP, "motion stop"),
+        )
+        if st & bit
+    ]
+    if errors:
+        raise Exception(f"Check ready: {', '.join(errors)}.")
+    return not st & (ST_QUEUE_FULL if for_coordmv_queue else ST_MOVING)
+
+
+@instrumented("get_current_q_irc")
+def current_q_irc(mars) -> np.ndarray:
+    """Return joint configuration of the coordinated axes in IRC."""
+    resp = query(mars, "COORDAP")
+    try:
+        return np.array([int(v) for v in resp.split(",")])[3:]
+    except ValueError:
+        raise Exception(f"Error response {resp}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ctu_crs.response_parser import check_ready
+from ctu_crs.timing import speed_to_rad_per_s
+
+
+class CartesianServo:
+    """Differential IK servo that converts Cartesian twist commands into small joint
+    increments streamed to the robot at a fixed rate. Twist is given as
+    [vx, vy, vz, wx, wy, wz] in [m/s] and [rad/s] w.r.t. base of the robot."""
+
+    def __init__(
+        self,
+        robot,
+        rate: float = 10.0,
+        damping: float = 0.05,
+        singular_threshold: float = 0.05,
+        max_lag: float = 0.2,
+    ):
+        """
+        :param robot: Initialized CRSRobot.
+        :param rate: Frequency [Hz] of the joint increments sent to the robot. Every
+          period carries a query of the queue state and COORDISCONT with COORDMVT,
+          about 50 ms of the 19200 baud line, so rates above ~15 Hz cannot be
+          sustained.
+        :param damping: Maximum damping of the least squares solution, it is applied
+          when the smallest singular value of Jacobian is zero.
+        :param singular_threshold: Smallest singular value of Jacobian below which
+          the damping is gradually applied.
+        :param max_lag: Periods are skipped while the sent increments are predicted
+          to end more than @param max_lag [s] from now, e.g. when the increments are
+          slowed down by the acceleration limits.
+        """
+        super().__init__()
+        self._robot = robot
+        self.rate = rate
+        self.damping = damping
+        self.singular_threshold = singular_threshold
+        self.max_lag = max_lag
+        # maximum joint speed [rad/s] used to limit the increments
+        self.max_joint_speed = speed_to_rad_per_s(robot, robot._max_speed_irc256_per_ms)
+        self.q: np.ndarray | None = None
+        # number of periods skipped because the queue of the control unit was full
+        self.skipped = 0
+
+    def joint_velocity(self, q: ArrayLike, twist: ArrayLike) -> np.ndarray:
+        """Compute joint velocity realizing @param twist at configuration @param q
+        using damped least squares; damping increases as the configuration approaches
+        a singularity."""
+        u, sigma, vt = np.linalg.svd(self._robot.jacobian(q))
+        s_min = sigma[-1]
+        lam2 = 0.0
+        if s_min < self.singular_threshold:
+            lam2 = (1 - (s_min / self.singular_threshold) ** 2) * self.damping**2
+        return vt.T @ ((sigma / (sigma**2 + lam2)) * (u.T @ np.asarray(twist)))
+
+    def step_q(self, q: ArrayLike, twist: ArrayLike, dt: float) -> np.ndarray:
+        """Return configuration reached from @param q by applying @param twist for
+        @param dt seconds. The increment is scaled down to respect maximum joint
+        speeds and the result is clamped to joint limits."""
+        q = np.asarray(q, dtype=float)
+        dq = self.joint_velocity(q, twist) * dt
+        scale = np.max(np.abs(dq) / (self.max_joint_speed * dt))
+        if scale > 1:
+            dq /= scale
+        return np.clip(q + dq, self._robot.q_min, self._robot.q_max)
+
+    def start(self, q: ArrayLike | None = None):
+        """Start servoing from configuration @param q, current configuration of the
+        robot is used if not given."""
+        assert self._robot._initialized, "You need to initialize the robot first."
+        self.q = np.asarray(q if q is not None else self._robot.get_q(), dtype=float)
+
+    def send_twist(self, twist: ArrayLike) -> bool:
+        """Integrate @param twist over one servo period and send the increment. The
+        period is skipped if the robot lags behind the sent increments by more than
+        max_lag or the coordinated movement queue of the control unit is full, so the
+        commanded configuration does not run ahead of the robot. Returns whether the
+        increment was sent."""
+        assert self.q is not None, "Call start() before sending commands."
+        r = self._robot
+        lag = r.completion.predicted_end - time.monotonic()
+        if lag > self.max_lag or not check_ready(r._mars, for_coordmv_queue=True):
+            self.skipped += 1
+            return False
+        dt = 1.0 / self.rate
+        self.q = self.step_q(self.q, twist, dt)
+        irc = self._robot._joint_values_to_irc(self.q)
+        self._robot._coordmv(irc, min_time=dt)
+        return True
+
+    def run(
+        self,
+        command: ArrayLike | Callable[[float], ArrayLike | None],
+        duration: float,
+    ):
+        """Stream increments at the fixed rate for @param duration seconds. The
+        @param command is either a constant twist or a function of time since start
+        returning twist; servoing stops early if the function returns None."""
+        if self.q is None:
+            self.start()
+        period = 1.0 / self.rate
+        t0 = time.perf_counter()
+        k = 0
+        while k * period < duration:
+            twist = command(k * period) if callable(command) else command
+            if twist is None:
+                break
+            self.send_twist(twist)
+            k += 1
+            sleep = t0 + k * period - time.perf_counter()
+            if sleep > 0:
+                time.sleep(sleep)
+
+    def run_velocity(self, velocity: ArrayLike, duration: float):
+        """Move the end-effector with constant linear @param velocity [m/s] without
+        changing its orientation for @param duration seconds."""
+        self.run(np.concatenate([velocity, np.zeros(3)]), duration)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Record of the state of the control unit that survives restarts of the process.
+
+The control unit keeps its position reference and registers as long as it is powered,
+so a process that reconnects to it does not need to home the robot again. The record
+is trusted only if the control unit reports no error, the robot stands still at the
+recorded position and the configuration registers have the recorded values; a power
+cycle or a reset of the unit changes at least one of them."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from ctu_crs.response_parser import (
+    ST_ERROR,
+    ST_MOTION_STOP,
+    ST_MOVING,
+    ST_POWER_OFF,
+    CommandError,
+    current_q_irc,
+    query,
+)
+
+# registers compared with the control unit, per axis of the arm
+VERIFIED_REGISTERS = ("REGCFG",)
+
+
+@dataclass
+class SessionRecord:
+    robot: str
+    homed: bool
+    q_irc: list[int]
+    registers: dict[str, tuple[str | None, str]] = field(default_factory=dict)
+    saved: float = 0.0
+
+    @classmethod
+    def capture(cls, robot, homed: bool) -> SessionRecord:
+        """Record the current state of @param robot; queries its position."""
+        q_irc = current_q_irc(robot._mars)[: len(robot._motors_ids)]
+        return cls(
+            robot=type(robot).__name__,
+            homed=homed,
+            q_irc=[int(v) for v in q_irc],
+            registers=robot.registers.snapshot(),
+            saved=time.time(),
+        )
+
+    def save(self, path: str | Path):
+        """Write the record to @param path as JSON, atomically."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(asdict(self), f, indent=1)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path | None) -> SessionRecord | None:
+        """Read record from @param path; returns None if it is missing or invalid."""
+        if path is None:
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            data["registers"] = {k: tuple(v) for k, v in data["registers"].items()}
+            return cls(**data)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def matches(self, robot, tolerance_irc: int = 2) -> bool:
+        """Return whether the control unit of @param robot is in the recorded state,
+        see the module documentation. Sends a few queries to the unit."""
+        if self.robot != type(robot).__name__ or not self.homed:
+            return False
+        names = [f"{r}{a}" for r in VERIFIED_REGISTERS for a in robot._motors_ids]
+        if any(name not in self.registers for name in names):
+            return False
+        mars = robot._mars
+        try:
+            st = int(query(mars, "ST"))
+            if st & (ST_ERROR | ST_MOVING | ST_POWER_OFF | ST_MOTION_STOP):
+                return False
+            q_irc = current_q_irc(mars)[: len(robot._motors_ids)]
+            if np.any(np.abs(q_irc - np.asarray(self.q_irc)) > tolerance_irc):
+                return False
+            for name in names:
+                if float(query(mars, name)) != float(self.registers[name][1]):
+                    return False
+        except (CommandError, ValueError):
+            return False
+        return True
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Simulated MARS control unit.
+
+SimulatedSerial emulates the serial line and the control unit at the level of bytes,
+so the whole command pipeline of MarsControlUnit and CRSRobot is exercised unchanged.
+Every byte takes 10 bit times of the baud rate in both directions; commands take
+effect when their last byte arrives and replies are readable when their last byte is
+transmitted. Reads wait for the full serial timeout unless enough bytes arrive, like
+pyserial does. Axes move along trapezoidal profiles given by the REGMS and REGACC
+registers (see ctu_crs.timing for the units); coordinated moves are queued and
+synchronized so that all axes of the group finish together. Blending of consecutive
+coordinated moves (COORDISCONT) is not modelled, the moves are rest-to-rest.
+
+The simulated time runs @param speedup times faster than the wall clock."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import NamedTuple
+
+import numpy as np
+from ctu_mars_control_unit import MarsControlUnit
+
+from ctu_crs.timing import trapezoidal_duration, trapezoidal_progress
+
+# tty_dev selecting the simulated control unit, optionally followed by ":<speedup>"
+SIM_TTY = "sim"
+
+# register values used for axes whose registers were not written yet
+_DEFAULT_REGISTERS = dict(REGMS=1000, REGACC=20)
+
+
+def is_sim_tty(tty_dev: str | None) -> bool:
+    return tty_dev is not None and tty_dev.split(":")[0] == SIM_TTY
+
+
+class _Segment(NamedTuple):
+    """Motion of one axis from p0 to p1 starting at t0 and lasting duration; the
+    normalized profile s in [0, 1] has speed and acceleration limits vs and acc_s."""
+
+    t0: float
+    duration: float
+    p0: float
+    p1: float
+    vs: float
+    acc_s: float
+
+    def position(self, t: float) -> float:
+        tau = t - self.t0
+        if tau <= 0:
+            return self.p0
+        if tau >= self.duration:
+            return self.p1
+        nominal = float(trapezoidal_duration(1.0, self.vs, self.acc_s))
+        s = float(
+            trapezoidal_progress(
+                tau * nominal / self.duration, 1.0, self.vs, self.acc_s
+            )
+        )
+        return self.p0 + s * (self.p1 - self.p0)
+
+
+class _Axis:
+    def __init__(self, position: float = 0.0):
+        super().__init__()
+        self.rest = position
+        self.segments: list[_Segment] = []
+
+    @property
+    def end_time(self) -> float:
+        return self.segments[-1].t0 + self.segments[-1].duration if self.segments else 0
+
+    @property
+    def target(self) -> float:
+        return self.segments[-1].p1 if self.segments else self.rest
+
+    def position(self, t: float) -> float:
+        for seg in reversed(self.segments):
+            if seg.t0 <= t:
+                return seg.position(t)
+        return self.segments[0].p0 if self.segments else self.rest
+
+    def stop(self, t: float):
+        self.rest = self.position(t)
+        self.segments = []
+
+
+class SimulatedSerial:
+    def __init__(
+        self,
+        baudrate: int = 19200,
+        speedup: float = 1.0,
+        timeout: float = 0.01,
+        axes: str = "ABCDEFGH",
+        queue_size: int = 16,
+    ):
+        """
+        :param baudrate: Simulated baud rate, each byte takes 10 bit times.
+        :param speedup: Ratio of the simulated time to the wall clock time.
+        :param timeout: Read timeout [s] in the simulated time.
+        :param axes: Names of the axes of the control unit.
+        :param queue_size: Capacity of the coordinated movement queue.
+        """
+        super().__init__()
+        self.baudrate = baudrate
+        self.speedup = speedup
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.axes = {a: _Axis() for a in axes}
+        self.registers: dict[str, str] = {}
+        self.coord_group = ""
+        self._coord_starts: list[float] = []
+        self._t0 = time.monotonic()
+        self._line_free = 0.0
+        self._rx = ""
+        self._out: list[tuple[float, int, bytes]] = []
+        self._out_free = 0.0
+        self._seq = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.commands_processed = 0
+
+    def now(self) -> float:
+        """Current simulated time [s]."""
+        return (time.monotonic() - self._t0) * self.speedup
+
+    def _byte_time(self, n: int) -> float:
+        return n * 10 / self.baudrate
+
+    def close(self):
+        pass
+
+    def write(self, data: bytes) -> int:
+        """Transmit @param data to the simulated unit; each complete line is processed
+        at the time its last byte arrives."""
+        t = max(self.now(), self._line_free)
+        for i, c in enumerate(data.decode("ascii")):
+            if c in "\r\n":
+                if self._rx:
+                    self._process(self._rx, t + self._byte_time(i + 1))
+                self._rx = ""
+            else:
+                self._rx += c
+        self._line_free = t + self._byte_time(len(data))
+        self.bytes_written += len(data)
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        """Return up to @param size bytes that were transmitted by the unit; waits
+        until the timeout expires unless @param size bytes are available."""
+        deadline = time.monotonic() + self.timeout / self.speedup
+        buf = b""
+        while True:
+            now = self.now()
+            while self._out and self._out[0][0] <= now and len(buf) < size:
+                buf += self._out.pop(0)[2]
+            remaining = deadline - time.monotonic()
+            if len(buf) >= size or remaining <= 0:
+                break
+            wait = remaining
+            if self._out:
+                wait = min(wait, (self._out[0][0] - now) / self.speedup)
+            time.sleep(max(wait, 0))
+        if len(buf) > size:
+            self._out.insert(0, (0.0, -1, buf[size:]))
+            buf = buf[:size]
+        self.bytes_read += len(buf)
+        return buf
+
+    def _reply(self, t: float, text: str, deferred: bool = False):
+        """Schedule reply line @param text that is ready at time @param t. Deferred
+        replies (e.g. R! sent when the motion ends) do not delay the other ones."""
+        data = (text + "\r\n").encode("ascii")
+        start = t if deferred else max(t, self._out_free)
+        end = start + self._byte_time(len(data))
+        if not deferred:
+            self._out_free = end
+        self._seq += 1
+        bisect.insort(self._out, (end, self._seq, data))
+
+    def _register(self, name: str, axis: str) -> float:
+        value = self.registers.get(name + axis, _DEFAULT_REGISTERS[name])
+        return float(value)
+
+    def _limits(self, axis: str) -> tuple[float, float]:
+        """Speed [IRC/s] and acceleration [IRC/s^2] limits of @param axis."""
+        v = self._register("REGMS", axis) / 256 * 1e3
+        a = self._register("REGACC", axis) / 256 * 1e6
+        return v, a
+
+    def _move(self, axes: str, targets, t: float, min_time: float = 0.0) -> float:
+        """Append synchronized rest-to-rest motion of @param axes to @param targets
+        starting at @param t. Returns the end time of the motion."""
+        p0 = np.array([self.axes[a].target for a in axes])
+        d = np.abs(np.asarray(targets, dtype=float) - p0)
+        limits = np.array([self._limits(a) for a in axes]).reshape(-1, 2)
+        moving = d > 0
+        vs = acc_s = 1.0
+        duration = 0.0
+        if np.any(moving):
+            vs = float(np.min(limits[moving, 0] / d[moving]))
+            acc_s = float(np.min(limits[moving, 1] / d[moving]))
+            duration = float(trapezoidal_duration(1.0, vs, acc_s))
+        duration = max(duration, min_time)
+        for a, start, end in zip(axes, p0, targets):
+            seg = _Segment(t, duration, float(start), float(end), vs, acc_s)
+            self.axes[a].segments.append(seg)
+        return t + duration
+
+    def _status(self, t: float) -> int:
+        st = 0
+        if any(ax.end_time > t for ax in self.axes.values()):
+            st |= 0x10
+        if sum(s > t for s in self._coord_starts) >= self.queue_size:
+            st |= 0x80
+        return st
+
+    def _stop(self, t: float, axes: str | None = None):
+        for a in axes if axes is not None else self.axes:
+            self.axes[a].stop(t)
+        if axes is None or any(a in self.coord_group for a in axes):
+            self._coord_starts = []
+
+    def _process(self, line: str, t: float):
+        """Execute command @param line arriving at simulated time @param t."""
+        self.commands_processed += 1
+        self._coord_starts = [s for s in self._coord_starts if s > t]
+        if line.endswith("?"):
+            value = self._query(line[:-1], t)
+            self._reply(t, "FAIL!" if value is None else f"{line[:-1]}={value}")
+            return
+        name, sep, args = line.partition(":")
+        if not sep or not self._command(name, args, t):
+            self._reply(t, "FAIL!")
+
+    def _query(self, name: str, t: float) -> str | None:
+        if name == "VER":
+            return "SIM"
+        if name == "ST":
+            return str(self._status(t))
+        if name == "COORDAP":
+            q = [round(self.axes[a].position(t)) for a in self.coord_group]
+            return ",".join(str(v) for v in [int(t * 1e3) & 0x7FFFFFFF, 0, 0] + q)
+        if name.startswith("AP") and name[2:] in self.axes:
+            return str(round(self.axes[name[2:]].position(t)))
+        if name in self.registers:
+            return self.registers[name]
+        return None
+
+    def _command(self, name: str, args: str, t: float) -> bool:
+        """Execute command @param name with @param args; returns False on error."""
+        axis = name[-1]
+        if name in ("ECHO", "COORDISCONT", "IDLEREL", "SPDTB"):
+            if name in ("IDLEREL", "SPDTB"):
+                self.registers[name] = args
+        elif name == "STAMP":
+            self._reply(t, f"STAMP={args}")
+        elif name in ("PURGE", "STOP", "RELEASE"):
+            self._stop(t)
+        elif name == "R":
+            end = max(ax.end_time for ax in self.axes.values())
+            self._reply(max(t, end), "R!", deferred=True)
+        elif name.startswith(("REG", "ANAXSETUP")):
+            if axis not in self.axes:
+                return False
+            self.registers[name] = args
+        elif name == "COORDGRP":
+            group = "".join(args.split(","))
+            if not all(a in self.axes for a in group):
+                return False
+            self.coord_group = group
+        elif name in ("COORDMV", "COORDMVT"):
+            values = [int(v) for v in args.split(",")]
+            min_time = 0.0
+            if name == "COORDMVT":
+                min_time, values = values[0] / 1e3, values[1:]
+            if not self.coord_group or len(values) != len(self.coord_group):
+                return False
+            start = max([t] + [self.axes[a].end_time for a in self.coord_group])
+            self._move(self.coord_group, values, start, min_time)
+            self._coord_starts.append(start)
+        elif axis not in self.axes:
+            return False
+        elif name[:-1] == "HH":
+            self._move(axis, [0], max(t, self.axes[axis].end_time))
+        elif name[:-1] == "G":
+            target = int(float(args))
+            self._move(axis, [target], max(t, self.axes[axis].end_time))
+        elif name[:-1] == "RELEASE":
+            self._stop(t, axis)
+        elif name[:-1] == "R":
+            end = self.axes[axis].end_time
+            self._reply(max(t, end), f"R{axis}!", deferred=True)
+        else:
+            return False
+        return True
+
+
+class SimulatedMarsControlUnit(MarsControlUnit):
+    """MarsControlUnit communicating with SimulatedSerial instead of a serial port."""
+
+    def __init__(self, tty_dev: str = SIM_TTY, baudrate: int = 19200, **kwargs):
+        """
+        :param tty_dev: 'sim' or 'sim:<speedup>'.
+        :param baudrate: Simulated baud rate.
+        :param kwargs: Other arguments of SimulatedSerial.
+        """
+        # MarsControlUnit.__init__ is not called as it opens the serial port
+        _, _, speedup = tty_dev.partition(":")
+        if speedup:
+            kwargs.setdefault("speedup", float(speedup))
+        self._stamp = int(time.time() % 0x7FFF)
+        self._coordmv_commands_to_next_check = 0
+        self._connection = SimulatedSerial(baudrate=baudrate, **kwargs)
+        self.init_communication(print_firmware_version=False)
+        self._coordinate_movement_set_up = False
+
+    @property
+    def serial(self) -> SimulatedSerial:
+        return self._connection
+
+    @property
+    def speedup(self) -> float:
+        """Ratio of the simulated time to the wall clock time."""
+        return self._connection.speedup
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Background sampling of the joint configuration of the robot.
+
+Samples are stored in a preallocated ring buffer of twice the capacity; every sample
+is written to two places, so that the most recent samples always form a contiguous
+block and windows of the history are returned as views without copying. Views are
+overwritten by new samples after capacity samples; copy them to keep the data."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# record of the binary log: monotonic time [s] and joint configuration [rad]
+LOG_DTYPE = np.dtype([("t", "<f8"), ("q", "<f4", (6,))])
+
+
+def load_log(path: str | Path) -> tuple[np.ndarray, np.ndarray]:
+    """Load binary log written by JointStateSampler. Returns (N,) times [s] and
+    (N, 6) joint configurations [rad]."""
+    data = np.fromfile(path, dtype=LOG_DTYPE)
+    return data["t"], data["q"].astype(float)
+
+
+class JointStateSampler:
+    def __init__(
+        self,
+        robot,
+        rate: float = 10.0,
+        capacity: int = 4096,
+        log_path: str | Path | None = None,
+        line_share: float = 0.25,
+    ):
+        """
+        Every sample is one COORDAP? query that occupies the serial line shared with
+        the commands of the robot for its whole round trip, about 20-30 ms at 19200
+        baud. Sampling at 10 Hz therefore takes about a quarter of the line, while at
+        40-50 Hz the line is saturated and the other queries wait for the sampler.
+
+        :param robot: Initialized CRSRobot.
+        :param rate: Maximal sampling frequency [Hz].
+        :param line_share: Maximal fraction of time the sampler occupies the serial
+          line; the period is extended to the measured round trip divided by it.
+        :param capacity: Number of the most recent samples kept in memory.
+        :param log_path: If given, all samples are appended to this binary file, see
+          LOG_DTYPE and load_log.
+        """
+        super().__init__()
+        assert capacity > 0, "Capacity must be positive."
+        self._robot = robot
+        self.rate = rate
+        self.line_share = line_share
+        self.capacity = capacity
+        self.log_path = log_path
+        n = len(robot._motors_ids)
+        self._t = np.zeros(2 * capacity)
+        self._q = np.zeros((2 * capacity, n))
+        self._count = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def __enter__(self) -> JointStateSampler:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def count(self) -> int:
+        """Total number of samples taken."""
+        return self._count
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        assert not self.running, "Sampler is already running."
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="crs-telemetry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and close the log."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def append(self, t: float, q: np.ndarray):
+        """Store sample @param q taken at monotonic time @param t [s]."""
+        i = self._count % self.capacity
+        self._t[i] = self._t[i + self.capacity] = t
+        self._q[i] = self._q[i + self.capacity] = q
+        self._count += 1
+
+    def _run(self):
+        period = 1.0 / self.rate
+        round_trip = 0.0
+        log = open(self.log_path, "ab") if self.log_path is not None else None
+        record = np.zeros(1, dtype=LOG_DTYPE)
+        t_next = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                try:
+                    t0 = time.monotonic()
+                    q = self._robot.get_q()
+                    t1 = time.monotonic()
+                    t = (t0 + t1) / 2
+                    # smoothed duration of the query, including waiting for the lock
+                    round_trip = 0.8 * round_trip + 0.2 * (t1 - t0)
+                except Exception:
+                    self.errors += 1
+                else:
+                    self.append(t, q)
+                    if log is not None:
+                        record["t"], record["q"] = t, q
+                        log.write(record.tobytes())
+                t_next = max(
+                    t_next + max(period, round_trip / self.line_share),
+                    time.monotonic(),
+                )
+                self._stop.wait(t_next - time.monotonic())
+        finally:
+            if log is not None:
+                log.close()
+
+    def latest(self) -> tuple[float, np.ndarray] | None:
+        """Return time [s] and joint configuration of the most recent sample or None
+        if nothing was sampled yet. Does not communicate with the robot."""
+        count = self._count
+        if count == 0:
+            return None
+        i = (count - 1) % self.capacity
+        return float(self._t[i]), self._q[i].copy()
+
+    def latest_q(self) -> np.ndarray | None:
+        """Return the most recent joint configuration or None."""
+        sample = self.latest()
+        return None if sample is None else sample[1]
+
+    def window(self, n: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return views of times (n,) and joint configurations (n, 6) of the last
+        @param n samples (all stored samples if None), oldest first."""
+        count = self._count
+        n = min(count, self.capacity) if n is None else min(n, count, self.capacity)
+        end = (count - 1) % self.capacity + self.capacity + 1
+        return self._t[end - n : end], self._q[end - n : end]
+
+    def history(self, duration: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return views of the samples taken in the last @param duration seconds."""
+        t, q = self.window()
+        start = np.searchsorted(t, time.monotonic() - duration)
+        return t[start:], q[start:]
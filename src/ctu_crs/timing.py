@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Time parameterization of joint space motions from the speed and acceleration
+registers of the control unit.
+
+Speed registers (REGMS) are in IRC*256/ms. Acceleration registers (REGACC) are
+interpreted in the same fixed point format, i.e. IRC*256/ms^2, assuming 1 kHz sampling
+of the controller. All functions here work in rad, rad/s and rad/s^2 and convert the
+register values through the IRC per degree ratio of the robot."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class SegmentTiming(NamedTuple):
+    """Timing of one synchronized joint space segment."""
+
+    duration: float
+    speed_irc256_per_ms: np.ndarray
+    acceleration_irc_per_ms: np.ndarray
+
+
+def speed_to_rad_per_s(robot, speed_irc256_per_ms: ArrayLike) -> np.ndarray:
+    """Convert speed register values to rad/s."""
+    irc_per_s = np.asarray(speed_irc256_per_ms, dtype=float) / 256 * 1e3
+    return np.deg2rad(irc_per_s / np.abs(robot._deg_to_irc))
+
+
+def speed_to_register(robot, speed_rad_per_s: ArrayLike) -> np.ndarray:
+    """Convert speed in rad/s to speed register values."""
+    irc_per_s = np.rad2deg(np.asarray(speed_rad_per_s)) * np.abs(robot._deg_to_irc)
+    return irc_per_s * 256 / 1e3
+
+
+def acceleration_to_rad_per_s2(robot, acceleration: ArrayLike) -> np.ndarray:
+    """Convert acceleration register values to rad/s^2."""
+    irc_per_s2 = np.asarray(acceleration, dtype=float) / 256 * 1e6
+    return np.deg2rad(irc_per_s2 / np.abs(robot._deg_to_irc))
+
+
+def acceleration_to_register(robot, acceleration_rad_per_s2: ArrayLike) -> np.ndarray:
+    """Convert acceleration in rad/s^2 to acceleration register values."""
+    irc_per_s2 = np.rad2deg(np.asarray(acceleration_rad_per_s2)) * np.abs(
+        robot._deg_to_irc
+    )
+    return irc_per_s2 * 256 / 1e6
+
+
+def axis_limits(
+    robot, speed_fraction: float = 1.0, acceleration_fraction: float = 1.0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return per-axis speed [rad/s] and acceleration [rad/s^2] limits for the given
+    fractions (0-1) of the range between minimum and maximum register values, i.e.
+    the same mapping as in set_speed_relative and set_acceleration_relative."""
+    speed = robot._min_speed_irc256_per_ms + speed_fraction * (
+        robot._max_speed_irc256_per_ms - robot._min_speed_irc256_per_ms
+    )
+    acc = robot._min_acceleration_irc_per_ms + acceleration_fraction * (
+        robot._max_acceleration_irc_per_ms - robot._min_acceleration_irc_per_ms
+    )
+    return speed_to_rad_per_s(robot, speed), acceleration_to_rad_per_s2(robot, acc)
+
+
+def trapezoidal_duration(
+    distance: ArrayLike, speed: ArrayLike, acceleration: ArrayLike
+) -> np.ndarray:
+    """Duration of a rest-to-rest motion over @param distance with trapezoidal velocity
+    profile limited by @param speed and @param acceleration. The profile degenerates
+    to a triangle for short distances. Broadcasts over all arguments."""
+    d = np.abs(np.asarray(distance, dtype=float))
+    v, a = np.asarray(speed, dtype=float), np.asarray(acceleration, dtype=float)
+    t_acc = np.minimum(v / a, np.sqrt(d / a))
+    v_peak = a * t_acc
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = 2 * t_acc + np.where(v_peak > 0, (d - v_peak * t_acc) / v_peak, 0.0)
+    return np.where(d > 0, t, 0.0)
+
+
+def trapezoidal_progress(
+    t: ArrayLike, distance: float, speed: float, acceleration: float
+) -> np.ndarray:
+    """Return distance travelled at times @param t for the profile described by
+    trapezoidal_duration."""
+    t = np.asarray(t, dtype=float)
+    t_end = float(trapezoidal_duration(distance, speed, acceleration))
+    t_acc = min(speed / acceleration, np.sqrt(distance / acceleration))
+    v = acceleration * t_acc
+    t = np.clip(t, 0, t_end)
+    return np.where(
+        t < t_acc,
+        0.5 * acceleration * t**2,
+        np.where(
+            t <= t_end - t_acc,
+            0.5 * v * t_acc + v * (t - t_acc),
+            distance - 0.5 * acceleration * (t_end - t) ** 2,
+        ),
+    )
+
+
+def _jerk_limited_ramp(v, a, j) -> tuple[np.ndarray, np.ndarray]:
+    """Time and distance needed to accelerate from rest to speed @param v with
+    acceleration and jerk limits @param a and @param j."""
+    t = np.where(v * j >= a**2, v / a + a / j, 2 * np.sqrt(v / j))
+    return t, v * t / 2
+
+
+def jerk_limited_duration(
+    distance: ArrayLike, speed: ArrayLike, acceleration: ArrayLike, jerk: ArrayLike
+) -> np.ndarray:
+    """Duration of a rest-to-rest motion over @param distance with S-curve (jerk
+    limited) profile given by @param speed, @param acceleration and @param jerk
+    limits. Broadcasts over all arguments."""
+    d, v, a, j = np.broadcast_arrays(
+        np.abs(np.asarray(distance, dtype=float)),
+        np.asarray(speed, dtype=float),
+        np.asarray(acceleration, dtype=float),
+        np.asarray(jerk, dtype=float),
+    )
+    t_ramp, d_ramp = _jerk_limited_ramp(v, a, j)
+    cruise = 2 * d_ramp <= d
+
+    # speed limit not reached, find peak speed by bisection on the ramp distance
+    lo, hi = np.zeros_like(v), v.copy()
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        _, d_mid = _jerk_limited_ramp(mid, a, j)
+        short = 2 * d_mid <= d
+        lo, hi = np.where(short, mid, lo), np.where(short, hi, mid)
+    t_peak, _ = _jerk_limited_ramp(lo, a, j)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(cruise, 2 * t_ramp + (d - 2 * d_ramp) / v, 2 * t_peak)
+    return np.where(d > 0, t, 0.0)
+
+
+def _segment_duration(d, v, a, jerk) -> np.ndarray:
+    if jerk is None:
+        return trapezoidal_duration(d, v, a)
+    return jerk_limited_duration(d, v, a, jerk)
+
+
+def segment_durations(
+    robot,
+    waypoints: ArrayLike,
+    speed_fraction: float = 1.0,
+    acceleration_fraction: float = 1.0,
+    jerk: ArrayLike | None = None,
+) -> np.ndarray:
+    """Predict duration [s] of each rest-to-rest coordinated segment between the
+    (N, 6) joint @param waypoints. The duration of a segment is given by its slowest
+    axis; @param jerk [rad/s^3] per axis enables jerk-limited profile."""
+    waypoints = np.asarray(waypoints, dtype=float)
+    v, a = axis_limits(robot, speed_fraction, acceleration_fraction)
+    d = np.abs(np.diff(waypoints, axis=0))
+    return np.max(_segment_duration(d, v, a, jerk), axis=-1)
+
+
+def plan_segments(
+    robot,
+    waypoints: ArrayLike,
+    jerk: ArrayLike | None = None,
+) -> list[SegmentTiming]:
+    """Select speed and acceleration registers for each segment between the (N, 6)
+    joint @param waypoints that minimize its duration while keeping all axes
+    synchronized, i.e. all axes follow the same normalized profile scaled by their
+    distance and finish at the same time. The leading axis runs at its maximum speed
+    or acceleration. Returns timing for each of N-1 segments."""
+    waypoints = np.asarray(waypoints, dtype=float)
+    v_max, a_max = axis_limits(robot)
+    timings = []
+    for d in np.abs(np.diff(waypoints, axis=0)):
+        moving = d > 0
+        if not np.any(moving):
+            timings.append(
+                SegmentTiming(
+                    0.0,
+                    np.array(robot._max_speed_irc256_per_ms, dtype=float),
+                    np.array(robot._max_acceleration_irc_per_ms, dtype=float),
+                )
+            )
+            continue
+        # limits of the normalized profile s(t) in [0, 1]
+        vs = np.min(v_max[moving] / d[moving])
+        acc_s = np.min(a_max[moving] / d[moving])
+        js = None if jerk is None else np.min(np.asarray(jerk)[moving] / d[moving])
+        duration = float(_segment_duration(1.0, vs, acc_s, js))
+        speed = speed_to_register(robot, d * vs)
+        acc = acceleration_to_register(robot, d * acc_s)
+        timings.append(
+            SegmentTiming(
+                duration,
+                np.clip(np.rint(speed), 1, robot._max_speed_irc256_per_ms),
+                np.clip(np.rint(acc), 1, robot._max_acceleration_irc_per_ms),
+            )
+        )
+    return timings
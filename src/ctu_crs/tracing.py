@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Timeline of nested spans across the robot, gripper, camera and detection.
+
+Spans are recorded by the process-wide tracer around the entry points decorated by
+traced (e.g. CRSRobot.move_to_q, KinematicModel.ik, Gripper.control_position,
+BaslerCamera.grab_image) or by 'with span(...)' blocks. The timeline is exported as
+Chrome trace-event JSON that is opened by chrome://tracing or ui.perfetto.dev; every
+thread has its own track, so idle gaps and stages that could overlap are visible.
+
+Tracing is disabled by default and then costs one attribute check per call. Sampling
+is decided for every root span (a span started with no open span in its thread) and
+inherited by the nested spans, so a sampled trace, e.g. one pick-and-place cycle
+wrapped in a span, is always complete. Spans of other threads are sampled
+independently. The most recent events are kept in a bounded buffer."""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+
+class Span:
+    """Span returned by Tracer.span; it is recorded when the with block exits."""
+
+    __slots__ = ("_tracer", "name", "category", "args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict):
+        super().__init__()
+        self._tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start: float | None = None
+
+    def set(self, **args):
+        """Attach @param args to the span, shown in the details of the event."""
+        self.args.update(args)
+
+    def __enter__(self) -> Span:
+        local = self._tracer._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.sampled = self._tracer._sample()
+        local.depth = depth + 1
+        if local.sampled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        self._tracer._local.depth -= 1
+        if self._start is not None:
+            if exc_type is not None:
+                self.args["error"] = repr(exc_value)
+            self._tracer._emit(self, self._start, end)
+
+
+class _NullSpan:
+    """Span of the disabled tracer."""
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(
+        self, sample_rate: float = 1.0, capacity: int = 100000, enabled: bool = True
+    ):
+        """
+        :param sample_rate: Fraction of the root spans recorded with their children.
+        :param capacity: Number of the most recent events kept.
+        :param enabled: Whether spans are recorded.
+        """
+        super().__init__()
+        assert 0.0 <= sample_rate <= 1.0, "Sample rate must be in [0, 1]."
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._events: deque[dict] = deque(maxlen=capacity)
+        self._threads: dict[int, str] = {}
+        self._local = threading.local()
+        self._rng = random.Random()
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter()
+
+    def _sample(self) -> bool:
+        return self.sample_rate >= 1.0 or self._rng.random() < self.sample_rate
+
+    def _emit(self, span: Span, start: float, end: float):
+        tid = threading.get_native_id()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event = dict(
+            name=span.name,
+            cat=span.category,
+            ph="X",
+            ts=(start - self._t0) * 1e6,
+            dur=(end - start) * 1e6,
+            pid=self._pid,
+            tid=tid,
+        )
+        if span.args:
+            event["args"] = {k: _jsonable(v) for k, v in span.args.items()}
+        self._events.append(event)
+
+    def span(self, name: str, category: str = "ctu_crs", **args) -> Span | _NullSpan:
+        """Return context manager recording span @param name of @param category with
+        @param args shown in the details of the event."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, args)
+
+    def events(self) -> list[dict]:
+        """Return copy of the recorded complete events."""
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def chrome_trace(self) -> dict:
+        """Return the recorded events in the Chrome trace-event format, including
+        the names of the process and the threads."""
+        meta = [
+            dict(
+                name="process_name",
+                ph="M",
+                pid=self._pid,
+                tid=0,
+                args=dict(name="ctu_crs"),
+            )
+        ]
+        meta += [
+            dict(name="thread_name", ph="M", pid=self._pid, tid=tid, args=dict(name=n))
+            for tid, n in list(self._threads.items())
+        ]
+        return dict(traceEvents=meta + self.events(), displayTimeUnit="ms")
+
+    def export_chrome(self, path: str | Path):
+        """Write the trace to @param path as JSON for chrome://tracing or Perfetto."""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+# process-wide tracer used by span and traced, disabled by default
+tracer = Tracer(enabled=False)
+
+
+def enable(sample_rate: float = 1.0, capacity: int | None = None):
+    """Start recording spans of the process-wide tracer; a fraction @param
+    sample_rate of the root spans is recorded."""
+    assert 0.0 <= sample_rate <= 1.0, "Sample rate must be in [0, 1]."
+    tracer.sample_rate = sample_rate
+    if capacity is not None:
+        tracer._events = deque(tracer._events, maxlen=capacity)
+    tracer.enabled = True
+
+
+def disable():
+    """Stop recording; the recorded events are kept for export."""
+    tracer.enabled = False
+
+
+def span(name: str, category: str = "ctu_crs", **args) -> Span | _NullSpan:
+    """Span of the process-wide tracer, see Tracer.span."""
+    return tracer.span(name, category, **args)
+
+
+def export_chrome(path: str | Path):
+    """Export the process-wide tracer, see Tracer.export_chrome."""
+    tracer.export_chrome(path)
+
+
+def traced(name: str | None = None, category: str = "ctu_crs"):
+    """Decorator recording every call as a span @param name (qualified name of the
+    function by default) of the process-wide tracer."""
+
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(tracer, label, category, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+"""Fake control units shared by the tests."""
+
+
+class FakeMars:
+    """Records written commands and coordinated movements. Replies FAIL! to
+    rejected commands, STAMP= to STAMP commands and state st to ST? queries."""
+
+    def __init__(self, rejected=(), st: int = 0):
+        self.writes = []
+        self.moves = []
+        self.rejected = set(rejected)
+        self.st = st
+        self._out = ""
+
+    def send_cmd(self, cmd):
+        self.writes.append(cmd)
+        for line in cmd.splitlines():
+            if line in self.rejected:
+                self._out += "FAIL!\r\n"
+            elif line.startswith("STAMP:"):
+                self._out += f"STAMP={line[6:]}\r\n"
+            elif line == "ST?":
+                self._out += f"ST={self.st}\r\n"
+
+    def read_response(self):
+        out, self._out = self._out.replace("\r\n", "\n"), ""
+        return out
+
+    def coordmv(self, q_irc, min_time=None):
+        self.moves.append((q_irc, min_time))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import asyncio
+import threading
+import unittest
+
+import numpy as np
+
+from ctu_crs.aio import AsyncCRSRobot
+from ctu_crs.crs93 import CRS93
+
+
+class FakeMars:
+    """Motion finishes after a given number of state queries."""
+
+    def __init__(self, robot, polls=3):
+        self.threads = set()
+        self.polls = polls
+        self.q_irc = robot._joint_values_to_irc(robot.q_home)
+        self.commands = []
+        self._pending = 0
+        self._gripper = [800.0, 500.0, 200.0, 150.0, 140.0]
+        self._out = ""
+
+    def _record(self):
+        self.threads.add(threading.get_ident())
+
+    def send_cmd(self, cmd):
+        self._record()
+        self.commands.append(cmd)
+        for line in cmd.split():
+            if line == "ST?":
+                self._pending -= 1
+                self._out += f"ST={0x10 if self._pending > 0 else 0}\r\n"
+            elif line == "COORDAP?":
+                irc = ",".join(str(int(v)) for v in self.q_irc)
+                self._out += f"COORDAP=0,0,0,{irc}\r\n"
+            elif line == "APG?":
+                g = self._gripper
+                self._out += f"APG={g.pop(0) if len(g) > 1 else g[0]}\r\n"
+            elif line == "RG:":
+                self._out += "RG!\r\n"
+
+    def read_response(self):
+        self._record()
+        out, self._out = self._out.replace("\r\n", "\n"), ""
+        return out
+
+    def coordmv(self, q_irc, min_time=None):
+        self._record()
+        self.q_irc = q_irc
+        self._pending = self.polls
+
+    def close_connection(self):
+        self._record()
+
+
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        self.robot = CRS93(tty_dev=None)
+        self.robot._initialized = True
+        self.robot.gripper._initialized = True
+        self.mars = FakeMars(self.robot)
+        self.robot._mars = self.robot.gripper._mars = self.mars
+        self.robot.gripper.gripper_poll_time = 0.001
+
+    def test_motion_overlaps_other_tasks(self):
+        async def main():
+            ticks = 0
+
+            async def other():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            task = asyncio.create_task(other())
+            async with AsyncCRSRobot(self.robot) as r:
+                q = self.robot.q_home + 0.1
+                await r.move_to_q(q)
+                self.assertTrue(await r.motion_done())
+                np.testing.assert_allclose(await r.get_q(), q, atol=1e-3)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 5)
+        self.assertEqual(len(self.mars.threads), 1)
+        self.assertNotIn(threading.get_ident(), self.mars.threads)
+
+    def test_gripper_close(self):
+        async def main():
+            r = AsyncCRSRobot(self.robot)
+            await r.gripper.close()
+            await r.close()
+
+        asyncio.run(main())
+        self.assertEqual(self.mars.commands[-1], "RELEASEG:\n")
+        self.assertIn("GG:103\n", self.mars.commands)
+        self.assertEqual(len(self.mars._gripper), 1)
+
+    def test_stream_q(self):
+        async def main():
+            r = AsyncCRSRobot(self.robot)
+            samples = []
+            t0 = asyncio.get_running_loop().time()
+            async for q in r.stream_q(rate=100):
+                samples.append(q)
+                if len(samples) == 5:
+                    break
+            dt = asyncio.get_running_loop().time() - t0
+            await r.close()
+            return samples, dt
+
+        samples, dt = asyncio.run(main())
+        self.assertEqual(len(samples), 5)
+        self.assertGreaterEqual(dt, 0.035)
+
+    def test_initialize_saves_homed_session(self):
+        calls = []
+        self.robot.initialize = lambda home: calls.append(("initialize", home))
+        self.robot.hard_home = lambda: calls.append("hard_home")
+        self.robot.save_session = lambda: calls.append("save_session")
+
+        async def main():
+            async with AsyncCRSRobot(self.robot) as r:
+                await r.initialize()
+
+        asyncio.run(main())
+        # the session is saved again by close
+        self.assertEqual(
+            calls[:3], [("initialize", False), "hard_home", "save_session"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.cartesian_path import (
+    linear_path,
+    quaternion_to_rotation,
+    rotation_to_quaternion,
+    slerp,
+)
+from ctu_crs.crs93 import CRS93
+from ctu_crs.timing import trapezoidal_duration
+
+
+class TestCartesianPath(unittest.TestCase):
+    def test_quaternion_conversion(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        for pose in r.fk_batch(np.random.uniform(r.q_min, r.q_max, size=(50, 6))):
+            quat = rotation_to_quaternion(pose[:3, :3])
+            np.testing.assert_allclose(quaternion_to_rotation(quat), pose[:3, :3])
+
+    def test_slerp_endpoints(self):
+        q0 = rotation_to_quaternion(np.eye(3))
+        q1 = rotation_to_quaternion(np.diag([1.0, -1.0, -1.0]))
+        np.testing.assert_allclose(slerp(q0, q1, 0), q0)
+        np.testing.assert_allclose(slerp(q0, q1, 1), q1)
+        np.testing.assert_allclose(np.linalg.norm(slerp(q0, q1, 0.3)), 1)
+
+    def test_linear_path(self):
+        r = CRS93(tty_dev=None)
+        start = r.fk(r.q_home)
+        end = start.copy()
+        end[:3, 3] += [0.1, -0.05, -0.1]
+        waypoints = list(linear_path(r, start, end, 0.1, 0.5, q_start=r.q_home))
+        t = np.array([w[0] for w in waypoints])
+        self.assertEqual(t[0], 0)
+        self.assertAlmostEqual(t[-1], trapezoidal_duration(0.15, 0.1, 0.5))
+        for _, q in waypoints:
+            pose = r.fk(q)
+            np.testing.assert_allclose(pose[:3, :3], start[:3, :3], atol=1e-6)
+            d = np.cross(pose[:3, 3] - start[:3, 3], end[:3, 3] - start[:3, 3])
+            np.testing.assert_allclose(d, 0, atol=1e-9)
+        np.testing.assert_allclose(r.fk(waypoints[-1][1]), end, atol=1e-6)
+
+    def test_linear_path_is_lazy_and_detects_limits(self):
+        r = CRS93(tty_dev=None)
+        start = r.fk(r.q_home)
+        end = start.copy()
+        end[:3, 3] += [2.0, 0, 0]
+        path = linear_path(r, start, end, 0.2, 0.5, q_start=r.q_home)
+        self.assertEqual(next(path)[0], 0)
+        with self.assertRaises(ValueError):
+            list(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
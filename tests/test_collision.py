@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.collision import CollisionModel, interpolate_edges, segment_distance
+from ctu_crs.crs93 import CRS93
+
+
+class TestCollision(unittest.TestCase):
+    def test_segment_distance(self):
+        np.random.seed(0)
+        p1, q1, p2, q2 = np.random.uniform(-1, 1, size=(4, 100, 3))
+        s = np.linspace(0, 1, 201)
+        a = p1[:, None] + s[:, None] * (q1 - p1)[:, None]
+        b = p2[:, None] + s[:, None] * (q2 - p2)[:, None]
+        brute = np.min(np.linalg.norm(a[:, :, None] - b[:, None], axis=-1), (1, 2))
+        d = segment_distance(p1, q1, p2, q2)
+        self.assertTrue(np.all(d <= brute + 1e-12))
+        np.testing.assert_allclose(d, brute, atol=1e-2)
+        # parallel segments
+        d = segment_distance(*np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0.0]]))
+        self.assertAlmostEqual(d, 1.0)
+
+    def test_link_segments(self):
+        r = CRS93(tty_dev=None)
+        m = CollisionModel(r)
+        seg = m.link_segments(r.q_home)[0]
+        np.testing.assert_allclose(seg[-1, 1], r.fk(r.q_home)[:3, 3])
+        np.testing.assert_allclose(seg[3, 0], r.fk_flange_pos(r.q_home))
+        np.testing.assert_allclose(seg[1:, 0], seg[:-1, 1], atol=1e-12)
+
+    def test_table(self):
+        r = CRS93(tty_dev=None)
+        m = CollisionModel(r)
+        m.add_table(0.0)
+        self.assertFalse(m.in_collision(r.q_home)[0])
+        m.add_table(r.fk(r.q_home)[2, 3])
+        self.assertTrue(m.in_collision(r.q_home)[0])
+
+    def test_box(self):
+        r = CRS93(tty_dev=None)
+        m = CollisionModel(r)
+        q = np.array([r.q_home, r.q_home])
+        q[1, 0] = np.pi / 2
+        box = np.eye(4)
+        box[:3, 3] = r.fk(r.q_home)[:3, 3] + [0, 0, -0.06]
+        m.add_box([0.1, 0.1, 0.05], box)
+        np.testing.assert_array_equal(m.in_collision(q), [True, False])
+
+    def test_self_collision(self):
+        r = CRS93(tty_dev=None)
+        m = CollisionModel(r)
+        self.assertFalse(m.in_collision(r.q_home)[0])
+        q = np.deg2rad([0, 88, 110, 0, 90, 0])
+        self.assertTrue(r.in_limits(q))
+        self.assertTrue(m.self_collision(m.link_segments(q))[0])
+
+    def test_path(self):
+        r = CRS93(tty_dev=None)
+        m = CollisionModel(r)
+        m.add_table(0.0)
+        q_down = r.q_home.copy()
+        q_down[1] = np.deg2rad(-80)
+        self.assertTrue(m.in_collision(q_down)[0])
+        q_side = r.q_home.copy()
+        q_side[0] = np.pi / 2
+        self.assertFalse(m.path_in_collision([r.q_home, q_side]))
+        self.assertTrue(m.path_in_collision([r.q_home, q_down, q_side]))
+        samples, edge = interpolate_edges([r.q_home], [q_side], 0.1)
+        self.assertEqual(len(samples), 17)
+        np.testing.assert_allclose(samples[-1], q_side)
+        np.testing.assert_array_equal(edge, 0)
+
+    def test_move_to_q_guard(self):
+        r = CRS93(tty_dev=None)
+        r._initialized = True
+        r.enable_collision_model(table_height=0.0)
+        q = r.q_home.copy()
+        q[1] = np.deg2rad(-80)
+        with self.assertRaises(AssertionError):
+            r.move_to_q(q)
+
+
+if __name__ == "__main__":
+    unittest.main()
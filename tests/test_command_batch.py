@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+from ctu_crs.command_batch import CommandBatch, CommandError
+from ctu_crs.crs93 import CRS93
+from tests.fakes import FakeMars
+
+
+class TestCommandBatch(unittest.TestCase):
+    def test_single_write(self):
+        mars = FakeMars()
+        with CommandBatch(mars) as b:
+            b.add("REGMSA:10")
+            b.add("REGMSB:20\n")
+        self.assertEqual(len(mars.writes), 1)
+        self.assertTrue(mars.writes[0].startswith("REGMSA:10\nREGMSB:20\nSTAMP:"))
+        self.assertEqual(len(b), 0)
+
+    def test_unchecked(self):
+        mars = FakeMars(rejected=["X"])
+        b = CommandBatch(mars)
+        b.add("X")
+        b.flush(check=False)
+        self.assertEqual(mars.writes, ["X\n"])
+        b.flush()
+        self.assertEqual(len(mars.writes), 1)
+
+    def test_failing_command_reported(self):
+        commands = [f"REGP{a}:{i}" for i, a in enumerate("ABCDEFG")]
+        for failing in commands:
+            mars = FakeMars(rejected=[failing])
+            b = CommandBatch(mars)
+            for c in commands:
+                b.add(c)
+            with self.assertRaises(CommandError) as ctx:
+                b.flush()
+            self.assertEqual(ctx.exception.command, failing)
+            self.assertLessEqual(len(mars.writes), 4)
+
+    def test_timeout(self):
+        class Mute(FakeMars):
+            def read_response(self):
+                return ""
+
+        b = CommandBatch(Mute(), timeout=0.01)
+        b.add("REGMSA:10")
+        with self.assertRaises(TimeoutError):
+            b.flush()
+
+    def test_robot_registers(self):
+        r = CRS93(tty_dev=None)
+        mars = FakeMars()
+        r._mars = r.gripper._mars = mars
+        r.set_speed(r._default_speed_irc256_per_ms)
+        self.assertEqual(len(mars.writes), 1)
+        self.assertEqual(mars.writes[0].count("\n"), 6)
+        r.gripper.initialize()
+        self.assertEqual(len(mars.writes), 2)
+        self.assertIn("REGDG:100\n", mars.writes[1])
+        self.assertTrue(r.gripper._initialized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+
+
+class TestMotionCompletion(unittest.TestCase):
+    def setUp(self):
+        self.robot = CRS93(tty_dev="sim:20")
+        self.robot.initialize()
+
+    def test_prediction_matches_simulation(self):
+        r = self.robot
+        serial = r._mars.serial
+        q = r.q_home + [0.4, 0.2, -0.3, 0.5, 0.2, 0.1]
+        r.move_to_q(q)
+        seg = serial.axes["A"].segments[-1]
+        predicted = r.completion.duration(
+            r._joint_values_to_irc(r.q_home), r._joint_values_to_irc(q)
+        )
+        self.assertEqual(r.completion.time_scale, serial.speedup)
+        self.assertAlmostEqual(predicted * serial.speedup, seg.duration, places=6)
+        self.assertEqual(CRS93(tty_dev=None).completion.time_scale, 1.0)
+
+        self.assertTrue(r.wait_for_motion_stop())
+        end = max(ax.end_time for ax in serial.axes.values())
+        self.assertGreaterEqual(serial.now(), end)
+        record = r.completion.records[-1]
+        self.assertLess(record.polls, 10)
+        self.assertLess(record.latency, 0.05)
+        np.testing.assert_allclose(r.get_q(), q, atol=1e-4)
+
+    def test_queued_moves_and_timeout(self):
+        r = self.robot
+        q = r.q_home + [0.5, 0, 0, 0, 0, 0]
+        r.move_to_q([q, r.q_home, q])
+        self.assertFalse(r.wait_for_motion_stop(timeout=0.01))
+        self.assertTrue(r.in_motion())
+        self.assertTrue(r.wait_for_motion_stop())
+        self.assertFalse(r.in_motion())
+        stats = r.completion.latency_stats()
+        self.assertEqual(stats["count"], 2)
+
+    def test_future_and_callback(self):
+        r = self.robot
+        done = []
+        r.move_to_q(r.q_home + [0, 0, 0, 0.5, 0, 0])
+        future = r.completion.add_done_callback(done.append)
+        record = future.result(timeout=10)
+        self.assertEqual(done, [record])
+        self.assertFalse(r.in_motion())
+        r.move_to_q(r.q_home)
+        self.assertIsNotNone(r.motion_done().result(timeout=10))
+        r.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from ctu_crs.coordinator import SYNC, RobotCoordinator
+from ctu_crs.crs93 import CRS93
+from ctu_crs.crs97 import CRS97
+
+
+class TestRobotCoordinator(unittest.TestCase):
+    def setUp(self):
+        self.robots = dict(crs93=CRS93(tty_dev="sim:10"), crs97=CRS97(tty_dev="sim:10"))
+        self.coordinator = RobotCoordinator(self.robots)
+        self.coordinator.initialize(home=False)
+
+    def tearDown(self):
+        self.coordinator.close()
+
+    def targets(self, dq: float) -> dict:
+        return {n: r.q_home + [dq, 0, 0, 0, 0, 0] for n, r in self.robots.items()}
+
+    def test_parallel_motion(self):
+        c = self.coordinator
+        for r in self.robots.values():
+            r.move_to_q(r.q_home)
+            r.wait_for_motion_stop()
+        targets = self.targets(0.5)
+        t0 = time.monotonic()
+        self.assertTrue(c.move_and_wait(targets, synchronized=True))
+        parallel = time.monotonic() - t0
+
+        starts, durations = [], []
+        for name, r in self.robots.items():
+            np.testing.assert_allclose(r.get_q(), targets[name], atol=1e-4)
+            seg = r._mars.serial.axes["A"].segments[-1]
+            starts.append(seg.t0 - r._mars.serial.now())
+            durations.append(seg.duration / r._mars.serial.speedup)
+        # the slower arm determines the time, not the sum of both
+        self.assertLess(parallel, 0.8 * sum(durations))
+        self.assertGreaterEqual(parallel, max(durations))
+        self.assertLess(abs(starts[0] - starts[1]) / 10, 0.05)
+
+    def test_program_with_barriers(self):
+        log = []
+        lock = threading.Lock()
+
+        def step(tag, delay=0.0):
+            def fn(robot):
+                time.sleep(delay)
+                with lock:
+                    log.append(tag)
+                return tag
+
+            return fn
+
+        results = self.coordinator.run(
+            dict(
+                crs93=[step("a1", 0.05), SYNC, step("a2")],
+                crs97=[step("b1"), SYNC, step("b2"), lambda r: r.get_q()],
+            )
+        )
+        self.assertEqual(set(log[:2]), {"a1", "b1"})
+        self.assertEqual(set(log[2:]), {"a2", "b2"})
+        self.assertEqual(results["crs93"], ["a1", "a2"])
+        self.assertEqual(len(results["crs97"]), 3)
+
+    def test_failing_program_breaks_barrier(self):
+        def fail(robot):
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            self.coordinator.run(dict(crs93=[fail, SYNC], crs97=[SYNC, lambda r: None]))
+
+    def test_programs_ending_at_barrier(self):
+        robots = {n: CRS93(tty_dev=None) for n in "abc"}
+        with RobotCoordinator(robots) as c:
+            for _ in range(100):
+                results = c.run({n: [SYNC] for n in robots})
+                self.assertEqual(results, {n: [] for n in robots})
+                results = c.run({n: [lambda r: 1, SYNC, lambda r: 2] for n in robots})
+                self.assertEqual(results, {n: [1, 2] for n in robots})
+
+    def test_workers_are_per_robot(self):
+        threads = self.coordinator.map(lambda r: threading.current_thread().name)
+        names = {n: f.result() for n, f in threads.items()}
+        self.assertNotEqual(names["crs93"], names["crs97"])
+        self.assertTrue(names["crs93"].startswith("crs-crs93"))
+
+
+if __name__ == "__main__":
+    unittest.main()
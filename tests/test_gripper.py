@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.gripper import GripperAction
+
+
+class TestGripperAction(unittest.TestCase):
+    def setUp(self):
+        self.robot = CRS93(tty_dev="sim:10")
+        self.robot.initialize(home=False)
+        self.gripper = self.robot.gripper
+
+    def test_action_does_not_block(self):
+        g = self.gripper
+        action = g.control_position_async(g.bounds[1])
+        self.assertFalse(action.done())
+        self.assertTrue(action.wait(timeout=5))
+        self.assertAlmostEqual(action.position, g.bounds[1], delta=g.gripper_poll_diff)
+        self.assertTrue(action.done())
+
+    def test_gripper_in_motion_queue(self):
+        r, g = self.robot, self.gripper
+        axes = r._mars.serial.axes
+        n = len(axes["A"].segments)
+        q1 = r.q_home + [0.3, 0, 0, 0, 0, 0]
+        q2 = r.q_home + [0.6, 0, 0, 0, 0, 0]
+        with r.motion_queue() as mq:
+            mq.move_to_q(q1, blend=True)
+            action = mq.gripper(g.relative_position(0.5))
+            mq.move_to_q(q2)
+        self.assertTrue(action.done())
+        first, second = axes["A"].segments[n:]
+        # the arm did not stop at the gripper command
+        self.assertAlmostEqual(second.t0, first.t0 + first.duration)
+        # the gripper started around the arrival to q1, while the arm was moving
+        gripper_start = axes["G"].segments[-1].t0
+        self.assertGreater(gripper_start, first.t0 + first.duration - 0.2)
+        self.assertLess(gripper_start, second.t0 + second.duration)
+        np.testing.assert_allclose(r.get_q(), q2, atol=1e-4)
+
+
+class SlowGripper:
+    """Gripper closing by a fraction of gripper_poll_diff per poll."""
+
+    gripper_poll_interval = 0.0
+    gripper_poll_time = 0.0
+    gripper_poll_diff = 50
+    gripper_still_polls = 3
+
+    def __init__(self, positions):
+        self.positions = list(positions)
+        self.released = False
+
+    def command_position(self, position):
+        pass
+
+    def get_position(self):
+        return self.positions.pop(0) if len(self.positions) > 1 else self.positions[0]
+
+    def is_closing(self, position):
+        return True
+
+    def release(self):
+        self.released = True
+
+
+class TestGripperStall(unittest.TestCase):
+    def poll_until_done(self, g, action):
+        action.start()
+        polls = 1
+        while not action.poll():
+            polls += 1
+        return polls
+
+    def test_slow_motion_is_not_stall(self):
+        g = SlowGripper(range(1000, 500, -20))
+        action = GripperAction(g, 100)
+        self.poll_until_done(g, action)
+        # finished only after the gripper stopped at 520
+        self.assertEqual(action.position, 520)
+        self.assertTrue(g.released)
+
+    def test_stall_needs_consecutive_polls(self):
+        # a single poll without motion at 790 is not a stall
+        g = SlowGripper([1000, 800, 790, 600, 600, 600, 600])
+        action = GripperAction(g, 100)
+        self.assertEqual(self.poll_until_done(g, action), 7)
+        self.assertEqual(action.position, 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+
+
+class TestIKCache(unittest.TestCase):
+    def test_cached_equals_uncached(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        r.ik_deterministic = True
+        poses = r.fk_batch(np.random.uniform(r.q_min, r.q_max, size=(20, 6)))
+        exp = [r.ik(p) for p in poses]
+        r.enable_ik_cache()
+        for _ in range(2):
+            for p, e in zip(poses, exp):
+                np.testing.assert_array_equal(r.ik(p), e)
+        self.assertEqual(r.ik_cache.info()["hits"], 20)
+        self.assertEqual(r.ik_cache.info()["misses"], 20)
+
+    def test_quantization(self):
+        r = CRS93(tty_dev=None)
+        r.enable_ik_cache(tolerance=1e-3)
+        pose = r.fk(r.q_home)
+        r.ik(pose)
+        pose[:3, 3] += 1e-5
+        r.ik(pose)
+        self.assertEqual(r.ik_cache.hits, 1)
+
+    def test_lru_eviction(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        r.enable_ik_cache(maxsize=2)
+        p1, p2, p3 = r.fk_batch(np.random.uniform(r.q_min, r.q_max, size=(3, 6)))
+        r.ik(p1)
+        r.ik(p2)
+        r.ik(p1)  # p2 is least recently used now
+        r.ik(p3)
+        self.assertEqual(len(r.ik_cache), 2)
+        r.ik(p1)
+        self.assertEqual(r.ik_cache.hits, 2)
+        r.ik(p2)
+        self.assertEqual(r.ik_cache.misses, 4)
+
+    def test_invalidation(self):
+        r = CRS93(tty_dev=None)
+        r.enable_ik_cache()
+        pose = r.fk(r.q_home)
+        r.ik(pose)
+        r.dh_d[5] += 0.01
+        sols = r.ik(pose)
+        self.assertEqual(r.ik_cache.hits, 0)
+        self.assertEqual(len(r.ik_cache), 1)
+        for q in sols:
+            np.testing.assert_allclose(r.fk(q), pose, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.instrumentation import LogHistogram, command_name
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_histogram_precision(self):
+        h = LogHistogram(resolution=1e-6, sub_bucket_bits=7)
+        values = np.random.default_rng(0).lognormal(-6, 2, 10000)
+        for v in values:
+            h.record(v)
+        self.assertEqual(h.count, len(values))
+        for p in (50, 90, 99):
+            expected = np.percentile(values, p)
+            self.assertAlmostEqual(h.percentile(p), expected, delta=0.02 * expected)
+        self.assertEqual(h.max, values.max())
+        other = LogHistogram(resolution=1e-6, sub_bucket_bits=7)
+        other.record(10.0)
+        h.merge(other)
+        self.assertEqual(h.count, len(values) + 1)
+        self.assertEqual(h.percentile(100), 10.0)
+
+    def test_command_name(self):
+        self.assertEqual(command_name("REGMSA:500\n"), "REGMSA")
+        self.assertEqual(command_name("\nST?\n"), "ST?")
+        self.assertEqual(command_name("PURGE:\n"), "PURGE")
+
+    def test_simulated_robot(self):
+        r = CRS93(tty_dev="sim:20")
+        r.initialize()
+        self.assertEqual(r.stats(), {})
+        with tempfile.TemporaryDirectory() as d:
+            dump = Path(d) / "stats.jsonl"
+            r.enable_instrumentation(dump_interval=0.02, dump_path=dump)
+            serial = r._mars.target.serial
+            written = serial.bytes_written
+            q = r.q_home.copy()
+            q[0] += 0.2
+            r.move_to_q(q)
+            r.wait_for_motion_stop()
+            r.get_q()
+            time.sleep(0.05)
+            stats = r.stats()
+            r.close()
+            self.assertGreater(len(dump.read_text().splitlines()), 0)
+            json.loads(dump.read_text().splitlines()[-1])
+
+        latency = stats["latency"]
+        for name in ("coordmv", "check_ready", "get_current_q_irc", "ST?"):
+            self.assertGreater(latency[name]["count"], 0, name)
+        self.assertEqual(stats["bytes_written"], serial.bytes_written - written)
+        self.assertGreater(stats["bytes_read"], 0)
+        self.assertEqual(stats["polls"]["wait_for_motion_stop"]["count"], 1)
+        move = stats["move_to_stop"]
+        self.assertEqual(move["count"], 1)
+        self.assertGreater(move["max"], r.completion.records[-1].latency)
+
+    def test_disabled(self):
+        r = CRS93(tty_dev="sim:20")
+        r.initialize()
+        stats = r.enable_instrumentation()
+        r.get_q()
+        r.disable_instrumentation()
+        count = stats.latency["get_current_q_irc"].count
+        r.get_q()
+        self.assertEqual(stats.latency["get_current_q_irc"].count, count)
+        self.assertIsNone(r._mars.stats)
+        self.assertIs(r._mars.target._connection, r._mars.target.serial)
+        r.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
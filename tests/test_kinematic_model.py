@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import pickle
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.crs97 import CRS97
+from ctu_crs.kinematic_model import KinematicModel, _read_params, load_params
+
+
+class TestKinematicModel(unittest.TestCase):
+    def test_pickled_model_matches_robot(self):
+        r = CRS97(tty_dev=None)
+        r.q_max[0] = 1.0
+        r.reachability_map_path = None
+        model = r.kinematic_model()
+        self.assertIs(type(model), KinematicModel)
+        data = pickle.dumps(model)
+        self.assertLess(len(data), 10_000)
+        model = pickle.loads(data)
+        q = np.deg2rad([10, 20, -60, 5, -40, 30])
+        np.testing.assert_array_equal(model.fk(q), r.fk(q))
+        np.testing.assert_allclose(model.ik_closest(r.fk(q), q), q, atol=1e-8)
+        self.assertEqual(model.q_max[0], 1.0)
+        self.assertFalse(hasattr(model, "gripper"))
+        r.q_max[0] = 2.0
+        self.assertEqual(model.q_max[0], 1.0)
+
+    def test_robot_is_not_pickled(self):
+        with self.assertRaises(TypeError):
+            pickle.dumps(CRS93(tty_dev=None))
+
+    def test_params_parsed_once(self):
+        CRS93(tty_dev=None)
+        misses = _read_params.cache_info().misses
+        params = load_params("crs93")
+        params["hh_irc"][0] = 0
+        CRS93(tty_dev=None)
+        self.assertEqual(_read_params.cache_info().misses, misses)
+        self.assertNotEqual(load_params("crs93")["hh_irc"][0], 0)
+
+    def test_offline_robot_imports_only_core(self):
+        modules = [
+            "ctu_mars_control_unit",
+            "serial",
+            "ctu_crs.collision",
+            "ctu_crs.motion_queue",
+            "ctu_crs.planner",
+            "ctu_crs.reachability",
+            "ctu_crs.servo",
+            "ctu_crs.session",
+            "ctu_crs.telemetry",
+        ]
+        code = (
+            "import sys, ctu_crs; ctu_crs.CRS93(tty_dev=None);"
+            f"print([m for m in {modules} if m in sys.modules])"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
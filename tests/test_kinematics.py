@@ -6,6 +6,7 @@
 #
 
 from ctu_crs.crs93 import CRS93
+from ctu_crs.crs97 import CRS97
 import numpy as np
 import unittest
 
@@ -73,6 +74,130 @@ class TestKinematics(unittest.TestCase):
             for c in sols:
                 np.testing.assert_allclose(r.fk(c), pose, atol=1e-6)
 
+    def test_fk_batch(self):
+        np.random.seed(0)
+        for r in [CRS93(tty_dev=None), CRS97(tty_dev=None)]:
+            q = np.random.uniform(r.q_min, r.q_max, size=(100, 6))
+            poses = r.fk_batch(q)
+            self.assertEqual(poses.shape, (100, 4, 4))
+            for qi, pose in zip(q, poses):
+                np.testing.assert_array_equal(pose, r.fk(qi))
+
+    def test_fk_flange_pos_batch(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        q = np.random.uniform(r.q_min, r.q_max, size=(100, 6))
+        positions = r.fk_flange_pos_batch(q)
+        for qi, pos in zip(q, positions):
+            np.testing.assert_array_equal(pos, r.fk_flange_pos(qi))
+
+    def test_ik_batch(self):
+        np.random.seed(0)
+        for r in [CRS93(tty_dev=None), CRS97(tty_dev=None)]:
+            q = np.random.uniform(r.q_min, r.q_max, size=(100, 6))
+            q[:10, 4] = 0  # cos(theta5) == 1
+            q[10:20, 4] = np.pi  # cos(theta5) == -1
+            q[20:30, 2] = 0  # full reach
+            q[30:40, :5] = [0, 0, 0, 0, 0]  # flange on z axis
+            poses = r.fk_batch(q)
+            sols, mask = r.ik_batch(poses)
+            self.assertEqual(sols.shape, (100, 8, 6))
+            self.assertEqual(mask.shape, (100, 8))
+            for pose, s, m in zip(poses, sols, mask):
+                exp = [c for c in r.ik(pose) if np.all(np.isfinite(c))]
+                self.assertEqual(len(exp), np.sum(m))
+                for c in exp:
+                    self.assertTrue(np.any(np.all(np.isclose(s[m], c), axis=1)))
+            np.testing.assert_allclose(
+                r.fk_batch(sols[mask]), poses[mask.nonzero()[0]], atol=1e-6
+            )
+
+    def test_ik_batch_unreachable(self):
+        r = CRS93(tty_dev=None)
+        pose = np.eye(4)
+        pose[:3, 3] = [2.0, 0.0, 0.5]
+        sols, mask = r.ik_batch(pose[np.newaxis])
+        self.assertFalse(np.any(mask))
+
+    def test_kernel_fk_into(self):
+        np.random.seed(0)
+        for r in [CRS93(tty_dev=None), CRS97(tty_dev=None)]:
+            kernel = r.kinematics_kernel()
+            self.assertIs(kernel, r.kinematics_kernel())
+            out = np.empty((4, 4))
+            for _ in range(100):
+                q = np.random.uniform(r.q_min, r.q_max)
+                kernel.fk_into(out, q)
+                np.testing.assert_allclose(out, r.fk(q), atol=1e-12)
+
+    def test_kernel_ik_into(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        kernel = r.kinematics_kernel()
+        q = np.random.uniform(r.q_min, r.q_max, size=(100, 6))
+        q[:10, 4] = 0
+        q[10:20, 2] = 0
+        q[20:30, :5] = 0
+        poses = r.fk_batch(q)
+        exp_sols, exp_mask = r.ik_batch(poses)
+        out = np.empty((8, 6))
+        mask = np.empty(8, dtype=bool)
+        for pose, exp_s, exp_m in zip(poses, exp_sols, exp_mask):
+            n = kernel.ik_into(out, mask, pose)
+            self.assertEqual(n, np.sum(exp_m))
+            np.testing.assert_array_equal(mask, exp_m)
+            diff = np.angle(np.exp(1j * (out[mask] - exp_s[exp_m])))
+            np.testing.assert_allclose(diff, 0, atol=1e-9)
+
+    def test_ik_closest(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        for _ in range(50):
+            q = np.random.uniform(r.q_min, r.q_max)
+            q_ref = np.random.uniform(r.q_min, r.q_max)
+            pose = r.fk(q)
+            best = r.ik_closest(pose, q_ref)
+            sols = [c for c in r.ik(pose) if r.in_limits(c)]
+            np.testing.assert_allclose(r.fk(best), pose, atol=1e-6)
+            self.assertTrue(r.in_limits(best))
+            exp = min(r.motion_time(q_ref, c) for c in sols)
+            self.assertAlmostEqual(r.motion_time(q_ref, best), exp, delta=1e-6)
+            np.testing.assert_allclose(r.ik_closest(pose, q), q, atol=1e-6)
+
+    def test_ik_closest_unreachable(self):
+        r = CRS93(tty_dev=None)
+        pose = np.eye(4)
+        pose[:3, 3] = [2.0, 0.0, 0.5]
+        self.assertIsNone(r.ik_closest(pose, r.q_home))
+        self.assertIsNone(r.ik_closest_path([r.fk(r.q_home), pose], r.q_home))
+
+    def test_ik_closest_path(self):
+        r = CRS93(tty_dev=None)
+        s = np.linspace(0, 1, 30)[:, np.newaxis]
+        q_path = r.q_home + s * np.array([0.5, 0.3, -0.3, 0.8, 0.4, -0.6])
+        path = r.ik_closest_path(r.fk_batch(q_path), r.q_home)
+        np.testing.assert_allclose(path, q_path, atol=1e-6)
+
+    def test_jacobian(self):
+        np.random.seed(0)
+        r = CRS93(tty_dev=None)
+        q = np.random.uniform(r.q_min, r.q_max, size=(10, 6))
+        jacs = r.jacobian_batch(q)
+        eps = 1e-6
+        for qi, jac in zip(q, jacs):
+            np.testing.assert_array_equal(jac, r.jacobian(qi))
+            pose = r.fk(qi)
+            for i in range(6):
+                dq = np.zeros(6)
+                dq[i] = eps
+                pose_eps = r.fk(qi + dq)
+                v = (pose_eps[:3, 3] - pose[:3, 3]) / eps
+                w = (pose_eps[:3, :3] @ pose[:3, :3].T - np.eye(3)) / eps
+                np.testing.assert_allclose(jac[:3, i], v, atol=1e-5)
+                np.testing.assert_allclose(
+                    jac[3:, i], [w[2, 1], w[0, 2], w[1, 0]], atol=1e-5
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
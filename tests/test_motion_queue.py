@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+
+
+class TestMotionQueue(unittest.TestCase):
+    def setUp(self):
+        self.robot = CRS93(tty_dev="sim:50")
+        self.robot.initialize(home=False)
+
+    def test_blended_targets_are_queued_back_to_back(self):
+        r = self.robot
+        axes = r._mars.serial.axes
+        n = len(axes["A"].segments)
+        with r.motion_queue() as mq:
+            for k in range(1, 4):
+                mq.move_to_q(r.q_home + [0.1 * k, 0, 0, 0, 0, 0], blend=True)
+        self.assertEqual(mq.sent, 3)
+        segs = axes["A"].segments[n:]
+        for prev, seg in zip(segs[:-1], segs[1:]):
+            self.assertAlmostEqual(seg.t0, prev.t0 + prev.duration)
+        np.testing.assert_allclose(r.get_q()[0], r.q_home[0] + 0.3, atol=1e-4)
+        self.assertFalse(r.in_motion())
+
+    def test_state_is_not_polled_during_motion(self):
+        r = self.robot
+        axes = r._mars.serial.axes
+        n = len(axes["A"].segments)
+        stats = r.enable_instrumentation()
+        with r.motion_queue(max_queued=2) as mq:
+            for k in range(1, 6):
+                mq.move_to_q(r.q_home + [0.2 * k, 0, 0, 0, 0, 0], blend=True)
+        segs = axes["A"].segments[n:]
+        self.assertEqual(len(segs), 5)
+        for prev, seg in zip(segs[:-1], segs[1:]):
+            self.assertAlmostEqual(seg.t0, prev.t0 + prev.duration)
+        duration = (segs[-1].t0 + segs[-1].duration - segs[0].t0) / 50
+        # polling every 10 ms would need about duration / 0.01 queries
+        queries = stats.latency["ST?"].count
+        self.assertLess(queries, 15)
+        self.assertLess(queries, duration / 0.01 / 2)
+
+    def test_stop_at_non_blended_target(self):
+        r = self.robot
+        axes = r._mars.serial.axes
+        n = len(axes["A"].segments)
+        with r.motion_queue() as mq:
+            mq.move_to_q(r.q_home + [0.1, 0, 0, 0, 0, 0])
+            mq.move_to_q(r.q_home + [0.2, 0, 0, 0, 0, 0])
+        first, second = axes["A"].segments[n:]
+        self.assertGreater(second.t0, first.t0 + first.duration)
+
+    def test_targets_are_validated_once(self):
+        r = self.robot
+        checked = []
+
+        class CountingModel:
+            def in_collision(self, q):
+                checked.append(tuple(q))
+                return False, None
+
+        r.collision_model = CountingModel()
+        targets = [r.q_home + [0.2 * k, 0, 0, 0, 0, 0] for k in range(1, 4)]
+        with r.motion_queue() as mq:
+            for q in targets:
+                mq.move_to_q(q)
+        self.assertEqual(sorted(checked), sorted(tuple(q) for q in targets))
+
+    def test_cartesian_targets(self):
+        r = self.robot
+        q = r.q_home + [0.2, 0.1, -0.1, 0, 0.3, 0]
+        pose = r.fk(q)
+        with r.motion_queue() as mq:
+            mq.move_to_pose(pose, blend=True)
+            mq.move_to_q(r.q_home)
+            mq.move_to_pose(pose)
+        np.testing.assert_allclose(r.fk(r.get_q()), pose, atol=1e-3)
+
+    def test_unreachable_pose_raises(self):
+        r = self.robot
+        pose = np.eye(4)
+        pose[:3, 3] = [5.0, 0.0, 0.0]
+        mq = r.motion_queue()
+        mq.move_to_pose(pose)
+        with self.assertRaises(ValueError):
+            mq.wait()
+        mq.move_to_q(r.q_home)
+        mq.wait()
+        mq.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
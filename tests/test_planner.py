@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.planner import Roadmap, RoadmapPlanner
+from tests.fakes import FakeMars
+
+
+def tool_down(x, y, z):
+    return np.array([[1, 0, 0, x], [0, -1, 0, y], [0, 0, -1, z], [0, 0, 0, 1.0]])
+
+
+class TestPlanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.robot = CRS93(tty_dev=None)
+        cls.static = cls.robot.enable_collision_model(table_height=0.0)
+        cls.roadmap = Roadmap.build(cls.robot, cls.static, n_samples=300, k=8)
+
+    def test_roadmap_is_collision_free(self):
+        rm = self.roadmap
+        self.assertFalse(np.any(self.static.in_collision(rm.nodes)))
+        self.assertTrue(np.all(self.robot.in_limits_batch(rm.nodes)))
+        for n in [0, 10, 100]:
+            adj, edges = rm.neighbors(n)
+            for v, e in zip(adj, edges):
+                self.assertEqual(set(rm.edges[e]), {n, v})
+
+    def test_plan_around_box(self):
+        r = self.robot
+        model = self.static.static_model()
+        box = np.eye(4)
+        box[:3, 3] = [0.45, 0, 0.2]
+        model.add_box([0.2, 0.2, 0.4], box)
+        planner = RoadmapPlanner(r, self.roadmap, model, seed=0)
+        qa = r.ik_closest(tool_down(0.4, -0.3, 0.15), r.q_home)
+        qb = r.ik_closest(tool_down(0.4, 0.3, 0.15), r.q_home)
+        self.assertTrue(model.path_in_collision([qa, qb]))
+
+        path = planner.plan(qa, qb, shortcut_iterations=0)
+        self.assertIsNotNone(path)
+        np.testing.assert_array_equal(path[0], qa)
+        np.testing.assert_array_equal(path[-1], qb)
+        self.assertFalse(model.path_in_collision(path, planner.resolution))
+
+        short = planner.shortcut(path)
+        self.assertLessEqual(len(short), len(path))
+        self.assertLessEqual(planner.path_duration(short), planner.path_duration(path))
+        self.assertFalse(model.path_in_collision(short, planner.resolution))
+
+    def test_direct_and_infeasible(self):
+        r = self.robot
+        planner = RoadmapPlanner(r, self.roadmap, self.static)
+        q = r.q_home.copy()
+        q[0] += 0.5
+        self.assertEqual(len(planner.plan(r.q_home, q)), 2)
+        q[1] = np.deg2rad(-80)  # tool below the table
+        self.assertIsNone(planner.plan(r.q_home, q))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "roadmap.npz"
+            self.roadmap.save(path)
+            rm = Roadmap.load_or_build(self.robot, self.static, path, n_samples=10)
+            np.testing.assert_array_equal(rm.nodes, self.roadmap.nodes)
+            np.testing.assert_array_equal(rm.edges, self.roadmap.edges)
+            self.assertTrue(rm.is_compatible(self.robot))
+
+            r = CRS93(tty_dev=None)
+            r.q_max = r.q_max - 0.1
+            self.assertFalse(rm.is_compatible(r))
+            rm = Roadmap.load_or_build(r, self.static, path, n_samples=10)
+            self.assertEqual(len(rm.nodes), 10)
+            self.assertEqual(len(Roadmap.load(path).nodes), 10)
+            self.assertEqual(os.listdir(d), ["roadmap.npz"])
+
+            with self.assertWarns(RuntimeWarning):
+                rm.try_save(path / "roadmap.npz")
+        self.assertEqual(CRS93(tty_dev=None).roadmap_path.parent.name, "ctu_crs")
+
+    def test_move_to_q_waypoints(self):
+        r = CRS93(tty_dev=None)
+        r._initialized = True
+        r._mars = FakeMars()
+        path = [r.q_home, r.q_home + 0.1, r.q_home + 0.2]
+        r.move_to_q(path)
+        np.testing.assert_array_equal(
+            [q for q, _ in r._mars.moves], [r._joint_values_to_irc(q) for q in path]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from ctu_crs.cache import cache_path
+from ctu_crs.crs93 import CRS93
+from ctu_crs.reachability import ReachabilityMap, default_orientations
+
+
+class TestReachability(unittest.TestCase):
+    def test_map_agrees_with_ik(self):
+        r = CRS93(tty_dev=None)
+        rmap = ReachabilityMap.build(r, voxel_size=0.1)
+        idx = np.arange(rmap.voxels.size)
+        centers = rmap.voxel_centers(idx)
+        counts, _ = rmap.query(centers)
+        for c, n in zip(centers[::7], counts[::7]):
+            exp = 0
+            for rot in default_orientations():
+                pose = np.eye(4)
+                pose[:3, :3] = rot
+                pose[:3, 3] = c
+                exp += sum(r.in_limits(q) for q in r.ik(pose) if np.all(np.isfinite(q)))
+            self.assertEqual(n, exp)
+
+    def test_outside_points_are_unreachable(self):
+        r = CRS93(tty_dev=None)
+        rmap = ReachabilityMap.build(r, voxel_size=0.1)
+        self.assertFalse(np.any(rmap.reachable([[5.0, 0.0, 0.0], [0.0, 0.0, -1.0]])))
+
+    def test_incremental_update(self):
+        r = CRS93(tty_dev=None)
+        rmap = ReachabilityMap.build(r, voxel_size=0.1)
+        r.q_max[0] -= 0.5
+        r.q_min[4] += 0.3
+        n = rmap.update(r)
+        self.assertGreater(n, 0)
+        self.assertLess(n, rmap.voxels.size)
+        full = ReachabilityMap.build(r, voxel_size=0.1)
+        np.testing.assert_array_equal(rmap.voxels, full.voxels)
+
+    def test_robot_reachable_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "map.npy"
+            ReachabilityMap.build(CRS93(tty_dev=None), voxel_size=0.1).save(path)
+            r = CRS93(tty_dev=None)
+            r.reachability_map_path = path
+            rmap = r.reachability_map()
+            self.assertIsInstance(rmap.voxels, np.memmap)
+
+            pose = np.eye(4)
+            pose[:3, :3] = default_orientations()[0]
+            pose[:3, 3] = rmap.voxel_centers(np.argmax(rmap.voxels["count"]))
+            self.assertTrue(r.reachable(pose[np.newaxis, :3, 3])[0])
+
+            r.q_max[0] -= 0.5
+            r.reachable(pose[np.newaxis, :3, 3])
+            np.testing.assert_array_equal(ReachabilityMap.load(path).q_max, r.q_max)
+
+    def test_save_replaces_memory_mapped_map(self):
+        r = CRS93(tty_dev=None)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache" / "map.npy"
+            ReachabilityMap.build(r, voxel_size=0.1).save(path)
+            old = ReachabilityMap.load(path)
+            counts = np.array(old.voxels["count"])
+            r.q_max[0] -= 0.5
+            rmap = ReachabilityMap.load_or_build(r, path)
+            self.assertFalse(np.array_equal(rmap.voxels["count"], counts))
+            # the old map is still readable, the file was replaced, not overwritten
+            np.testing.assert_array_equal(old.voxels["count"], counts)
+            np.testing.assert_array_equal(ReachabilityMap.load(path).q_max, r.q_max)
+            self.assertEqual(sorted(os.listdir(path.parent)), ["map.npy", "map.npz"])
+
+            (Path(tmp) / "file").touch()
+            with self.assertWarns(RuntimeWarning):
+                rmap.try_save(Path(tmp) / "file" / "map.npy")
+
+    def test_default_path_in_user_cache(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/xdg"}):
+            self.assertEqual(cache_path("a.npy"), Path("/tmp/xdg/ctu_crs/a.npy"))
+            path = CRS93(tty_dev=None).reachability_map_path
+        self.assertEqual(path.parent, Path("/tmp/xdg/ctu_crs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.register_shadow import RegisterShadow, parse_register_write
+from tests.fakes import FakeMars
+
+
+class TestRegisterShadow(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_register_write("REGMSA:100\n"), ("REGMSA", "A", "100"))
+        self.assertEqual(
+            parse_register_write("ANAXSETUPG:10,16"), ("ANAXSETUPG", "G", "10,16")
+        )
+        self.assertEqual(
+            parse_register_write("IDLEREL:1200"), ("IDLEREL", None, "1200")
+        )
+        self.assertIsNone(parse_register_write("GG:100"))
+        self.assertIsNone(parse_register_write("PURGE:"))
+        self.assertIsNone(parse_register_write("COORDMV:1,2,3"))
+
+    def test_record_and_invalidate(self):
+        s = RegisterShadow()
+        self.assertTrue(s.record("REGMSA:100"))
+        self.assertFalse(s.record("REGMSA:100"))
+        self.assertTrue(s.record("REGMSA:200"))
+        self.assertTrue(s.record("REGMSB:200"))
+        self.assertTrue(s.record("HHA:"))
+        self.assertTrue(s.record("HHA:"))
+        s.invalidate("A")
+        self.assertIsNone(s.get("REGMSA"))
+        self.assertEqual(s.get("REGMSB"), "200")
+        s.invalidate()
+        self.assertEqual(len(s), 0)
+
+    def test_robot_skips_unchanged(self):
+        r = CRS93(tty_dev=None)
+        mars = FakeMars()
+        r._mars = r.gripper._mars = mars
+        r.set_speed(r._default_speed_irc256_per_ms)
+        r.set_speed(r._default_speed_irc256_per_ms)
+        self.assertEqual(len(mars.writes), 1)
+        speed = r._default_speed_irc256_per_ms.copy()
+        speed[2] += 1
+        r.set_speed(speed)
+        self.assertEqual(mars.writes[-1], f"REGMSC:{float(speed[2])}\n")
+        r.reset_motors()
+        r.set_speed(speed)
+        self.assertEqual(mars.writes[-1].count("REGMS"), 6)
+
+    def test_gripper_shares_shadow(self):
+        r = CRS93(tty_dev=None)
+        mars = FakeMars()
+        r._mars = r.gripper._mars = mars
+        r.gripper.initialize()
+        r.gripper.initialize()
+        self.assertEqual(len(mars.writes), 1)
+        r.set_speed(r._default_speed_irc256_per_ms)
+        r.gripper.release()
+        self.assertIsNone(r.registers.get("REGMSG"))
+        self.assertIsNotNone(r.registers.get("REGMSA"))
+        r.release()
+        self.assertEqual(len(r.registers), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+from ctu_crs.response_parser import (
+    FAIL,
+    LINE,
+    READY,
+    VALUE,
+    CommandError,
+    ReplyEvent,
+    ResponseParser,
+    check_ready,
+    query,
+    wait_ready,
+)
+from ctu_crs.sim import SimulatedMarsControlUnit
+
+
+class ScriptedMars:
+    """Returns the scripted reply chunks one per read."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.writes = []
+
+    def send_cmd(self, cmd):
+        self.writes.append(cmd)
+
+    def read_response(self):
+        return self.chunks.pop(0) if self.chunks else ""
+
+
+class TestResponseParser(unittest.TestCase):
+    def test_events_split_across_reads(self):
+        parser = ResponseParser()
+        ready = []
+        parser.subscribe(READY, ready.append)
+        data = b"APG=84\r\nRG!\r\nFAIL!\r\nhello\r\nST=1"
+        for i in range(len(data)):
+            parser.feed(data[i : i + 1])
+        self.assertEqual(
+            list(parser.events),
+            [
+                ReplyEvent(VALUE, "APG", "84"),
+                ReplyEvent(READY, "RG"),
+                ReplyEvent(FAIL),
+                ReplyEvent(LINE, value="hello"),
+            ],
+        )
+        self.assertEqual(ready, [ReplyEvent(READY, "RG")])
+        self.assertEqual(parser.feed("6\n"), 1)
+        self.assertEqual(parser.events[-1], ReplyEvent(VALUE, "ST", "16"))
+
+    def test_query_skips_other_replies(self):
+        mars = ScriptedMars(["STAMP=1\nAP", "G=", "", "120\n"])
+        self.assertEqual(query(mars, "APG"), "120")
+        self.assertEqual(mars.writes, ["\nAPG?\n"])
+
+    def test_query_fail_and_timeout(self):
+        with self.assertRaises(CommandError):
+            query(ScriptedMars(["FAIL!\n"]), "APX")
+        with self.assertRaises(TimeoutError):
+            query(ScriptedMars([]), "APG", timeout=0.01)
+
+    def test_wait_ready(self):
+        self.assertTrue(wait_ready(ScriptedMars(["R!\n"])))
+        self.assertFalse(wait_ready(ScriptedMars(["R!\n"]), "G", timeout=0.01))
+        self.assertTrue(wait_ready(ScriptedMars(["R!\nRG!\n"]), "G"))
+        self.assertFalse(wait_ready(ScriptedMars(["FAIL!\n"])))
+
+    def test_simulated_unit(self):
+        mars = SimulatedMarsControlUnit("sim:100")
+        self.assertTrue(check_ready(mars))
+        self.assertEqual(query(mars, "VER"), mars.query("VER"))
+        mars.send_cmd("GG:500\n")
+        self.assertFalse(check_ready(mars))
+        self.assertTrue(wait_ready(mars, "G"))
+        self.assertEqual(float(query(mars, "APG")), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import time
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.response_parser import ST_QUEUE_FULL
+from tests.fakes import FakeMars
+
+
+class TestServo(unittest.TestCase):
+    def test_step_follows_twist(self):
+        r = CRS93(tty_dev=None)
+        servo = r.cartesian_servo()
+        q = np.deg2rad([10, 20, -60, 5, -40, 0])
+        v = np.array([0.05, -0.02, 0.03])
+        q_next = servo.step_q(q, np.concatenate([v, np.zeros(3)]), 0.02)
+        pose, pose_next = r.fk(q), r.fk(q_next)
+        np.testing.assert_allclose(pose_next[:3, 3] - pose[:3, 3], v * 0.02, atol=1e-5)
+        np.testing.assert_allclose(pose_next[:3, :3], pose[:3, :3], atol=1e-4)
+
+    def test_step_is_bounded(self):
+        r = CRS93(tty_dev=None)
+        servo = r.cartesian_servo()
+        q = r.q_max - 1e-3
+        q_next = servo.step_q(q, [10, 10, 10, 10, 10, 10], 0.02)
+        self.assertTrue(r.in_limits(q_next))
+        self.assertTrue(np.all(np.abs(q_next - q) <= servo.max_joint_speed * 0.02))
+
+    def test_singular_configuration(self):
+        r = CRS93(tty_dev=None)
+        servo = r.cartesian_servo()
+        dq = servo.joint_velocity(np.zeros(6), [0, 0, 1, 0, 0, 0])
+        self.assertTrue(np.all(np.isfinite(dq)))
+
+    def test_run_streams_increments(self):
+        r = CRS93(tty_dev=None)
+        r._mars = FakeMars()
+        r._initialized = True
+        servo = r.cartesian_servo(rate=200, max_lag=float("inf"))
+        servo.start(r.q_home)
+        servo.run_velocity([0.0, 0.0, 0.05], duration=0.05)
+        self.assertEqual(len(r._mars.moves), 10)
+        self.assertTrue(all(t == 1 / 200 for _, t in r._mars.moves))
+        np.testing.assert_array_equal(
+            r._mars.moves[-1][0], r._joint_values_to_irc(servo.q)
+        )
+        dz = r.fk(servo.q)[2, 3] - r.fk(r.q_home)[2, 3]
+        self.assertAlmostEqual(dz, 0.05 * 0.05, delta=1e-4)
+
+    def test_full_queue_skips_period(self):
+        r = CRS93(tty_dev=None)
+        r._mars = FakeMars(st=ST_QUEUE_FULL)
+        r._initialized = True
+        servo = r.cartesian_servo()
+        servo.start(r.q_home)
+        self.assertFalse(servo.send_twist([0, 0, 0.05, 0, 0, 0]))
+        self.assertEqual(r._mars.moves, [])
+        np.testing.assert_array_equal(servo.q, r.q_home)
+        self.assertEqual(servo.skipped, 1)
+        r._mars.st = 0
+        self.assertTrue(servo.send_twist([0, 0, 0.05, 0, 0, 0]))
+        self.assertEqual(len(r._mars.moves), 1)
+        # the sent increment is still being executed
+        r.completion._predicted_end = time.monotonic() + 1.0
+        self.assertFalse(servo.send_twist([0, 0, 0.05, 0, 0, 0]))
+        self.assertEqual(servo.skipped, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
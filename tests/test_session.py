@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.session import SessionRecord
+
+
+def reconnect(robot: CRS93, path: Path) -> CRS93:
+    """Create new robot connected to the simulated unit of @param robot, as if the
+    process was restarted while the unit stayed powered."""
+    r = CRS93(tty_dev="sim:100")
+    r._mars.target._connection = robot._mars.serial
+    r.session_path = path
+    return r
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name) / "session.json"
+        self.robot = CRS93(tty_dev="sim:100")
+        self.robot.session_path = self.path
+        self.robot.initialize()
+        self.q = self.robot.q_home + [0.2, 0, 0, 0, 0, 0]
+        self.robot.move_to_q(self.q)
+        self.robot.wait_for_motion_stop()
+        self.robot.close()
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_warm_start_skips_homing(self):
+        record = SessionRecord.load(self.path)
+        self.assertTrue(record.homed)
+        serial = self.robot._mars.serial
+        n = serial.commands_processed
+        r = reconnect(self.robot, self.path)
+        r.initialize(warm_start=True)
+        self.assertLess(serial.commands_processed - n, 20)
+        self.assertTrue(r._initialized and r.gripper._initialized)
+        self.assertEqual(r.registers.snapshot(), record.registers)
+        np.testing.assert_allclose(r.get_q(), self.q, atol=1e-4)
+        r.move_to_q(r.q_home)
+        self.assertTrue(r.wait_for_motion_stop())
+
+    def test_moved_robot_is_homed_again(self):
+        serial = self.robot._mars.serial
+        axis = serial.axes["A"]
+        axis.stop(serial.now())
+        axis.rest += 1000
+        r = reconnect(self.robot, self.path)
+        r.initialize(warm_start=True)
+        np.testing.assert_allclose(r.get_q(), r.q_home, atol=1e-4)
+        self.assertEqual(serial.axes["A"].segments[-2].p1, 0)
+
+    def test_reset_unit_is_initialized(self):
+        r = CRS93(tty_dev="sim:100")
+        r.session_path = self.path
+        self.assertFalse(SessionRecord.load(self.path).matches(r))
+        r.initialize(warm_start=True)
+        self.assertTrue(r._initialized)
+        self.assertEqual(len(r.registers), len(self.robot.registers))
+
+    def test_invalid_record(self):
+        self.path.write_text("{")
+        self.assertIsNone(SessionRecord.load(self.path))
+        self.assertIsNone(SessionRecord.load(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.command_batch import CommandBatch, CommandError
+from ctu_crs.crs93 import CRS93
+from ctu_crs.sim import SimulatedMarsControlUnit
+from ctu_crs.timing import trapezoidal_duration
+
+
+class TestSimulatedMars(unittest.TestCase):
+    def test_initialize_and_move(self):
+        r = CRS93(tty_dev="sim:100")
+        r.initialize()
+        np.testing.assert_allclose(r.get_q(), r.q_home, atol=1e-4)
+        self.assertFalse(r.in_motion())
+
+        q = r.q_home.copy()
+        q[0] += 0.5
+        serial = r._mars.serial
+        r.move_to_q(q)
+        self.assertTrue(r.in_motion())
+        seg = serial.axes["A"].segments[-1]
+        d = abs(seg.p1 - seg.p0)
+        v = r._default_speed_irc256_per_ms[0] / 256 * 1e3
+        a = r._default_acceleration_irc_per_ms[0] / 256 * 1e6
+        self.assertAlmostEqual(seg.duration, float(trapezoidal_duration(d, v, a)))
+        r.wait_for_motion_stop()
+        self.assertGreaterEqual(serial.now(), seg.t0 + seg.duration)
+        np.testing.assert_allclose(r.get_q(), q, atol=1e-4)
+
+    def test_coordinated_axes_finish_together(self):
+        r = CRS93(tty_dev="sim:100")
+        r.initialize(home=False)
+        q = r._joint_values_to_irc(r.q_home + [0.3, 0.1, -0.2, 0.5, 0.4, 1.0])
+        r._mars.coordmv(q, min_time=10.0)
+        axes = r._mars.serial.axes
+        ends = [axes[a].end_time for a in "ABCDEF"]
+        self.assertTrue(np.allclose(ends, ends[0]))
+        self.assertAlmostEqual(axes["A"].segments[-1].duration, 10.0)
+
+    def test_gripper(self):
+        r = CRS93(tty_dev="sim:100")
+        r.initialize(home=False)
+        r.gripper.control_position_relative(1.0)
+        self.assertAlmostEqual(r.gripper.get_position(), r.gripper.bounds[1])
+
+    def test_serial_timing(self):
+        mars = SimulatedMarsControlUnit("sim:10")
+        serial = mars.serial
+        t0 = serial.now()
+        mars.sync_cmd_fifo()
+        sent = len(f"STAMP:{mars._stamp}\n") + len(f"STAMP={mars._stamp}\r\n")
+        self.assertGreaterEqual(serial.now() - t0, sent * 10 / 19200)
+
+    def test_failing_command(self):
+        mars = SimulatedMarsControlUnit("sim:100")
+        batch = CommandBatch(mars)
+        batch.add("REGMSA:100")
+        batch.add("REGMSX:100")
+        with self.assertRaises(CommandError) as ctx:
+            batch.flush()
+        self.assertEqual(ctx.exception.command, "REGMSX:100")
+        self.assertEqual(mars.serial.registers["REGMSA"], "100")
+
+    def test_queue_full(self):
+        mars = SimulatedMarsControlUnit("sim:100", queue_size=2)
+        mars.setup_coordmv("ABCDEF")
+        self.assertTrue(mars.check_ready(for_coordmv_queue=True))
+        for i in range(4):
+            mars.send_cmd(f"COORDMV:{(i + 1) * 10000},0,0,0,0,0\n")
+        self.assertFalse(mars.check_ready(for_coordmv_queue=True))
+        self.assertFalse(mars.check_ready())
+        mars.send_cmd("STOP:\n")
+        self.assertTrue(mars.check_ready(for_coordmv_queue=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.telemetry import JointStateSampler, load_log
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_ring_buffer(self):
+        r = CRS93(tty_dev=None)
+        s = JointStateSampler(r, capacity=4)
+        self.assertIsNone(s.latest_q())
+        self.assertEqual(len(s.window()[0]), 0)
+        for k in range(6):
+            s.append(float(k), np.full(6, k))
+        t, q = s.window()
+        np.testing.assert_array_equal(t, [2, 3, 4, 5])
+        np.testing.assert_array_equal(q[:, 0], [2, 3, 4, 5])
+        self.assertTrue(np.shares_memory(q, s._q))
+        np.testing.assert_array_equal(s.window(2)[0], [4, 5])
+        np.testing.assert_array_equal(s.latest_q(), np.full(6, 5))
+        self.assertEqual(len(s), 4)
+        self.assertEqual(s.count, 6)
+
+    def test_sampling_simulated_robot(self):
+        r = CRS93(tty_dev="sim:20")
+        r.initialize()
+        with tempfile.TemporaryDirectory() as d:
+            log = Path(d) / "q.bin"
+            sampler = r.start_telemetry(rate=200, log_path=log)
+            q = r.q_home.copy()
+            q[0] += 0.3
+            r.move_to_q(q)
+            r.wait_for_motion_stop()
+            time.sleep(0.05)
+            np.testing.assert_allclose(sampler.latest_q(), q, atol=1e-4)
+            r.close()
+            self.assertFalse(sampler.running)
+            t, qs = sampler.window()
+            self.assertGreater(len(t), 5)
+            self.assertTrue(np.all(np.diff(t) > 0))
+            t_log, q_log = load_log(log)
+            np.testing.assert_array_equal(t_log, t)
+            np.testing.assert_allclose(q_log, qs, atol=1e-6)
+            self.assertEqual(sampler.errors, 0)
+
+    def test_sampling_limited_by_line_share(self):
+        r = CRS93(tty_dev="sim:1")
+        r.initialize(home=False)
+        t0 = time.monotonic()
+        r.get_q()
+        round_trip = time.monotonic() - t0
+        sampler = r.start_telemetry(rate=200, line_share=0.25)
+        time.sleep(0.5)
+        r.close()
+        # the first samples are taken before the round trip is known
+        self.assertLess(sampler.count, 0.5 / (round_trip / 0.25) + 6)
+        self.assertGreater(sampler.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
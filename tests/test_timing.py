@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import unittest
+
+import numpy as np
+
+from ctu_crs.crs93 import CRS93
+from ctu_crs.timing import (
+    acceleration_to_rad_per_s2,
+    acceleration_to_register,
+    axis_limits,
+    jerk_limited_duration,
+    plan_segments,
+    segment_durations,
+    speed_to_rad_per_s,
+    speed_to_register,
+    trapezoidal_duration,
+    trapezoidal_progress,
+)
+
+
+class TestTiming(unittest.TestCase):
+    def test_register_conversion(self):
+        r = CRS93(tty_dev=None)
+        speed = r._default_speed_irc256_per_ms
+        acc = r._default_acceleration_irc_per_ms
+        np.testing.assert_allclose(
+            speed_to_register(r, speed_to_rad_per_s(r, speed)), speed
+        )
+        np.testing.assert_allclose(
+            acceleration_to_register(r, acceleration_to_rad_per_s2(r, acc)), acc
+        )
+
+    def test_trapezoidal_profile(self):
+        for length in [0.01, 0.5]:
+            duration = trapezoidal_duration(length, 0.2, 0.5)
+            t = np.linspace(0, duration, 100)
+            s = trapezoidal_progress(t, length, 0.2, 0.5)
+            self.assertAlmostEqual(s[0], 0)
+            self.assertAlmostEqual(s[-1], length)
+            self.assertTrue(np.all(np.diff(s) >= 0))
+            self.assertLessEqual(np.max(np.diff(s) / np.diff(t)), 0.2 + 1e-9)
+        # triangle and trapezoid
+        self.assertAlmostEqual(trapezoidal_duration(1.0, 10.0, 1.0), 2.0)
+        self.assertAlmostEqual(trapezoidal_duration(2.0, 1.0, 1.0), 3.0)
+
+    def test_jerk_limited_duration(self):
+        d = np.array([0.0, 0.01, 0.1, 1.0, 10.0])
+        t_trap = trapezoidal_duration(d, 1.0, 2.0)
+        t_jerk = jerk_limited_duration(d, 1.0, 2.0, 10.0)
+        self.assertTrue(np.all(t_jerk >= t_trap))
+        self.assertEqual(t_jerk[0], 0)
+        np.testing.assert_allclose(jerk_limited_duration(d, 1.0, 2.0, 1e9), t_trap)
+        # cruise phase: ramp of 1/2 + 2/10 = 0.7 s covers 0.35 m
+        self.assertAlmostEqual(float(t_jerk[-1]), 1.4 + (10 - 0.7) / 1.0)
+
+    def test_synchronized_segments(self):
+        r = CRS93(tty_dev=None)
+        waypoints = [r.q_home, r.q_home + [0.5, 0.1, -0.2, 1.0, 0.0, 0.3], r.q_home]
+        durations = segment_durations(r, waypoints)
+        timings = plan_segments(r, waypoints)
+        self.assertEqual(len(timings), 2)
+        for timing, duration in zip(timings, durations):
+            self.assertAlmostEqual(timing.duration, duration)
+            v = speed_to_rad_per_s(r, timing.speed_irc256_per_ms)
+            a = acceleration_to_rad_per_s2(r, timing.acceleration_irc_per_ms)
+            d = np.abs(waypoints[1] - waypoints[0])
+            t_axes = trapezoidal_duration(d, v, a)
+            np.testing.assert_allclose(t_axes[d > 0], duration, rtol=0.02)
+        v_max, _ = axis_limits(r)
+        self.assertTrue(
+            np.all(durations > np.max(np.abs(waypoints[1] - waypoints[0]) / v_max))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
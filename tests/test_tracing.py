@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+# Copyright (c) CTU -- All Rights Reserved
+# Created on: 2026-10-17
+#     Author: Vladimir Petrik <vladimir.petrik@cvut.cz>
+#
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from ctu_crs import tracing
+from ctu_crs.crs93 import CRS93
+from ctu_crs.tracing import Tracer
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.disable()
+        tracing.tracer.clear()
+
+    def test_nesting_and_threads(self):
+        t = Tracer()
+        with t.span("outer", n=1):
+            with t.span("inner") as s:
+                s.set(value=2)
+
+            def work():
+                with t.span("worker"):
+                    pass
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        events = {e["name"]: e for e in t.events()}
+        outer, inner = events["outer"], events["inner"]
+        self.assertEqual(outer["args"], dict(n=1))
+        self.assertEqual(inner["args"], dict(value=2))
+        self.assertGreaterEqual(inner["ts"], outer["ts"])
+        self.assertLessEqual(inner["ts"] + inner["dur"], outer["ts"] + outer["dur"])
+        self.assertEqual(inner["tid"], outer["tid"])
+        # span of the other thread is a root of its own track
+        self.assertNotEqual(events["worker"]["tid"], outer["tid"])
+        self.assertEqual(len(t.chrome_trace()["traceEvents"]), 3 + 3)
+
+    def test_sampling_keeps_complete_traces(self):
+        t = Tracer(sample_rate=0.5)
+        for _ in range(200):
+            with t.span("root"):
+                with t.span("child"):
+                    pass
+        names = [e["name"] for e in t.events()]
+        self.assertEqual(names.count("root"), names.count("child"))
+        self.assertTrue(0 < names.count("root") < 200)
+        t = Tracer(sample_rate=0.0)
+        with t.span("root"):
+            pass
+        self.assertEqual(t.events(), [])
+        t = Tracer(enabled=False)
+        with t.span("root") as s:
+            s.set(a=1)
+        self.assertEqual(t.events(), [])
+
+    def test_error_recorded(self):
+        t = Tracer()
+        with self.assertRaises(ValueError):
+            with t.span("failing"):
+                raise ValueError("boom")
+        self.assertIn("boom", t.events()[0]["args"]["error"])
+
+    def test_robot_timeline(self):
+        r = CRS93(tty_dev="sim:20")
+        r.initialize()
+        tracing.enable()
+        with tracing.span("cycle"):
+            q = r.ik(r.fk(r.q_home))[0]
+            r.move_to_q(q)
+            r.wait_for_motion_stop()
+        r.close()
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "trace.json"
+            tracing.export_chrome(path)
+            trace = json.loads(path.read_text())
+        events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(
+            [e["name"] for e in events],
+            ["ik", "move_to_q", "wait_for_motion_stop", "cycle"],
+        )
+        names = [e for e in trace["traceEvents"] if e["name"] == "thread_name"]
+        self.assertEqual(names[0]["args"]["name"], threading.current_thread().name)
+
+
+if __name__ == "__main__":
+    unittest.main()